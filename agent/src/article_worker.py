@@ -22,6 +22,7 @@ from pydantic import BaseModel, Field
 sys.path.insert(0, os.path.dirname(__file__))
 
 from nodes.article_processor import create_article_processor_graph, ArticleProcessorState
+from tools.article.extractor_stats import ExtractorStatsStore
 from tools.normalizer.service import NormalizerService
 from tools.normalizer.types import NormalizerRequest
 from tools.summarizer.service import SummarizerService
@@ -116,7 +117,8 @@ class ArticleWorker:
         self.messaging = get_messaging_provider()
 
         # Initialize Processor Graph
-        self.article_processor = create_article_processor_graph()
+        self.extractor_stats = ExtractorStatsStore(self.supabase)
+        self.article_processor = create_article_processor_graph(extractor_stats=self.extractor_stats)
         self.normalizer_service = NormalizerService()
         self.summarizer_service = SummarizerService()
 
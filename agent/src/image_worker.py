@@ -9,7 +9,8 @@ import sys
 import logging
 import hashlib
 from contextlib import asynccontextmanager
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
 from supabase import create_client, Client
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import signal
@@ -21,6 +22,7 @@ from pydantic import BaseModel, Field
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from nodes.image_processor import ImageProcessorNode, ImageProcessorState
+from tools.media import MediaDedupIndex, VisionResultCache, get_cpu_pool
 from tools.normalizer.service import NormalizerService
 from tools.normalizer.types import NormalizerRequest
 from tools.summarizer.service import SummarizerService
@@ -138,9 +140,18 @@ class ImageWorker:
             raise
         
         from nodes.image_processor import create_image_processor_graph
-        self.image_processor = create_image_processor_graph()
+        self.dedup_index = MediaDedupIndex(self.supabase)
+        self.vision_cache = VisionResultCache(self.supabase)
+        self.image_processor = create_image_processor_graph(
+            dedup_lookup=lambda content_hash, perceptual_hash: self.dedup_index.find(
+                content_hash, perceptual_hash, content_type='image'
+            ),
+            vision_cache=self.vision_cache
+        )
         self.normalizer_service = NormalizerService()
         self.summarizer_service = SummarizerService()
+        # Attachments of one message analyzed in parallel
+        self.attachment_concurrency = int(os.getenv('IMAGE_ATTACHMENT_CONCURRENCY', '4'))
 
         logger.info("ImageWorker initialized successfully")
     
@@ -217,103 +228,208 @@ class ImageWorker:
             logger.error(f"Error fetching specific image job {job_id}: {e}")
             return None
     
-    def _persist_result(self, url: str, image_summary: str, metadata: Optional[dict], payload: dict, job: dict) -> Optional[str]:
-        """Internal helper to persist image analysis result to database."""
+    def _link_existing(self, existing: dict) -> Optional[str]:
+        """Re-use previously analyzed media (content-hash match); returns its link_metadata id."""
         try:
-            # --- Normalize Data ---
-            normalized_data = None
-            try:
-                metadata_caption = metadata.get('caption') if metadata else None
-                norm_req = NormalizerRequest(
-                    title=metadata_caption or "Image Analysis",
-                    description=image_summary,
-                    raw_content=None,
-                    source_url=url
-                )
-                normalized_data = self.normalizer_service.normalize(norm_req)
-            except Exception as e:
-                logger.warning(f"Normalization failed for image {url}: {e}")
-            
-            # --- Generate AI Summary ---
-            ai_summary = None
-            try:
-                sum_req = SummarizerRequest(
-                    title=(metadata.get('caption') if metadata else None) or "Image Analysis",
-                    description=image_summary
-                )
-                ai_summary = self.summarizer_service.generate_summary(sum_req)
-            except Exception as e:
-                logger.warning(f"Summarization failed for image {url}: {e}")
+            link_id = existing['id']
+            self.supabase.table('link_metadata').update({
+                'scrape_count': (existing.get('scrape_count') or 1) + 1,
+                'last_updated_at': 'now()'
+            }).eq('id', link_id).execute()
+            logger.info(f"Re-used existing image metadata {link_id} (content match)")
+            return link_id
+        except Exception as e:
+            logger.error(f"Failed to link existing media {existing.get('id')}: {e}")
+            return None
+
+    def _save_user_links(self, link_ids: List[Optional[str]], payload: dict, job: dict):
+        """
+        Create the user_saved_links entries for an album in one upsert.
+        
+        Content dedup can map an image to a link the user already saved (or two
+        images of the album to the same link); those rows are skipped instead of
+        failing the whole statement on the unique constraint.
+        """
+        user_phone = payload.get('From', '').replace('whatsapp:', '')
+        link_ids = list(dict.fromkeys(link_id for link_id in link_ids if link_id))
+        if not link_ids or not user_phone:
+            return
+        
+        source_channel_id = job.get('source_channel_id') or user_phone
+        source_type = job.get('source_type') or 'dm'
+        try:
+            self.supabase.table('user_saved_links').upsert(
+                [
+                    {
+                        'link_id': link_id,
+                        'user_id': user_phone,
+                        'source_channel_id': source_channel_id,
+                        'source_type': source_type,
+                        'attributed_user_id': user_phone
+                    }
+                    for link_id in link_ids
+                ],
+                on_conflict='user_id,link_id,source_channel_id',
+                ignore_duplicates=True
+            ).execute()
+            logger.info(f"Linked {len(link_ids)} images to user {user_phone}")
+        except Exception as e:
+            logger.error(f"Failed to save user links for job {job.get('id')}: {e}")
+
+    @staticmethod
+    def _run_batch(label: str, fn, requests: list) -> list:
+        """Run a batched LLM call; any failure degrades to None per item."""
+        try:
+            results = list(fn(requests))
+            if len(results) == len(requests):
+                return results
+            logger.warning(f"{label} returned {len(results)} results for {len(requests)} images")
+        except Exception as e:
+            logger.warning(f"{label} failed for album: {e}")
+        return [None] * len(requests)
+
+    def _persist_results(self, items: List[dict]) -> List[Optional[str]]:
+        """
+        Persist newly analyzed images of one job with batched LLM and DB calls.
+        
+        Args:
+            items: Dicts with url, image_summary, metadata, content_hash, perceptual_hash
             
+        Returns:
+            link_metadata id per item (None where persisting failed)
+        """
+        # --- Normalize Data (one LLM call for the album) ---
+        normalized = self._run_batch("Normalization", self.normalizer_service.normalize_batch, [
+            NormalizerRequest(
+                title=(item['metadata'] or {}).get('caption') or "Image Analysis",
+                description=item['image_summary'],
+                raw_content=None,
+                source_url=item['url']
+            )
+            for item in items
+        ])
+        
+        # --- Generate AI Summaries (one LLM call for the album) ---
+        summaries = self._run_batch("Summarization", self.summarizer_service.generate_summaries, [
+            SummarizerRequest(
+                title=(item['metadata'] or {}).get('caption') or "Image Analysis",
+                description=item['image_summary']
+            )
+            for item in items
+        ])
+        
+        link_ids: List[Optional[str]] = [None] * len(items)
+        try:
             # --- Data Persistence Start ---
-            url_hash = hashlib.sha256(url.encode()).hexdigest()
+            url_hashes = [hashlib.sha256(item['url'].encode()).hexdigest() for item in items]
             
-            # Check for existing metadata
-            existing = self.supabase.table('link_metadata').select('id, scrape_count').eq('url_hash', url_hash).limit(1).execute()
+            # Check for existing metadata (one query for the album)
+            existing_rows = self.supabase.table('link_metadata').select(
+                'id, scrape_count, url_hash'
+            ).in_('url_hash', url_hashes).execute()
+            existing = {row['url_hash']: row for row in (existing_rows.data or [])}
             
-            link_id = None
-            if existing and existing.data and len(existing.data) > 0:
-                link_id = existing.data[0]['id']
-                update_data = {
-                    'scrape_count': (existing.data[0].get('scrape_count') or 1) + 1,
-                    'last_updated_at': 'now()'
-                }
-
-                if normalized_data:
-                    update_data.update({
-                        'normalized_category': normalized_data.category.value,
-                        'normalized_price_range': normalized_data.price_range.value if normalized_data.price_range else None,
-                        'normalized_tags': normalized_data.tags,
-                    })
-                if ai_summary:
-                    update_data['ai_summary'] = ai_summary
-
-                self.supabase.table('link_metadata').update(update_data).eq('id', link_id).execute()
-                logger.info(f"Re-used existing image metadata {link_id}")
-            else:
-                # Insert new metadata
-                metadata = metadata or {}
+            new_rows = {}
+            for i, (item, url_hash) in enumerate(zip(items, url_hashes)):
+                normalized_data, ai_summary = normalized[i], summaries[i]
                 
-                insert_result = self.supabase.table('link_metadata').insert({
-                    'url': url,
+                if url_hash in existing:
+                    row = existing[url_hash]
+                    update_data = {
+                        'scrape_count': (row.get('scrape_count') or 1) + 1,
+                        'last_updated_at': 'now()'
+                    }
+                    if normalized_data:
+                        update_data.update({
+                            'normalized_category': normalized_data.category.value,
+                            'normalized_price_range': normalized_data.price_range.value if normalized_data.price_range else None,
+                            'normalized_tags': normalized_data.tags,
+                        })
+                    if ai_summary:
+                        update_data['ai_summary'] = ai_summary
+                    
+                    self.supabase.table('link_metadata').update(update_data).eq('id', row['id']).execute()
+                    link_ids[i] = row['id']
+                    logger.info(f"Re-used existing image metadata {row['id']}")
+                    continue
+                
+                if url_hash in new_rows:
+                    continue  # Same URL twice in the album; linked to one row below
+                metadata = item['metadata'] or {}
+                new_rows[url_hash] = {
+                    'url': item['url'],
                     'url_hash': url_hash,
                     'platform': metadata.get('platform', 'unknown'),
                     'content_type': 'image',
                     'extraction_strategy': 'vision',
                     'title': metadata.get('caption', 'Image Analysis')[:255] if metadata.get('caption') else 'Image Analysis',
-                    'description': image_summary, 
+                    'description': item['image_summary'],
                     'author': metadata.get('author'),
                     'thumbnail_url': metadata.get('image_urls', [None])[0] if metadata.get('image_urls') else None,
                     'scrape_status': 'scraped',
                     'normalized_category': normalized_data.category.value if normalized_data else None,
                     'normalized_price_range': normalized_data.price_range.value if normalized_data and normalized_data.price_range else None,
                     'normalized_tags': normalized_data.tags if normalized_data else None,
-                    'ai_summary': ai_summary
-                }).execute()
-                
-                if insert_result.data:
-                    link_id = insert_result.data[0]['id']
-                    logger.info(f"Created new image metadata {link_id}")
-
-            # Create User Saved Link entry
-            user_phone = payload.get('From', '').replace('whatsapp:', '')
-            if link_id and user_phone:
-                source_channel_id = job.get('source_channel_id') or user_phone
-                source_type = job.get('source_type') or 'dm'
-                
-                self.supabase.table('user_saved_links').insert({
-                    'link_id': link_id,
-                    'user_id': user_phone,
-                    'source_channel_id': source_channel_id,
-                    'source_type': source_type,
-                    'attributed_user_id': user_phone
-                }).execute()
-                logger.info(f"Linked image {link_id} to user {user_phone}")
+                    'ai_summary': ai_summary,
+                    'content_hash': item.get('content_hash'),
+                    'perceptual_hash': item.get('perceptual_hash')
+                }
             
-            return link_id
+            # Insert new metadata in one statement. A row another worker inserted
+            # since the select above is skipped rather than failing the album,
+            # so the ids are read back by url_hash.
+            if new_rows:
+                insert_result = self.supabase.table('link_metadata').upsert(
+                    list(new_rows.values()), on_conflict='url_hash', ignore_duplicates=True
+                ).execute()
+                ids_result = self.supabase.table('link_metadata').select(
+                    'id, url_hash'
+                ).in_('url_hash', list(new_rows)).execute()
+                ids = {row['url_hash']: row['id'] for row in (ids_result.data or [])}
+                for i, url_hash in enumerate(url_hashes):
+                    if url_hash in new_rows:
+                        link_ids[i] = ids.get(url_hash)
+                logger.info(f"Created {len(insert_result.data or [])} new image metadata rows")
+        except Exception as e:
+            logger.error(f"Failed to persist results for {len(items)} images: {e}")
+        
+        return link_ids
+
+    def _analyze_attachment(self, job_id: str, url: str, payload: dict, platform_hint: Optional[str]) -> Optional[dict]:
+        """Run the image graph for one attachment; returns the result state or None."""
+        # Create state for image processor node
+        state: ImageProcessorState = {
+            'job_id': job_id,
+            'url': url,
+            'message_id': payload.get('MessageSid', job_id),
+            'platform_hint': platform_hint,
+            'image_summary': None,
+            'metadata': None,
+            'content_hash': None,
+            'perceptual_hash': None,
+            'duplicate_of': None,
+            'vision_cache_ids': None,
+            'error': None
+        }
+        
+        # Process image
+        logger.info(f"Processing image {url} for job {job_id}")
+        try:
+            result_state = self.image_processor.invoke(state)
         except Exception as e:
-            logger.error(f"Failed to persist result for {url}: {e}")
+            logger.error(f"Failed to process image {url}: {e}")
             return None
+        
+        # Check for errors
+        if result_state.get('error'):
+            logger.error(f"Failed to process image {url}: {result_state['error']}")
+            return None
+        
+        if not result_state.get('image_summary'):
+            logger.warning(f"No image summary generated for {url}")
+            return None
+        
+        return result_state
 
     def process_and_update(self, job: dict) -> bool:
         """
@@ -356,46 +472,49 @@ class ImageWorker:
             if not urls:
                 raise ValueError("No URL or Media found in payload")
             
-            processed_results = []
-            
-            for url in urls:
-                # Create state for image processor node
-                state: ImageProcessorState = {
-                    'job_id': job_id,
+            # Analyze attachments concurrently (bounded); results keep album order
+            workers = max(1, min(self.attachment_concurrency, len(urls)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='image-attachment') as pool:
+                states = list(pool.map(
+                    lambda url: self._analyze_attachment(job_id, url, payload, platform_hint), urls
+                ))
+            analyzed = [(url, state) for url, state in zip(urls, states) if state]
+            
+            # Known media (content-hash match): link it, skip normalize/summarize
+            link_ids: Dict[int, Optional[str]] = {}
+            new_items = []
+            for i, (url, state) in enumerate(analyzed):
+                duplicate = state.get('duplicate_of')
+                if duplicate:
+                    link_ids[i] = self._link_existing(duplicate)
+                else:
+                    new_items.append((i, {
+                        'url': url,
+                        'image_summary': state['image_summary'],
+                        'metadata': state.get('metadata'),
+                        'content_hash': state.get('content_hash'),
+                        'perceptual_hash': state.get('perceptual_hash'),
+                    }))
+            
+            if new_items:
+                persisted = self._persist_results([item for _, item in new_items])
+                for (i, _), link_id in zip(new_items, persisted):
+                    link_ids[i] = link_id
+                    # New vision analyses now belong to this link
+                    self.vision_cache.link(analyzed[i][1].get('vision_cache_ids') or [], link_id)
+            
+            # Create User Saved Link entries
+            self._save_user_links([link_ids.get(i) for i in range(len(analyzed))], payload, job)
+            
+            processed_results = [
+                {
                     'url': url,
-                    'message_id': payload.get('MessageSid', job_id),
-                    'platform_hint': platform_hint,
-                    'image_summary': None,
-                    'metadata': None,
-                    'error': None
+                    'image_summary': state['image_summary'],
+                    'link_id': link_ids.get(i),
+                    'metadata': state.get('metadata')
                 }
-                
-                # Process image
-                logger.info(f"Processing image {url} for job {job_id}")
-                result_state = self.image_processor.invoke(state)
-                
-                # Check for errors
-                if result_state.get('error'):
-                    logger.error(f"Failed to process image {url}: {result_state['error']}")
-                    continue # Try next image
-                
-                image_summary = result_state.get('image_summary')
-                if not image_summary:
-                    logger.warning(f"No image summary generated for {url}")
-                    continue
-                
-                # --- Normalize and Summarize (omitted for brevity in loop, using same logic) ---
-                # [Note: I'll keep the normalization/summarization logic here, but refactored]
-                
-                # --- Persistence... (same as before but for this specific URL) ---
-                link_id = self._persist_result(url, image_summary, result_state.get('metadata'), payload, job)
-                
-                processed_results.append({
-                    'url': url,
-                    'image_summary': image_summary,
-                    'link_id': link_id,
-                    'metadata': result_state.get('metadata')
-                })
+                for i, (url, state) in enumerate(analyzed)
+            ]
             
             if not processed_results:
                 raise Exception("All image processing failed or no images were valid")
@@ -408,7 +527,8 @@ class ImageWorker:
                 'status': 'complete'
             }).eq('id', job_id).execute()
             
-            logger.info(f"Job {job_id} successfully completed and updated")
+            # Pool load alongside each job so a growing queue depth shows up in the worker logs
+            logger.info(f"Job {job_id} successfully completed and updated (cpu pool: {get_cpu_pool().stats()})")
             
             # Notify User
             user_phone_notify = payload.get('From', '')
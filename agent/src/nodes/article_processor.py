@@ -8,6 +8,7 @@ from typing import TypedDict, Optional
 from langgraph.graph import StateGraph, END
 
 from tools.article.service import ArticleService
+from tools.article.extractor_stats import ExtractorStatsStore
 from tools.article.types import ArticleExtractionRequest, ArticleContentType
 
 logger = logging.getLogger(__name__)
@@ -37,8 +38,12 @@ class ArticleProcessorNode:
     Extracts text, metadata, and classifies content.
     """
 
-    def __init__(self):
-        self.article_service = ArticleService()
+    def __init__(self, extractor_stats: Optional[ExtractorStatsStore] = None):
+        """
+        Args:
+            extractor_stats: Optional per-domain extractor stats, shared across workers.
+        """
+        self.article_service = ArticleService(extractor_stats=extractor_stats)
 
     def __call__(self, state: ArticleProcessorState) -> ArticleProcessorState:
         """
@@ -86,9 +91,9 @@ class ArticleProcessorNode:
                 "error": f"Article processing failed: {str(e)}"
             }
 
-def create_article_processor_graph():
+def create_article_processor_graph(extractor_stats: Optional[ExtractorStatsStore] = None):
     """Create and compile the article processing graph."""
-    node = ArticleProcessorNode()
+    node = ArticleProcessorNode(extractor_stats=extractor_stats)
     
     workflow = StateGraph(ArticleProcessorState)
     
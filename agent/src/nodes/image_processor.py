@@ -5,16 +5,33 @@ Integrates image extraction and analysis into the agent workflow.
 
 import base64
 import logging
-from typing import TypedDict, List, Optional, Any
+import os
+from typing import TypedDict, List, Optional, Any, Callable
 from langgraph.graph import StateGraph, END
 
 from tools.image.service import ImageExtractorService
 from tools.image.types import ImageExtractionRequest
 from tools.vision.service import VisionService
-from tools.vision.types import VisionRequest
+from tools.vision.types import VisionImageFetchError
+from tools.vision.profiles import VisionProfile, VisionProfileName, get_profile
+from tools.media import sha256_bytes, dhash_image, VisionResultCache
+from tools.media.cpu_pool import get_cpu_pool
+from tools.image.preprocess import prepare_for_vision
+from tools.image.ocr import extract_text, measure_text_density, ocr_available
 
 logger = logging.getLogger(__name__)
 
+# Platforms whose image URLs are public CDN links the vision provider can
+# fetch itself (never Twilio: its media URLs need our credentials). Only used
+# when OCR and the vision cache are off: both need the image bytes locally.
+VISION_URL_PLATFORMS = {
+    platform.strip()
+    for platform in os.getenv('VISION_IMAGE_URL_PLATFORMS', 'instagram,tiktok,youtube').split(',')
+    if platform.strip() and platform.strip() != 'twilio'
+}
+
+IMAGE_VISION_PROMPT = "Describe this image in detail and extract key information (text, objects, context). Focus on being thorough and identifying specific details."
+
 class ImageProcessorState(TypedDict):
     """State for image processor node."""
     job_id: str
@@ -24,6 +41,13 @@ class ImageProcessorState(TypedDict):
     image_summary: Optional[str]
     error: Optional[str]
     metadata: Optional[dict]
+    content_hash: Optional[str]
+    perceptual_hash: Optional[int]
+    duplicate_of: Optional[dict]
+    vision_cache_ids: Optional[List[str]]
+
+# (content_hash, perceptual_hash) -> existing link_metadata row or None
+DedupLookup = Callable[[str, Optional[int]], Optional[dict]]
 
 class ImageProcessorNode:
     """
@@ -31,9 +55,38 @@ class ImageProcessorNode:
     Extracts images from URL, analyzes with Vision API, and generates summary.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        dedup_lookup: Optional[DedupLookup] = None,
+        vision_cache: Optional[VisionResultCache] = None,
+        ocr_enabled: Optional[bool] = None,
+        vision_profile: Optional[VisionProfileName] = None,
+    ):
+        """
+        Args:
+            dedup_lookup: Optional content-hash lookup for WhatsApp media. When it
+                returns an existing row, vision analysis is skipped.
+            vision_cache: Optional perceptual-hash cache of vision descriptions.
+                Near-identical images reuse a cached description per image.
+            ocr_enabled: Send text-heavy images (screenshots, receipts) through
+                local OCR instead of the vision API (default: on if Tesseract is installed)
+            vision_profile: Vision detail level, token cap and response schema for
+                every image. Default: screenshot for text-heavy images, otherwise
+                the IMAGE_VISION_PROFILE env var (carousel_image).
+
+        With OCR and the vision cache both off, public images from
+        VISION_IMAGE_URL_PLATFORMS are sent to the vision API by URL. They are
+        never downloaded, so they skip the text-density check and always use
+        vision_profile (or the IMAGE_VISION_PROFILE one), never screenshot.
+        """
         self.extractor_service = ImageExtractorService()
         self.vision_service = VisionService()
+        self.dedup_lookup = dedup_lookup
+        self.vision_cache = vision_cache
+        self.ocr_enabled = ocr_available() if ocr_enabled is None else ocr_enabled
+        self.fixed_profile = get_profile(vision_profile) if vision_profile else None
+        self.image_profile = get_profile(os.getenv('IMAGE_VISION_PROFILE', 'carousel_image'))
+        self.screenshot_profile = get_profile(VisionProfileName.SCREENSHOT)
 
     def __call__(self, state: ImageProcessorState) -> ImageProcessorState:
         """
@@ -57,51 +110,109 @@ class ImageProcessorNode:
             )
             extraction_response = self.extractor_service.extract(request)
             
+            # Step 1.5: Content hashes for WhatsApp media. Each forward gets a new
+            # MediaUrl, so identical media can only be matched by its bytes.
+            content_hash = None
+            perceptual_hash = None
+            if extraction_response.platform == 'twilio' and extraction_response.images:
+                image_bytes = extraction_response.images[0].fetch()
+                content_hash = sha256_bytes(image_bytes)
+                perceptual_hash = dhash_image(image_bytes)
+                
+                if self.dedup_lookup:
+                    duplicate = self.dedup_lookup(content_hash, perceptual_hash)
+                    if duplicate:
+                        logger.info(f"Image {url} matches existing media {duplicate['id']}, skipping vision")
+                        return {
+                            **state,
+                            "image_summary": duplicate.get('description') or duplicate.get('ai_summary'),
+                            "metadata": extraction_response.metadata,
+                            "content_hash": content_hash,
+                            "perceptual_hash": perceptual_hash,
+                            "duplicate_of": duplicate,
+                            "error": None
+                        }
+            
             # Step 2: Analyze images with Vision API
             vision_descriptions = []
+            vision_cache_ids = []
             
-            # Limit number of images to analyze to prevent timeouts/OOM
+            # Limit number of images to analyze to prevent timeouts/OOM. Public
+            # CDN images are passed to the vision API by URL; only the rest are
+            # downloaded (concurrently), and the rest of a carousel never is
             MAX_IMAGES = 5
-            images_to_process = extraction_response.images[:MAX_IMAGES]
+            platform = extraction_response.platform
+            images_to_process = extraction_response.load(
+                limit=MAX_IMAGES,
+                download=lambda image: not self._send_by_url(platform, image),
+            )
             
-            from PIL import Image
-            import io
+            cpu_pool = get_cpu_pool()
 
-            for i, image_bytes in enumerate(images_to_process):
+            for i, image in enumerate(images_to_process):
                 try:
-                    # Resize image if too large to save memory and token checking
-                    with Image.open(io.BytesIO(image_bytes)) as img:
-                        # Convert to RGB if needed
-                        if img.mode != 'RGB':
-                            img = img.convert('RGB')
-                            
-                        # Resize if larger than 1024x1024 (good enough for vision)
-                        max_size = (1024, 1024)
-                        img.thumbnail(max_size, Image.Resampling.LANCZOS)
-                        
-                        # Save to buffer
-                        buffer = io.BytesIO()
-                        img.save(buffer, format="JPEG", quality=85)
-                        processed_bytes = buffer.getvalue()
+                    if self._send_by_url(platform, image) and not image.is_loaded:
+                        try:
+                            vision_descriptions.append(self._describe(image.url, self.fixed_profile or self.image_profile))
+                            continue
+                        except VisionImageFetchError as e:
+                            logger.warning(f"Vision API could not fetch image {i+1} by URL, sending it inline: {e}")
+
+                    # Resize/re-encode off the request thread (holds the GIL)
+                    image_bytes = image.fetch()
+                    processed_bytes = cpu_pool.run(
+                        prepare_for_vision, image_bytes, payload_bytes=len(image_bytes)
+                    )
+
+                    # Screenshots need high detail to be read; photos don't (~20 ms check)
+                    density = None
+                    if self.ocr_enabled or self.fixed_profile is None:
+                        density = measure_text_density(processed_bytes)
+                    profile = self.fixed_profile or (
+                        self.screenshot_profile if density.is_text_heavy else self.image_profile
+                    )
+                    # Descriptions differ per profile, so they're cached separately
+                    cache_prompt = f"{IMAGE_VISION_PROMPT} [{profile.name.value}]"
+
+                    # Forwarded memes/screenshots: reuse the analysis of a near-identical image
+                    image_hash = None
+                    if self.vision_cache and self.vision_cache.enabled:
+                        image_hash = dhash_image(processed_bytes)
+                        cached = self.vision_cache.lookup(image_hash, cache_prompt)
+                        if cached:
+                            vision_descriptions.append(cached['description'])
+                            continue
+
+                    # Screenshots of text: local OCR on the full-resolution original,
+                    # summarized downstream like any other text
+                    ocr_result = None
+                    if self.ocr_enabled and density.is_text_heavy:
+                        ocr_result = cpu_pool.run(
+                            extract_text, image_bytes, payload_bytes=len(image_bytes), density=density
+                        )
+
+                    # Only the small re-encoded copy is needed from here on
+                    del image_bytes
+                    image.release()
+
+                    if ocr_result:
+                        logger.info(
+                            f"Image {i+1} is mostly text; using OCR ({ocr_result.word_count} words, "
+                            f"confidence {ocr_result.confidence}) instead of vision"
+                        )
+                        vision_descriptions.append(f"Text in image (OCR): {ocr_result.text}")
+                        continue
 
                     # Convert to base64
                     image_base64 = base64.b64encode(processed_bytes).decode('utf-8')
-                    image_data_url = f"data:image/jpeg;base64,{image_base64}"
-                    
-                    # Create vision request
-                    vision_request = VisionRequest(
-                        image_input=image_data_url,
-                        prompt="Describe this image in detail and extract key information (text, objects, context). Focus on being thorough and identifying specific details.",
-                        model_provider="openai"
-                    )
-                    
-                    vision_response = self.vision_service.analyze(vision_request)
-                    
-                    # Extract description
-                    analysis_data = vision_response.analysis_data
-                    description = self._extract_description(analysis_data)
+                    description = self._describe(f"data:image/jpeg;base64,{image_base64}", profile)
                     vision_descriptions.append(description)
                     
+                    if image_hash is not None:
+                        cache_id = self.vision_cache.store(image_hash, cache_prompt, description)
+                        if cache_id:
+                            vision_cache_ids.append(cache_id)
+                    
                 except Exception as e:
                     logger.error(f"Failed to analyze image {i+1}: {e}")
                     vision_descriptions.append(f"[Analysis Failed: {str(e)}]")
@@ -113,6 +224,10 @@ class ImageProcessorNode:
                 **state,
                 "image_summary": summary,
                 "metadata": extraction_response.metadata,
+                "content_hash": content_hash,
+                "perceptual_hash": perceptual_hash,
+                "duplicate_of": None,
+                "vision_cache_ids": vision_cache_ids,
                 "error": None
             }
 
@@ -124,10 +239,35 @@ class ImageProcessorNode:
                 "error": f"Image processing failed: {str(e)}"
             }
 
+    def _send_by_url(self, platform: str, image) -> bool:
+        """Whether the vision provider can fetch this image itself (saves the download and base64 upload)."""
+        # OCR and the vision cache work on the bytes, so they'd never see a URL-only image
+        if self.ocr_enabled or (self.vision_cache and self.vision_cache.enabled):
+            return False
+        return (
+            platform in VISION_URL_PLATFORMS
+            and image.public
+            and bool(image.url)
+            and image.url.startswith(('http://', 'https://'))
+        )
+
+    def _describe(self, image_input: str, profile: VisionProfile) -> str:
+        """Run the vision prompt on an image URL or data URL."""
+        vision_request = profile.request(
+            image_input=image_input,
+            prompt=IMAGE_VISION_PROMPT,
+            model_provider="openai"
+        )
+        vision_response = self.vision_service.analyze(vision_request)
+        return self._extract_description(vision_response.analysis_data)
+
     def _extract_description(self, analysis_data: Any) -> str:
         """Helper to extract description from analysis data."""
         if isinstance(analysis_data, dict):
             if 'description' in analysis_data:
+                # Profiles with a compact schema return visible text separately
+                if analysis_data.get('text'):
+                    return f"{analysis_data['description']}\nText: {analysis_data['text']}"
                 return analysis_data['description']
             elif 'content' in analysis_data:
                 return analysis_data['content']
@@ -156,9 +296,13 @@ class ImageProcessorNode:
         return "\n".join(parts)
 
 
-def create_image_processor_graph():
+def create_image_processor_graph(
+    dedup_lookup: Optional[DedupLookup] = None,
+    vision_cache: Optional[VisionResultCache] = None,
+    vision_profile: Optional[VisionProfileName] = None,
+):
     """Create and compile the image processing graph."""
-    node = ImageProcessorNode()
+    node = ImageProcessorNode(dedup_lookup=dedup_lookup, vision_cache=vision_cache, vision_profile=vision_profile)
     
     workflow = StateGraph(ImageProcessorState)
     
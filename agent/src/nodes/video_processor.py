@@ -13,6 +13,7 @@ class VideoProcessorState(TypedDict):
     """State for video processor node."""
     job_id: str
     video_url: str
+    video_path: Optional[str]
     message_id: str
     auth_token: Optional[str]
     account_sid: Optional[str]
@@ -26,12 +27,13 @@ class VideoProcessorNode:
     Downloads video, extracts frames, analyzes with Vision API, and generates summary.
     """
 
-    def __init__(self, num_frames: int = 5):
+    def __init__(self, num_frames: Optional[int] = 5):
         """
         Initialize the video processor node.
         
         Args:
             num_frames: Number of frames to extract from each video
+                (None = choose per video from its duration)
         """
         self.service = VideoProcessingService(num_frames=num_frames)
 
@@ -47,8 +49,10 @@ class VideoProcessorNode:
         """
         try:
             # Create processing request
+            # A pre-downloaded local file (e.g. already hashed for dedup) skips the download
             request = VideoProcessingRequest(
-                video_url=state["video_url"],
+                video_url=state.get("video_url"),
+                video_path=state.get("video_path"),
                 message_id=state["message_id"],
                 auth_token=state.get("auth_token"),
                 account_sid=state.get("account_sid")
@@ -73,7 +77,7 @@ class VideoProcessorNode:
             }
 
 
-def create_video_processor_graph(num_frames: int = 5):
+def create_video_processor_graph(num_frames: Optional[int] = 5):
     """Create and compile the video processor graph."""
     node = VideoProcessorNode(num_frames=num_frames)
     
@@ -92,7 +96,7 @@ def create_video_processor_graph(num_frames: int = 5):
     return workflow.compile()
 
 # Legacy factory for backward compatibility
-def create_video_processor_node(num_frames: int = 5) -> VideoProcessorNode:
+def create_video_processor_node(num_frames: Optional[int] = 5) -> VideoProcessorNode:
     """
     Create a video processor node instance.
     (Legacy factory)
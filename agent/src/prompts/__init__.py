@@ -1,6 +1,6 @@
 from .core import BasePrompt
 from .factory import PromptFactory
 from .vision import VisionAnalyzePrompt, VisionSystemPrompt
-from .summarizer import SummarizerSystemPrompt, SummarizerUserPrompt
+from .summarizer import SummarizerSystemPrompt, SummarizerBatchSystemPrompt, SummarizerUserPrompt
 
-__all__ = ["BasePrompt", "PromptFactory", "VisionAnalyzePrompt", "VisionSystemPrompt", "SummarizerSystemPrompt", "SummarizerUserPrompt"]
+__all__ = ["BasePrompt", "PromptFactory", "VisionAnalyzePrompt", "VisionSystemPrompt", "SummarizerSystemPrompt", "SummarizerBatchSystemPrompt", "SummarizerUserPrompt"]
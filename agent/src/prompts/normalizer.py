@@ -1,6 +1,6 @@
 from typing import Dict, Any, List
 from pydantic import Field
-from tools.normalizer.types import NormalizerResponse
+from tools.normalizer.types import NormalizerResponse, NormalizerBatchResponse
 from .core import VaultBotJsonSystemPrompt
 
 class NormalizerSystemPrompt(VaultBotJsonSystemPrompt):
@@ -38,3 +38,39 @@ class NormalizerSystemPrompt(VaultBotJsonSystemPrompt):
             "normalizer_instructions",
             "output_schema"
         })
+
+
+class NormalizerBatchSystemPrompt(NormalizerSystemPrompt):
+    """
+    System prompt for normalizing several items (e.g. a photo album) in one call.
+    """
+    name: str = "normalizer_batch_system"
+    description: str = "System instructions for batched Data Normalizer tasks."
+
+    batch_instructions: List[str] = Field(
+        default=[
+            "The input contains several numbered items.",
+            "Normalize each item independently; do not mix details between items.",
+            "Return exactly one entry in 'items' per input item, in the same order."
+        ],
+        description="Instructions for batched normalization"
+    )
+
+    output_schema: Dict[str, Any] = Field(
+        default_factory=NormalizerBatchResponse.model_json_schema,
+        description="The JSON schema the output must adhere to"
+    )
+
+    def compile(self, **kwargs) -> str:
+        """
+        Compiles the prompt into a JSON string including the batch instructions.
+        """
+        return self.model_dump_json(include={
+            "persona_role",
+            "persona_goal",
+            "persona_rules",
+            "format_rules",
+            "normalizer_instructions",
+            "batch_instructions",
+            "output_schema"
+        })
@@ -6,6 +6,10 @@ class SummarizerResponse(BaseModel):
     """Temporary schema for prompt definition until tools/summarizer/types.py is created"""
     summary: str = Field(..., description="A concise 2-sentence summary of the content.")
 
+class SummarizerBatchResponse(BaseModel):
+    """Schema for summarizing several items in one call"""
+    items: List[SummarizerResponse] = Field(..., description="One summary per input item, in input order.")
+
 class SummarizerSystemPrompt(VaultBotJsonSystemPrompt):
     """
     System prompt for the Natural Language Summary Generator.
@@ -44,6 +48,41 @@ class SummarizerSystemPrompt(VaultBotJsonSystemPrompt):
             "output_schema"
         })
 
+class SummarizerBatchSystemPrompt(SummarizerSystemPrompt):
+    """
+    System prompt for summarizing several items (e.g. a photo album) in one call.
+    """
+    name: str = "summarizer_batch_system"
+    description: str = "System instructions for batched summary generation."
+
+    batch_instructions: List[str] = Field(
+        default=[
+            "The input contains several numbered items.",
+            "Summarize each item independently; do not mix details between items.",
+            "Return exactly one entry in 'items' per input item, in the same order."
+        ],
+        description="Instructions for batched summarization"
+    )
+
+    output_schema: Dict[str, Any] = Field(
+        default_factory=SummarizerBatchResponse.model_json_schema,
+        description="The JSON schema the output must adhere to"
+    )
+
+    def compile(self, **kwargs) -> str:
+        """
+        Compiles the prompt into a JSON string including the batch instructions.
+        """
+        return self.model_dump_json(include={
+            "persona_role",
+            "persona_goal",
+            "persona_rules",
+            "format_rules",
+            "summarizer_instructions",
+            "batch_instructions",
+            "output_schema"
+        })
+
 class SummarizerUserPrompt(BasePrompt):
     """
     User prompt for passing content to be summarized.
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import Field
 from .core import BasePrompt, VaultBotJsonSystemPrompt
 
@@ -10,12 +10,15 @@ class VisionAnalyzePrompt(BasePrompt):
     description: str = "Analyzes an image based on a user instruction."
     
     instruction: str = Field(..., description="User instruction for analysis")
+    response_schema: Optional[Dict[str, str]] = Field(
+        None, description="Respond with exactly these JSON fields (field name -> content)"
+    )
     
     def compile(self, **kwargs) -> str:
         """
         Compiles the prompt message into a JSON string.
         """
-        return self.model_dump_json(include={"instruction"})
+        return self.model_dump_json(include={"instruction", "response_schema"}, exclude_none=True)
 
 class VisionSystemPrompt(VaultBotJsonSystemPrompt):
     """
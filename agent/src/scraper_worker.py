@@ -22,6 +22,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from tools.scraper.service import ScraperService
 from tools.scraper.types import ScraperRequest
+from tools.media import get_scratch_space
 from tools.normalizer.service import NormalizerService
 from tools.normalizer.types import NormalizerRequest
 from tools.summarizer.service import SummarizerService
@@ -112,6 +113,8 @@ class ScraperWorker:
         self.messaging = get_messaging_provider()
 
         self.scraper_service = ScraperService()
+        # Sweeps scratch files left behind by a crashed previous instance
+        self.scratch = get_scratch_space()
         self.normalizer_service = NormalizerService()
         self.summarizer_service = SummarizerService()
 
@@ -203,7 +206,7 @@ class ScraperWorker:
                 norm_req = NormalizerRequest(
                     title=metadata.title or "Untitled",
                     description=metadata.description,
-                    raw_content=None, # Scraper service doesn't return raw content yet, could add later
+                    raw_content=metadata.transcript,
                     source_url=url
                 )
                 normalized_data = self.normalizer_service.normalize(norm_req)
@@ -218,43 +221,74 @@ class ScraperWorker:
             try:
                 sum_req = SummarizerRequest(
                     title=metadata.title,
-                    description=metadata.description
+                    description=metadata.description,
+                    transcript=metadata.transcript
                 )
                 ai_summary = self.summarizer_service.generate_summary(sum_req)
             except Exception as e:
                 logger.warning(f"Summarization failed for {url}: {e}")
                 
             # 1.7 Visual AI Summary (Video)
+            # When captions gave us a transcript, visual analysis is skipped or reduced
             from tools.scraper.types import ContentType
             if metadata.content_type == ContentType.VIDEO:
                 try:
-                    from tools.video.downloader import SocialVideoDownloader
-                    from tools.video.service import VideoProcessingService
-                    from tools.video.types import VideoProcessingRequest
-                    
-                    proxy_url = os.environ.get('PROXY_URL')
-                    downloader = SocialVideoDownloader(proxy_url=proxy_url)
-                    video_path = downloader.download(url)
+                    from tools.video.probe import plan_frames
+                    # Frame budget from the duration the scrape already reported (before downloading)
+                    frame_plan = plan_frames(metadata.duration)
+                    num_frames = frame_plan.num_frames
+                    if metadata.transcript:
+                        num_frames = min(num_frames, int(os.environ.get('TRANSCRIPT_VISION_FRAMES', '0')))
+                        logger.info(f"Transcript available for {url}, using {num_frames} vision frames")
+                    if num_frames > 0:
+                        from tools.video.downloader import SocialVideoDownloader
+                        from tools.video.service import VideoProcessingService
+                        from tools.video.types import VideoProcessingRequest, VideoExtractionError
+                        from tools.video.frame_sources import StoryboardFrameSource
                     
-                    try:
-                        video_service = VideoProcessingService()
-                        vid_req = VideoProcessingRequest(
-                            video_path=video_path,
-                            message_id=job_id
+                        proxy_url = os.environ.get('PROXY_URL')
+                        max_seconds = int(os.environ.get('VIDEO_DOWNLOAD_MAX_SECONDS', '120'))
+                        downloader = SocialVideoDownloader(
+                            proxy_url=proxy_url,
+                            profile=os.environ.get('VIDEO_DOWNLOAD_PROFILE', 'frames_only'),
+                            target_height=frame_plan.max_height or 480,
+                            max_seconds=max_seconds or None
+                        )
+                        video_service = VideoProcessingService(
+                            num_frames=num_frames,
+                            max_height=frame_plan.max_height
                         )
-                        vid_resp = video_service.process_video(vid_req)
+                        vid_resp = None
+                    
+                        # YouTube storyboards cover the timeline in a few small sprite
+                        # sheets, so try those before downloading any video
+                        storyboard = None
+                        if os.environ.get('VIDEO_USE_STORYBOARDS', 'true').lower() == 'true':
+                            storyboard = StoryboardFrameSource.from_info(metadata.extractor_info)
+                        if storyboard:
+                            try:
+                                vid_resp = video_service.process_source(storyboard, duration_hint=metadata.duration)
+                            except VideoExtractionError as e:
+                                logger.warning(f"Storyboard sampling failed for {url}, downloading video: {e}")
+                    
+                        if vid_resp is None:
+                            # Scratch job directory (and the download in it) is removed on exit
+                            with self.scratch.job(job_id) as scratch:
+                                # Reuse the scrape's yt-dlp info so the platform is only hit once
+                                video_path = downloader.download(url, info=metadata.extractor_info, scratch=scratch)
+                                vid_req = VideoProcessingRequest(
+                                    video_path=video_path,
+                                    message_id=job_id,
+                                    duration_hint=metadata.duration
+                                )
+                                vid_resp = video_service.process_video(vid_req)
+                    
                         metadata.visual_summary = vid_resp.summary
-                        
+                    
                         if ai_summary and metadata.visual_summary:
                             ai_summary = f"{ai_summary}\n\nVisual Analysis: {metadata.visual_summary}"
                         elif metadata.visual_summary:
                             ai_summary = f"Visual Analysis: {metadata.visual_summary}"
-                    finally:
-                        if os.path.exists(video_path):
-                            try:
-                                os.unlink(video_path)
-                            except OSError:
-                                pass
                 except Exception as e:
                     logger.warning(f"Video visual extraction failed for {url}: {e}")
                     warning_msg = "⚠️ Visual extraction failed or was blocked by the platform."
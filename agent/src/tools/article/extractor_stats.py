@@ -0,0 +1,191 @@
+"""
+Per-domain extractor statistics for ArticleService.
+
+ArticleService used to try Trafilatura, then Newspaper4k, for every URL. On
+domains where Trafilatura reliably fails, every article paid for a failed
+extraction first. ExtractorStatsStore tracks, per domain and extractor, a
+weighted success rate, latency and text length, and plans each extraction:
+
+- Extractors are ranked by success rate, scaled down when their text is
+  short (likely a cookie wall or teaser). An extractor only moves ahead of
+  the default order when it scores clearly better (SCORE_MARGIN), and
+  extractors with fewer than ARTICLE_EXTRACTOR_MIN_SAMPLES attempts on a
+  domain get a neutral score.
+- Timeouts follow the extractor's usual latency on the domain (a few times
+  its average, within ARTICLE_EXTRACTOR_MAX_TIMEOUT). The last extractor
+  always gets the full timeout.
+- When an extractor has been demoted, the default order is still used with
+  probability ARTICLE_EXTRACTOR_EXPLORATION, so one that recovers is noticed.
+
+Stats are kept in memory and persisted to the article_extractor_stats table
+(record_article_extractor_result RPC), which all workers share. A domain's
+rows are re-read every STATS_REFRESH_SECONDS.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .types import ExtractionPlan, ExtractorStats
+
+logger = logging.getLogger(__name__)
+
+# Weight of a new sample in the running rates and averages (matches the RPC default)
+ALPHA = 0.2
+# Score for an extractor without enough attempts on a domain
+PRIOR_SCORE = 0.5
+# How much better an extractor must score to move ahead of an earlier one
+SCORE_MARGIN = 0.2
+# Texts shorter than this lower an extractor's score proportionally
+GOOD_TEXT_LENGTH = 500
+# Timeout as a multiple of the average latency, and its floor (seconds)
+TIMEOUT_FACTOR = 4.0
+MIN_TIMEOUT = 5.0
+# How long a domain's stats are used before re-reading the table
+STATS_REFRESH_SECONDS = 600
+MAX_DOMAINS = 4096
+
+
+def extractor_domain(url: str) -> str:
+    """Stats key for a URL: lowercase host without www."""
+    host = (urlsplit(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class ExtractorStatsStore:
+    """Learns which article extractor works best per domain."""
+
+    TABLE = 'article_extractor_stats'
+
+    def __init__(
+        self,
+        supabase=None,
+        exploration: Optional[float] = None,
+        min_samples: Optional[int] = None,
+        max_timeout: Optional[float] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Args:
+            supabase: Supabase client; None keeps stats in memory only
+            exploration: Share of extractions on a reordered domain that use the default order
+                (default: ARTICLE_EXTRACTOR_EXPLORATION env var, 0.1)
+            min_samples: Attempts on a domain before an extractor's stats are trusted
+                (default: ARTICLE_EXTRACTOR_MIN_SAMPLES env var, 5)
+            max_timeout: Longest an extractor may run, in seconds
+                (default: ARTICLE_EXTRACTOR_MAX_TIMEOUT env var, 30)
+            rng: Random source for exploration (tests)
+        """
+        self.supabase = supabase
+        self.exploration = exploration if exploration is not None else float(
+            os.getenv('ARTICLE_EXTRACTOR_EXPLORATION', '0.1'))
+        self.min_samples = min_samples or int(os.getenv('ARTICLE_EXTRACTOR_MIN_SAMPLES', '5'))
+        self.max_timeout = max_timeout or float(os.getenv('ARTICLE_EXTRACTOR_MAX_TIMEOUT', '30'))
+        self._rng = rng or random.Random()
+
+        # domain -> (loaded_at, {extractor: ExtractorStats})
+        self._domains: "OrderedDict[str, Tuple[float, Dict[str, ExtractorStats]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, domain: str) -> Dict[str, ExtractorStats]:
+        stats = {}
+        if self.supabase is None:
+            return stats
+        try:
+            result = self.supabase.table(self.TABLE).select(
+                'extractor, attempts, successes, success_rate, avg_latency_ms, avg_text_length'
+            ).eq('domain', domain).execute()
+            for row in (result.data if result else None) or []:
+                stats[row['extractor']] = ExtractorStats(**{k: v for k, v in row.items() if k != 'extractor'})
+        except Exception as e:
+            logger.warning(f"Failed to load extractor stats for {domain}: {e}")
+        return stats
+
+    def get(self, domain: str) -> Dict[str, ExtractorStats]:
+        """Stats by extractor for a domain (empty if unknown)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._domains.get(domain)
+            if entry is not None and now - entry[0] < STATS_REFRESH_SECONDS:
+                self._domains.move_to_end(domain)
+                return entry[1]
+
+        stats = self._load(domain) if self.supabase is not None else (entry[1] if entry else {})
+        with self._lock:
+            self._domains[domain] = (now, stats)
+            self._domains.move_to_end(domain)
+            while len(self._domains) > MAX_DOMAINS:
+                self._domains.popitem(last=False)
+        return stats
+
+    def _score(self, stats: Optional[ExtractorStats]) -> float:
+        if stats is None or stats.attempts < self.min_samples:
+            return PRIOR_SCORE
+        return stats.success_rate * min(1.0, stats.avg_text_length / GOOD_TEXT_LENGTH)
+
+    def _timeout(self, stats: Optional[ExtractorStats]) -> float:
+        if stats is None or stats.successes < self.min_samples or not stats.avg_latency_ms:
+            return self.max_timeout
+        return min(self.max_timeout, max(MIN_TIMEOUT, stats.avg_latency_ms / 1000 * TIMEOUT_FACTOR))
+
+    def plan(self, url: str, extractors: List[str]) -> ExtractionPlan:
+        """
+        Choose the extractor order and timeouts for a URL.
+
+        Args:
+            url: Article URL
+            extractors: Extractor names in their default order
+        """
+        domain = extractor_domain(url)
+        stats = self.get(domain)
+
+        scores = {name: self._score(stats.get(name)) for name in extractors}
+        order: List[str] = []
+        for name in extractors:
+            position = len(order)
+            while position > 0 and scores[name] > scores[order[position - 1]] + SCORE_MARGIN:
+                position -= 1
+            order.insert(position, name)
+        explored = order != extractors and self._rng.random() < self.exploration
+        if explored:
+            order = list(extractors)
+
+        timeouts = {name: self._timeout(stats.get(name)) for name in order}
+        timeouts[order[-1]] = self.max_timeout
+        return ExtractionPlan(domain=domain, order=order, timeouts=timeouts, explored=explored)
+
+    def record(self, domain: str, extractor: str, success: bool, latency_ms: float, text_length: int = 0) -> None:
+        """Add one extraction attempt to the domain's stats (errors are logged, not raised)."""
+        stats = self.get(domain)
+        with self._lock:
+            entry = stats.setdefault(extractor, ExtractorStats())
+            first_success = success and entry.successes == 0
+            entry.attempts += 1
+            entry.successes += int(success)
+            entry.success_rate = (
+                float(success) if entry.attempts == 1
+                else (1 - ALPHA) * entry.success_rate + ALPHA * float(success)
+            )
+            if success:
+                weight = 1.0 if first_success else ALPHA
+                entry.avg_latency_ms = (1 - weight) * entry.avg_latency_ms + weight * latency_ms
+                entry.avg_text_length = (1 - weight) * entry.avg_text_length + weight * text_length
+
+        if self.supabase is None:
+            return
+        try:
+            self.supabase.rpc('record_article_extractor_result', {
+                'p_domain': domain,
+                'p_extractor': extractor,
+                'p_success': success,
+                'p_latency_ms': latency_ms,
+                'p_text_length': text_length,
+                'p_alpha': ALPHA,
+            }).execute()
+        except Exception as e:
+            logger.warning(f"Failed to record extractor stats for {domain}: {e}")
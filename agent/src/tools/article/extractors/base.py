@@ -7,13 +7,20 @@ class BaseArticleExtractor(ABC):
     """Base class for all article extractors."""
     
     @abstractmethod
-    def extract(self, url: str, html_content: Optional[str] = None) -> ArticleExtractionResponse:
+    def extract(
+        self,
+        url: str,
+        html_content: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> ArticleExtractionResponse:
         """
         Extract article content from the given URL.
         
         Args:
             url: The URL to extract from.
             html_content: Optional pre-fetched HTML content.
+            timeout: Optional time budget in seconds; work still running past
+                it (downloads, parsing) should be given up.
             
         Returns:
             ArticleExtractionResponse containing text and metadata.
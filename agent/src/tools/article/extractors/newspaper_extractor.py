@@ -17,7 +17,12 @@ class NewspaperExtractor(BaseArticleExtractor):
         self.proxy_manager = ProxyManager()
         self.og_parser = OpenGraphParser()
         
-    def extract(self, url: str, html_content: Optional[str] = None) -> ArticleExtractionResponse:
+    def extract(
+        self,
+        url: str,
+        html_content: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> ArticleExtractionResponse:
         """
         Extract article using Newspaper4k.
         """
@@ -26,6 +31,8 @@ class NewspaperExtractor(BaseArticleExtractor):
         try:
             config = newspaper.Config()
             config.browser_user_agent = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'
+            if timeout:
+                config.request_timeout = timeout
             
             # Use proxy if configured
             proxy_url = self.proxy_manager.get_proxy_url()
@@ -1,11 +1,14 @@
 from typing import Dict, Optional
-from bs4 import BeautifulSoup
 import logging
 
+from ...web import PageHead, head_from_tree, parse_head
+
 logger = logging.getLogger(__name__)
 
 class OpenGraphParser:
-    """Parses OpenGraph and standard metadata from HTML."""
+    """Parses OpenGraph and standard metadata from HTML (head only)."""
+    
+    STANDARD_NAMES = ('description', 'author', 'keywords', 'pubdate', 'lastmod')
     
     @staticmethod
     def parse(html: str) -> Dict[str, str]:
@@ -22,30 +25,24 @@ class OpenGraphParser:
             return {}
             
         try:
-            soup = BeautifulSoup(html, 'lxml')
-            meta_tags = soup.find_all('meta')
-            
-            extracted = {}
-            
-            for tag in meta_tags:
-                # OpenGraph properties
-                if tag.get('property', '').startswith('og:'):
-                    extracted[tag['property']] = tag.get('content', '')
-                
-                # Twitter card properties
-                elif tag.get('name', '').startswith('twitter:'):
-                    extracted[tag['name']] = tag.get('content', '')
-                
-                # Standard metadata
-                elif tag.get('name') in ['description', 'author', 'keywords', 'pubdate', 'lastmod']:
-                    extracted[tag['name']] = tag.get('content', '')
-                
-                # Article specific metadata
-                elif tag.get('property', '').startswith('article:'):
-                    extracted[tag['property']] = tag.get('content', '')
-                    
-            return extracted
+            return OpenGraphParser._select(parse_head(html))
             
         except Exception as e:
             logger.warning(f"Failed to parse OpenGraph tags: {e}")
             return {}
+    
+    @staticmethod
+    def parse_tree(tree) -> Dict[str, str]:
+        """parse() for an already parsed lxml document."""
+        if tree is None:
+            return {}
+        return OpenGraphParser._select(head_from_tree(tree))
+    
+    @staticmethod
+    def _select(head: PageHead) -> Dict[str, str]:
+        # OpenGraph, Twitter card, article and standard metadata
+        return {
+            key: content
+            for key, content in head.meta.items()
+            if key.startswith(('og:', 'twitter:', 'article:')) or key in OpenGraphParser.STANDARD_NAMES
+        }
@@ -1,72 +1,86 @@
 import logging
 import trafilatura
-import requests
-from typing import Optional
+from trafilatura.utils import load_html
+from typing import Dict, Optional, Tuple
 
-from ..types import ArticleExtractionResponse, ArticleExtractionError, ProxyError
+from ..types import ArticleExtractionResponse, ArticleExtractionError
+from ..fetcher import HtmlFetcher
 from .base import BaseArticleExtractor
 from .opengraph_parser import OpenGraphParser
-from ...scraper.proxy.manager import ProxyManager
+from ...media.cpu_pool import get_cpu_pool
 
 logger = logging.getLogger(__name__)
 
+
+def parse_article(html: str) -> Tuple[Optional[str], Optional[Dict], Dict[str, str]]:
+    """
+    Run the CPU-heavy parsing steps (main text, metadata, OG tags).
+    
+    The HTML is parsed into one lxml tree that all three steps read.
+    trafilatura.extract works on its own copy of it, and metadata
+    extraction comes last because it may modify the tree.
+    Module-level so it can run in the shared CPU pool.
+    
+    Returns:
+        Tuple of (main text, trafilatura metadata dict or None, OG tags)
+    """
+    tree = load_html(html)
+    if tree is None:
+        return None, None, {}
+    
+    text = trafilatura.extract(tree, include_comments=False, include_tables=False)
+    if not text:
+        return None, None, {}
+    
+    og_tags = OpenGraphParser.parse_tree(tree)
+    metadata_json = trafilatura.extract_metadata(tree)
+    return text, metadata_json.as_dict() if metadata_json else None, og_tags
+
+
 class TrafilaturaExtractor(BaseArticleExtractor):
     """Primary article extractor using Trafilatura."""
     
-    def __init__(self):
-        self.proxy_manager = ProxyManager()
+    def __init__(self, fetcher: Optional[HtmlFetcher] = None):
+        self.fetcher = fetcher or HtmlFetcher()
         self.og_parser = OpenGraphParser()
         
-    def extract(self, url: str, html_content: Optional[str] = None) -> ArticleExtractionResponse:
+    def extract(
+        self,
+        url: str,
+        html_content: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> ArticleExtractionResponse:
         """
         Extract article using Trafilatura.
         """
         logger.info(f"Extracting article with Trafilatura: {url}")
         
         try:
-            downloaded = html_content
-            
             # If no HTML provided, fetching it
-            if not downloaded:
-                proxies = {}
-                proxy_url = self.proxy_manager.get_proxy_url()
-                if proxy_url:
-                    proxies = {'http': proxy_url, 'https': proxy_url}
-                
-                try:
-                    response = requests.get(url, proxies=proxies, timeout=30, verify=False)
-                    response.raise_for_status()
-                    downloaded = response.text
-                except requests.RequestException as e:
-                    logger.error(f"Download failed for {url}: {e}")
-                    raise ProxyError(f"Failed to download article: {e}")
+            downloaded = html_content or self.fetcher.fetch(url)
 
             if not downloaded:
                 raise ArticleExtractionError("Empty content downloaded")
 
-            # Extract main text
-            text = trafilatura.extract(downloaded, include_comments=False, include_tables=False)
+            # Parse off the request thread (lxml parsing holds the GIL)
+            text, metadata, og_tags = get_cpu_pool().run(
+                parse_article, downloaded, payload_bytes=len(downloaded), timeout=timeout
+            )
             
             if not text:
                 logger.warning(f"Trafilatura failed to extract text for {url}")
                 raise ArticleExtractionError("No text extracted")
             
-            # Extract metadata
-            metadata_json = trafilatura.extract_metadata(downloaded)
-            
-            # Parse OG tags
-            og_tags = self.og_parser.parse(downloaded)
-            
             # Construct response
             response = ArticleExtractionResponse(
                 text=text,
                 url=url,
-                title=metadata_json.title if metadata_json else og_tags.get('og:title'),
-                author=metadata_json.author if metadata_json else og_tags.get('author'),
-                publish_date=metadata_json.date if metadata_json else og_tags.get('article:published_time'),
-                site_name=metadata_json.sitename if metadata_json else og_tags.get('og:site_name'),
+                title=metadata.get('title') if metadata else og_tags.get('og:title'),
+                author=metadata.get('author') if metadata else og_tags.get('author'),
+                publish_date=metadata.get('date') if metadata else og_tags.get('article:published_time'),
+                site_name=metadata.get('sitename') if metadata else og_tags.get('og:site_name'),
                 og_tags=og_tags,
-                metadata=metadata_json.as_dict() if metadata_json else {},
+                metadata=metadata or {},
                 # Basic classification, refined later
                 content_type='article' 
             )
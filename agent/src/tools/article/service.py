@@ -1,9 +1,21 @@
 import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Optional
 
-from .types import ArticleExtractionRequest, ArticleExtractionResponse, ArticleExtractionError
+from .types import (
+    ArticleExtractionRequest,
+    ArticleExtractionResponse,
+    ArticleExtractionError,
+    ExtractionPlan,
+    ExtractorBusyError,
+)
 from .extractors.trafilatura_extractor import TrafilaturaExtractor
 from .extractors.newspaper_extractor import NewspaperExtractor
+from .extractor_stats import ExtractorStatsStore
+from .fetcher import HtmlFetcher
 from .classifier import ContentClassifier
 
 logger = logging.getLogger(__name__)
@@ -11,34 +23,119 @@ logger = logging.getLogger(__name__)
 class ArticleService:
     """Unified service for article extraction."""
     
-    def __init__(self):
-        self.trafilatura = TrafilaturaExtractor()
+    # Key for extraction results attached to cached pages
+    CACHE_KEY = 'article'
+    # Extractor attributes in their default order
+    EXTRACTORS = ('trafilatura', 'newspaper')
+    
+    def __init__(self, extractor_stats: Optional[ExtractorStatsStore] = None, max_threads: Optional[int] = None):
+        """
+        Args:
+            extractor_stats: Per-domain extractor stats (default: in memory only)
+            max_threads: Threads extractions run on; they mostly wait on the network
+                or the CPU pool (default: ARTICLE_EXTRACTOR_THREADS env var, 16)
+        """
+        self.fetcher = HtmlFetcher()
+        self.trafilatura = TrafilaturaExtractor(fetcher=self.fetcher)
         self.newspaper = NewspaperExtractor()
         self.classifier = ContentClassifier()
+        self.extractor_stats = extractor_stats or ExtractorStatsStore()
+        # Extractions run here so they can be timed out. Extractors get the timeout
+        # too, so a timed-out one gives up its thread soon after instead of hogging it.
+        max_threads = max_threads or int(os.getenv('ARTICLE_EXTRACTOR_THREADS', '16'))
+        self._executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix='article-extract')
+    
+    def _run_extractor(
+        self, plan: ExtractionPlan, name: str, url: str, html: Optional[str]
+    ) -> ArticleExtractionResponse:
+        """
+        Run one extractor with its planned timeout and record the attempt.
+        
+        The timeout (and the recorded latency) start when the extractor starts,
+        not when it is queued. One that is still queued when its timeout runs
+        out is cancelled and not recorded: it says nothing about the extractor.
+        
+        Raises:
+            ExtractorBusyError: If it never started
+            ArticleExtractionError: If it failed or timed out
+        """
+        timeout = plan.timeouts[name]
+        started = threading.Event()
+        started_at = []
+        
+        def run():
+            started_at.append(time.monotonic())
+            started.set()
+            return getattr(self, name).extract(url, html_content=html, timeout=timeout)
+        
+        future = self._executor.submit(run)
+        if not started.wait(timeout) and future.cancel():
+            raise ExtractorBusyError(f"{name} didn't start within {timeout:.0f}s (all extraction threads busy)")
+        started.wait()  # Can't be cancelled: it started just as the wait ran out
+        
+        try:
+            remaining = timeout - (time.monotonic() - started_at[0])
+            try:
+                response = future.result(timeout=max(0.0, remaining))
+            except FutureTimeoutError:
+                raise ArticleExtractionError(f"{name} timed out after {timeout:.0f}s")
+        except Exception:
+            self.extractor_stats.record(plan.domain, name, False, (time.monotonic() - started_at[0]) * 1000)
+            raise
+        self.extractor_stats.record(
+            plan.domain, name, True, (time.monotonic() - started_at[0]) * 1000, len(response.text or '')
+        )
+        return response
         
     def extract(self, request: ArticleExtractionRequest) -> ArticleExtractionResponse:
         """
-        Extract article content using primary extractor with fallback.
+        Extract article content, trying extractors until one succeeds.
+        
+        The order and timeouts are chosen per domain from past results
+        (see ExtractorStatsStore); by default Trafilatura goes first and
+        Newspaper4k is the fallback.
+        
+        The page is downloaded once and shared by both extractors. If the
+        cached copy is still fresh or the server says it hasn't changed, the
+        previous extraction result is reused.
         """
         url = request.url
         response = None
         error = None
         
-        # Try Primary Extractor (Trafilatura)
+        html = None
         try:
-            response = self.trafilatura.extract(url)
+            page = self.fetcher.fetch_page(url)
+            html = page.html
+            if page.unchanged:
+                cached = self.fetcher.cache.recall(url, self.CACHE_KEY)
+                if cached:
+                    logger.info(f"Reusing extraction of unchanged page {url}")
+                    return ArticleExtractionResponse.model_validate({**cached, 'url': url})
         except Exception as e:
-            logger.warning(f"Trafilatura failed for {url}: {e}. Retrying with Newspaper4k.")
+            # Newspaper4k still gets a chance to download it itself
+            logger.warning(f"Download failed for {url}: {e}. Trying Newspaper4k.")
             error = e
-            
-        # Try Fallback Extractor (Newspaper4k)
-        if not response:
+        
+        plan = self.extractor_stats.plan(url, list(self.EXTRACTORS))
+        if plan.explored:
+            logger.info(f"Re-testing extractor order {plan.order} for {plan.domain}")
+        
+        for name in plan.order:
+            # Trafilatura needs the page; Newspaper4k can download it itself
+            if name == 'trafilatura' and not html:
+                continue
             try:
-                response = self.newspaper.extract(url)
+                response = self._run_extractor(plan, name, url, html)
             except Exception as e:
-                logger.error(f"Newspaper4k failed for {url}: {e}")
-                # Re-raise the original error if both failed, or a generic one
-                raise ArticleExtractionError(f"All extraction methods failed. Last error: {e}")
+                logger.warning(f"{name} failed for {url}: {e}")
+                error = e
+                continue
+            break
+        
+        if not response:
+            logger.error(f"All extractors failed for {url}: {error}")
+            raise ArticleExtractionError(f"All extraction methods failed. Last error: {error}")
         
         # Refine Classification
         if response:
@@ -52,4 +149,7 @@ class ArticleService:
                      response.metadata = {}
                  response.metadata['classification_error'] = str(e)
 
+            if html:
+                self.fetcher.cache.remember(url, self.CACHE_KEY, response.model_dump())
+
         return response
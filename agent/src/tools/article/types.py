@@ -28,10 +28,29 @@ class ArticleExtractionResponse(BaseModel):
     language: Optional[str] = None
     url: str
 
+class ExtractorStats(BaseModel):
+    """How one extractor has done on one domain (weighted toward recent attempts)."""
+    attempts: int = 0
+    successes: int = 0
+    success_rate: float = 0.0
+    avg_latency_ms: float = 0.0
+    avg_text_length: float = 0.0
+
+class ExtractionPlan(BaseModel):
+    """Extractor order and per-extractor timeouts chosen for a domain."""
+    domain: str
+    order: List[str]
+    timeouts: Dict[str, float] = Field(default_factory=dict, description="Seconds per extractor")
+    explored: bool = Field(False, description="Order was shuffled to re-test a demoted extractor")
+
 class ArticleExtractionError(Exception):
     """Base exception for article extraction errors."""
     pass
 
+class ExtractorBusyError(ArticleExtractionError):
+    """Raised when an extractor never started before its timeout (all extraction threads busy)."""
+    pass
+
 class UnsupportedPlatformError(ArticleExtractionError):
     """Raised when the platform/site is known to be unsupported."""
     pass
@@ -6,7 +6,9 @@ Supports Instagram, TikTok (Image Mode), and YouTube Community Posts.
 from .types import (
     ImageExtractionRequest,
     ImageExtractionResponse,
+    ImageHandle,
     ImageExtractionError,
     UnsupportedPlatformError,
     ProxyError,
+    RateLimitError,
 )
@@ -1,8 +1,10 @@
 import logging
-import httpx
 import os
+import requests
 from typing import Optional
 
+from tools.media.fetcher import get_media_fetcher
+
 logger = logging.getLogger(__name__)
 
 class ImageDownloader:
@@ -11,6 +13,7 @@ class ImageDownloader:
     def __init__(self):
         self.account_sid = os.environ.get('TWILIO_ACCOUNT_SID')
         self.auth_token = os.environ.get('TWILIO_AUTH_TOKEN')
+        self.fetcher = get_media_fetcher()
         
         if not self.account_sid or not self.auth_token:
             logger.warning("Twilio credentials missing. Media downloads from Twilio may fail.")
@@ -37,11 +40,9 @@ class ImageDownloader:
             logger.debug("Using Twilio Basic Auth for download")
 
         try:
-            with httpx.Client(follow_redirects=True, timeout=30.0) as client:
-                response = client.get(url, auth=auth)
-                response.raise_for_status()
-                return response.content
-        except httpx.HTTPError as e:
+            # Shared pooled session: keep-alive connections are reused across downloads
+            return self.fetcher.fetch(url, auth=auth)
+        except requests.RequestException as e:
             logger.error(f"HTTP error downloading image from {url}: {e}")
             raise Exception(f"Failed to download image: {str(e)}")
         except Exception as e:
@@ -1,125 +1,149 @@
 import logging
 import instaloader
-from io import BytesIO
+from functools import partial
 import requests
 from typing import Optional, List, Dict
 
 from .base import BaseExtractor
-from ..types import ImageExtractionResponse, ImageExtractionError, ProxyError, UnsupportedPlatformError
+from ..types import ImageExtractionResponse, ImageExtractionError, ImageHandle, ProxyError, UnsupportedPlatformError
+from .instagram_session import (
+    InstagramPostCache,
+    InstaloaderPool,
+    InstaloaderSession,
+    is_throttled,
+    throttle_wait,
+)
 from tools.scraper.proxy.manager import ProxyManager
+from tools.media.fetcher import get_media_fetcher
 
 logger = logging.getLogger(__name__)
 
 class InstagramExtractor(BaseExtractor):
-    """Instagram image extractor using Instaloader."""
+    """Instagram image extractor using a pool of Instaloader sessions."""
     
     def __init__(self):
         self.proxy_manager = ProxyManager()
-        self.loader = instaloader.Instaloader(
-            download_pictures=False,
-            download_videos=False,
-            download_video_thumbnails=False,
-            download_geotags=False,
-            download_comments=False,
-            save_metadata=False,
-            compress_json=False
-        )
+        self.fetcher = get_media_fetcher()
+        self.pool = InstaloaderPool()
+        self.post_cache = InstagramPostCache()
         
-    def _configure_proxy(self):
-        """Configure proxy for Instaloader."""
+    def _proxies(self) -> Optional[Dict[str, str]]:
+        """Proxy mapping for Instagram requests, or None for direct connections."""
         proxy_url = self.proxy_manager.get_proxy_url()
-        if proxy_url:
-            self.loader.context.proxies = {
-                'http': proxy_url,
-                'https': proxy_url
-            }
+        if not proxy_url:
+            return None
+        return {'http': proxy_url, 'https': proxy_url}
+
+    def _configure_proxy(self, session: InstaloaderSession):
+        """Route a pooled session's Instaloader requests through the current proxy."""
+        proxies = self._proxies()
+        if proxies:
+            session.context._session.proxies.update(proxies)
             logger.info("Instagram extractor using proxy")
 
     def extract(self, url: str) -> ImageExtractionResponse:
         """Extract images from Instagram post."""
-        
-        # Retry loop for proxy rotation
+        shortcode = self._extract_shortcode(url)
+        if not shortcode:
+            raise ImageExtractionError(f"Could not extract shortcode from URL: {url}")
+
+        # Repeated and concurrent saves of one post share a single lookup
+        post = self.post_cache.get_or_load(shortcode, partial(self._resolve_post, shortcode))
+
+        # Images download on first access (same proxy as the post lookup)
+        proxies = self._proxies()
+        image_urls = list(post['image_urls'])
+        images = [
+            ImageHandle.lazy(img_url, partial(self.fetcher.fetch, img_url, proxies=proxies), public=True)
+            for img_url in image_urls
+        ]
+
+        return ImageExtractionResponse(
+            images=images,
+            metadata=dict(post['metadata']),
+            platform='instagram',
+            image_urls=image_urls
+        )
+
+    def _resolve_post(self, shortcode: str) -> dict:
+        """
+        Look up a post's metadata and image URLs on a pooled session.
+
+        Throttled sessions are parked and the lookup moves to another one;
+        connection failures rotate the proxy.
+
+        Raises:
+            RateLimitError: Every session is cooling down
+            ProxyError: Connection failures persisted through all retries
+            ImageExtractionError: Post missing, or any other failure
+        """
         max_retries = 3
         last_error = None
         
         for attempt in range(max_retries + 1):
-            try:
-                if attempt > 0:
-                    logger.info(f"Retrying Instagram extraction (attempt {attempt}/{max_retries}) with new proxy")
-                    self.proxy_manager.rotate_proxy()
-                    
-                self._configure_proxy()
-                
-                shortcode = self._extract_shortcode(url)
-                if not shortcode:
-                    raise ImageExtractionError(f"Could not extract shortcode from URL: {url}")
-                    
-                post = instaloader.Post.from_shortcode(self.loader.context, shortcode)
-                
-                images = []
-                image_urls = []
-                
-                # handle carousel (sidecars) vs single image
-                if post.typename == 'GraphSidecar':
-                    for node in post.get_sidecar_nodes():
-                        if not node.is_video:
-                            image_urls.append(node.display_url)
-                elif not post.is_video:
-                    image_urls.append(post.url)
-                
-                if not image_urls:
-                     if post.is_video:
-                         image_urls.append(post.display_url) # Use thumbnail/display url
-    
-                # Download images
-                for img_url in image_urls:
-                    try:
-                        # Use the same proxy context for downloading
-                        resp = requests.get(
-                            img_url, 
-                            proxies=self.loader.context.proxies,
-                            timeout=30
-                        )
-                        resp.raise_for_status()
-                        images.append(resp.content)
-                    except Exception as e:
-                        logger.warning(f"Failed to download image {img_url}: {e}")
-                
-                if not images:
-                    raise ImageExtractionError("No images could be downloaded from post")
-    
-                return ImageExtractionResponse(
-                    images=images,
-                    metadata={
-                        'caption': post.caption,
-                        'author': post.owner_username,
-                        'likes': post.likes,
-                        'date': post.date_utc.isoformat() if post.date_utc else None,
-                        'hashtags': post.caption_hashtags,
-                        'platform': 'instagram'
-                    },
-                    platform='instagram',
-                    image_urls=image_urls
-                )
-                
-            except (instaloader.ConnectionException, ProxyError, requests.RequestException) as e:
-                 # This often indicates proxy issues or rate limits
-                 logger.warning(f"Instagram validation failed with proxy: {e}")
-                 last_error = e
-                 # Continue to next iteration to rotate proxy
-                 continue
-                 
-            except instaloader.QueryReturnedNotFoundException:
-                 raise ImageExtractionError("Instagram post not found")
-            except instaloader.LoginRequiredException:
-                 raise ImageExtractionError("Instagram login required (public access blocked)")
-            except Exception as e:
-                # Fatal errors
-                raise ImageExtractionError(f"Instagram extraction failed: {e}")
+            if attempt > 0:
+                logger.info(f"Retrying Instagram extraction (attempt {attempt}/{max_retries})")
+
+            with self.pool.acquire() as session:
+                try:
+                    self._configure_proxy(session)
+                    post = instaloader.Post.from_shortcode(session.context, shortcode)
+                    return self._post_record(post)
+
+                except instaloader.QueryReturnedNotFoundException:
+                    raise ImageExtractionError("Instagram post not found")
+                except ImageExtractionError:
+                    raise
+                except Exception as e:
+                    if is_throttled(e):
+                        # Blocked: more requests on this session only extend the block
+                        self.pool.cool_down(session, throttle_wait(e))
+                        last_error = e
+                        continue
+                    if isinstance(e, (instaloader.ConnectionException, requests.RequestException)):
+                        # This often indicates proxy issues
+                        logger.warning(f"Instagram validation failed with proxy: {e}")
+                        self.proxy_manager.rotate_proxy()
+                        last_error = e
+                        continue
+                    # Fatal errors
+                    raise ImageExtractionError(f"Instagram extraction failed: {e}")
 
         # If we get here, all retries failed
         raise ProxyError(f"Instagram extraction failed after {max_retries} retries. Last error: {last_error}")
 
+    @staticmethod
+    def _post_record(post) -> dict:
+        """Cacheable summary of a resolved post."""
+        image_urls = []
+        
+        # handle carousel (sidecars) vs single image
+        if post.typename == 'GraphSidecar':
+            for node in post.get_sidecar_nodes():
+                if not node.is_video:
+                    image_urls.append(node.display_url)
+        elif not post.is_video:
+            image_urls.append(post.url)
+        
+        if not image_urls:
+             if post.is_video:
+                 image_urls.append(post.display_url) # Use thumbnail/display url
+
+        if not image_urls:
+            raise ImageExtractionError("No images found in post")
+
+        return {
+            'image_urls': image_urls,
+            'metadata': {
+                'caption': post.caption,
+                'author': post.owner_username,
+                'likes': post.likes,
+                'date': post.date_utc.isoformat() if post.date_utc else None,
+                'hashtags': post.caption_hashtags,
+                'platform': 'instagram'
+            },
+        }
+
     def _extract_shortcode(self, url: str) -> Optional[str]:
         """Extract shortcode from Instagram URL."""
         # primitive regex or check
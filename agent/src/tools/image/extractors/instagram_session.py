@@ -0,0 +1,271 @@
+"""
+Instaloader session pool and post cache for the Instagram extractor.
+
+Instagram rate-limits anonymous GraphQL lookups per client, and a blocked
+client stays blocked for minutes. Hammering it through a retry loop only
+extends the block. Instead:
+
+- InstaloaderPool keeps a few long-lived Instaloader contexts (each with its
+  own keep-alive session and cookies). Each context is paced to at most one
+  lookup per INSTAGRAM_MIN_REQUEST_INTERVAL seconds. A context that gets a
+  429/401/403 cools down for INSTAGRAM_COOLDOWN_SECONDS while the others keep
+  serving. When every context is cooling down, callers fail fast with
+  RateLimitError instead of sleeping inside a request.
+- InstagramPostCache keeps resolved posts (metadata and image URLs) by
+  shortcode. The same post is often saved by several users at once, and
+  concurrent requests for one shortcode share a single lookup.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+import instaloader
+from instaloader.instaloadercontext import RateController
+
+from ..types import RateLimitError
+
+logger = logging.getLogger(__name__)
+
+# Responses that mean "this client is throttled or flagged", not "this post is broken"
+_THROTTLE_EXCEPTIONS = (
+    instaloader.TooManyRequestsException,
+    instaloader.LoginRequiredException,
+    instaloader.QueryReturnedForbiddenException,
+)
+_THROTTLE_STATUS_MARKERS = ('429', '401', '403')
+
+
+class ContextThrottled(instaloader.TooManyRequestsException):
+    """Instaloader's own rate controller wanted this context to wait."""
+
+    def __init__(self, wait_seconds: float):
+        super().__init__(f"Context needs to wait {wait_seconds:.0f}s")
+        self.wait_seconds = wait_seconds
+
+
+class _NonBlockingRateController(RateController):
+    """Raise instead of sleeping, so a throttled context is parked and another one used."""
+
+    def sleep(self, secs: float):
+        raise ContextThrottled(secs)
+
+
+def is_throttled(error: BaseException) -> bool:
+    """Whether an Instaloader error means the context was rate-limited or blocked."""
+    while error is not None:
+        if isinstance(error, _THROTTLE_EXCEPTIONS):
+            return True
+        if isinstance(error, instaloader.ConnectionException) and any(
+            marker in str(error) for marker in _THROTTLE_STATUS_MARKERS
+        ):
+            return True
+        error = error.__cause__
+    return False
+
+
+def throttle_wait(error: BaseException) -> Optional[float]:
+    """Wait time requested by the rate controller, if that is what raised."""
+    while error is not None:
+        if isinstance(error, ContextThrottled):
+            return error.wait_seconds
+        error = error.__cause__
+    return None
+
+
+def create_loader(request_timeout: float = 30.0) -> instaloader.Instaloader:
+    """Instaloader for metadata lookups only: no downloads, no internal sleeping or retries."""
+    return instaloader.Instaloader(
+        sleep=False,
+        quiet=True,
+        download_pictures=False,
+        download_videos=False,
+        download_video_thumbnails=False,
+        download_geotags=False,
+        download_comments=False,
+        save_metadata=False,
+        compress_json=False,
+        max_connection_attempts=1,
+        request_timeout=request_timeout,
+        rate_controller=lambda context: _NonBlockingRateController(context),
+    )
+
+
+class InstaloaderSession:
+    """One pooled Instaloader with its pacing and cool-down state."""
+
+    def __init__(self, name: str, loader: instaloader.Instaloader):
+        self.name = name
+        self.loader = loader
+        self.ready_at = 0.0  # monotonic time of the next allowed lookup
+        self.cooldown_until = 0.0
+        self.in_use = False
+
+    @property
+    def context(self):
+        return self.loader.context
+
+    def cooling_down(self, now: float) -> bool:
+        return now < self.cooldown_until
+
+
+class InstaloaderPool:
+    """Paced, self-healing pool of Instaloader contexts."""
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        min_interval: Optional[float] = None,
+        cooldown: Optional[float] = None,
+        max_wait: Optional[float] = None,
+        loader_factory: Callable[[], instaloader.Instaloader] = create_loader,
+    ):
+        """
+        Args:
+            size: Number of contexts (default: INSTAGRAM_SESSION_POOL_SIZE env var, 2)
+            min_interval: Seconds between lookups on one context
+                (default: INSTAGRAM_MIN_REQUEST_INTERVAL env var, 2)
+            cooldown: Seconds a throttled context is parked
+                (default: INSTAGRAM_COOLDOWN_SECONDS env var, 300)
+            max_wait: Longest a caller waits for a context before giving up (seconds, default 30)
+            loader_factory: Builds each context's Instaloader
+        """
+        size = size or int(os.getenv('INSTAGRAM_SESSION_POOL_SIZE', '2'))
+        self.min_interval = min_interval if min_interval is not None else float(
+            os.getenv('INSTAGRAM_MIN_REQUEST_INTERVAL', '2'))
+        self.cooldown = cooldown if cooldown is not None else float(
+            os.getenv('INSTAGRAM_COOLDOWN_SECONDS', '300'))
+        self.max_wait = max_wait if max_wait is not None else 30.0
+
+        self.sessions: List[InstaloaderSession] = [
+            InstaloaderSession(f"instaloader-{i}", loader_factory()) for i in range(max(1, size))
+        ]
+        self._cond = threading.Condition()
+
+    def _pick(self, now: float) -> Optional[InstaloaderSession]:
+        """Idle, non-throttled session that can make a request soonest."""
+        candidates = [s for s in self.sessions if not s.in_use and not s.cooling_down(now)]
+        return min(candidates, key=lambda s: s.ready_at) if candidates else None
+
+    @contextmanager
+    def acquire(self) -> Iterator[InstaloaderSession]:
+        """
+        Borrow a context, waiting for its pacing interval if needed.
+
+        Raises:
+            RateLimitError: Every context is cooling down, or none freed up within max_wait
+        """
+        deadline = time.monotonic() + self.max_wait
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                session = self._pick(now)
+                if session is not None:
+                    session.in_use = True
+                    break
+                if all(s.cooling_down(now) for s in self.sessions):
+                    retry_in = min(s.cooldown_until for s in self.sessions) - now
+                    raise RateLimitError(
+                        f"Instagram is rate limiting all {len(self.sessions)} sessions; retry in {retry_in:.0f}s")
+                if now >= deadline:
+                    raise RateLimitError("Timed out waiting for a free Instagram session")
+                self._cond.wait(deadline - now)
+
+        try:
+            delay = session.ready_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            yield session
+        finally:
+            with self._cond:
+                session.ready_at = time.monotonic() + self.min_interval
+                session.in_use = False
+                self._cond.notify()
+
+    def cool_down(self, session: InstaloaderSession, seconds: Optional[float] = None) -> None:
+        """Park a throttled context (default: the pool's cool-down)."""
+        seconds = self.cooldown if seconds is None else seconds
+        with self._cond:
+            session.cooldown_until = time.monotonic() + seconds
+        logger.warning(f"Instagram session {session.name} throttled; cooling down for {seconds:.0f}s")
+
+    def available(self) -> int:
+        """Contexts not currently cooling down."""
+        now = time.monotonic()
+        with self._cond:
+            return sum(not s.cooling_down(now) for s in self.sessions)
+
+
+class InstagramPostCache:
+    """TTL cache of resolved posts by shortcode, with one in-flight lookup per shortcode."""
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        """
+        Args:
+            ttl: Seconds a resolved post is reused (default: INSTAGRAM_POST_CACHE_TTL env var, 3600;
+                0 disables caching)
+            max_entries: Posts kept (default: INSTAGRAM_POST_CACHE_SIZE env var, 512)
+        """
+        self.ttl = ttl if ttl is not None else float(os.getenv('INSTAGRAM_POST_CACHE_TTL', '3600'))
+        self.max_entries = max_entries or int(os.getenv('INSTAGRAM_POST_CACHE_SIZE', '512'))
+
+        # shortcode -> (expires_at, post dict)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _get_fresh(self, shortcode: str) -> Optional[dict]:
+        entry = self._entries.get(shortcode)
+        if entry is None:
+            return None
+        expires_at, post = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[shortcode]
+            return None
+        self._entries.move_to_end(shortcode)
+        return post
+
+    def get(self, shortcode: str) -> Optional[dict]:
+        """Cached post, or None if missing or expired."""
+        with self._lock:
+            return self._get_fresh(shortcode)
+
+    def put(self, shortcode: str, post: dict) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[shortcode] = (time.monotonic() + self.ttl, post)
+            self._entries.move_to_end(shortcode)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_load(self, shortcode: str, load: Callable[[], dict]) -> dict:
+        """
+        Return the cached post, or resolve it with load().
+
+        Concurrent callers for the same shortcode wait for the first caller's
+        lookup instead of making their own. Errors are not cached.
+        """
+        with self._lock:
+            post = self._get_fresh(shortcode)
+            if post is not None:
+                return post
+            flight = self._inflight.setdefault(shortcode, threading.Lock())
+
+        with flight:
+            post = self.get(shortcode)
+            if post is not None:
+                logger.info(f"Instagram post {shortcode} resolved by a concurrent request")
+                return post
+            try:
+                post = load()
+                self.put(shortcode, post)
+                return post
+            finally:
+                with self._lock:
+                    if self._inflight.get(shortcode) is flight:
+                        del self._inflight[shortcode]
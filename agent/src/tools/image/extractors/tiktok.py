@@ -1,7 +1,9 @@
 from .base import BaseExtractor
-from ..types import ImageExtractionResponse, ImageExtractionError
+from ..types import ImageExtractionResponse, ImageExtractionError, ImageHandle
 from tools.scraper.proxy.manager import ProxyManager
+from tools.media.fetcher import get_media_fetcher
 import logging
+from functools import partial
 
 logger = logging.getLogger(__name__)
 
@@ -10,11 +12,11 @@ class TikTokExtractor(BaseExtractor):
     
     def __init__(self):
         self.proxy_manager = ProxyManager()
+        self.fetcher = get_media_fetcher()
     
     def extract(self, url: str) -> ImageExtractionResponse:
         """Extract images from TikTok video/slideshow URL."""
         import yt_dlp
-        import requests
         
         ydl_opts = {
             'quiet': True,
@@ -40,39 +42,40 @@ class TikTokExtractor(BaseExtractor):
                 
                 # Check for images in 'thumbnails' or specific formats
                 # TikTok slideshows often expose images as thumbnails
-                images = []
                 image_urls = []
+                thumbnails = []
                 
                 # Strategy 1: Check for 'thumbnails' (often contains the images for slideshows)
                 # Note: This is an approximation. Real slideshow scraping is complex.
                 if 'thumbnails' in info and info['thumbnails']:
                     # Get the largest thumbnail as a proxy for the image content if it's a single video
                     # For slideshows, yt-dlp might return entries
-                    best_thumb = info['thumbnails'][-1]['url']
-                    image_urls.append(best_thumb)
+                    best_thumb = info['thumbnails'][-1]
+                    thumbnails.append(best_thumb)
+                    image_urls.append(best_thumb['url'])
                 
                 # Strategy 2: Check for 'entries' if it's a playlist/slideshow
                 if 'entries' in info:
                     for entry in info['entries']:
                          if 'thumbnails' in entry:
-                             best_thumb = entry['thumbnails'][-1]['url']
-                             image_urls.append(best_thumb)
+                             best_thumb = entry['thumbnails'][-1]
+                             thumbnails.append(best_thumb)
+                             image_urls.append(best_thumb['url'])
                              
                 if not image_urls:
                     raise ImageExtractionError("No images found in TikTok URL")
                 
-                # Download images
-                for img_url in image_urls:
-                    try:
-                        resp = requests.get(img_url, proxies=proxies, timeout=30)
-                        resp.raise_for_status()
-                        images.append(resp.content)
-                    except Exception as e:
-                        logger.warning(f"Failed to download TikTok image {img_url}: {e}")
-                        # Continue to next image
-                
-                if not images:
-                    raise ImageExtractionError("Failed to download any images from TikTok")
+                # Images download on first access; yt-dlp reports thumbnail sizes
+                images = [
+                    ImageHandle.lazy(
+                        thumb['url'],
+                        partial(self.fetcher.fetch, thumb['url'], proxies=proxies),
+                        width=thumb.get('width'),
+                        height=thumb.get('height'),
+                        public=True,
+                    )
+                    for thumb in thumbnails
+                ]
 
                 return ImageExtractionResponse(
                     images=images,
@@ -1,7 +1,7 @@
 import logging
 from typing import List
 from .base import BaseExtractor
-from ..types import ImageExtractionResponse, ImageExtractionError
+from ..types import ImageExtractionResponse, ImageExtractionError, ImageHandle
 from ..downloader import ImageDownloader
 
 logger = logging.getLogger(__name__)
@@ -29,7 +29,7 @@ class TwilioExtractor(BaseExtractor):
             image_bytes = self.downloader.download(url)
             
             return ImageExtractionResponse(
-                images=[image_bytes],
+                images=[ImageHandle.from_bytes(image_bytes, url)],
                 metadata={
                     "platform": "twilio",
                     "caption": "WhatsApp Image",
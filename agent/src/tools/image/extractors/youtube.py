@@ -1,9 +1,11 @@
 from .base import BaseExtractor
-from ..types import ImageExtractionResponse, ImageExtractionError
+from ..types import ImageExtractionResponse, ImageExtractionError, ImageHandle
 from tools.scraper.proxy.manager import ProxyManager
+from tools.media.fetcher import get_media_fetcher
 import requests
 from bs4 import BeautifulSoup
 import logging
+from functools import partial
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +14,7 @@ class YouTubeCommunityExtractor(BaseExtractor):
     
     def __init__(self):
         self.proxy_manager = ProxyManager()
+        self.fetcher = get_media_fetcher()
     
     def extract(self, url: str) -> ImageExtractionResponse:
         """Extract images from YouTube Community Post."""
@@ -42,7 +45,6 @@ class YouTubeCommunityExtractor(BaseExtractor):
             # Basic requests often return the initial skeleton.
             # We look for meta tags or script data.
             
-            images = []
             image_urls = []
             
             # Try to find OG image
@@ -68,17 +70,11 @@ class YouTubeCommunityExtractor(BaseExtractor):
                 # because returning the channel avatar (often og:image) is misleading.
                 raise ImageExtractionError("Could not detect images in YouTube Community Post (dynamic content)")
             
-            # Download matched images
-            for img_url in image_urls:
-                 try:
-                    r = requests.get(img_url, proxies=proxies, timeout=30)
-                    if r.status_code == 200:
-                        images.append(r.content)
-                 except Exception as e:
-                     logger.warning(f"Failed to download YouTube image {img_url}: {e}")
-
-            if not images:
-                raise ImageExtractionError("Failed to download detected images")
+            # Images download on first access
+            images = [
+                ImageHandle.lazy(img_url, partial(self.fetcher.fetch, img_url, proxies=proxies), public=True)
+                for img_url in image_urls
+            ]
 
             return ImageExtractionResponse(
                 images=images,
@@ -0,0 +1,139 @@
+"""
+Image preprocessing for Vision API requests.
+
+Phone photos are 12 MP+ JPEGs, but the vision model only needs ~1024px.
+Fully decoding and LANCZOS-resampling the original dominates CPU time, so:
+
+1. JPEGs are decoded in draft mode: libjpeg scales by 1/2, 1/4 or 1/8 in the
+   DCT domain while decoding, so the full-size bitmap is never built. (Pillow's
+   thumbnail() only drafts to twice the target size, which a 12 MP photo
+   bound for 1024px never gets below.)
+2. The remaining downscale is reduce-then-resample (`reducing_gap`): a cheap
+   integer box reduction first, then the resampling filter on a small image.
+3. EXIF orientation is applied after downscaling, where a transpose is cheap.
+
+Functions are module-level so they can run in the shared CPU pool
+(tools.media.cpu_pool).
+"""
+
+import io
+import math
+import os
+from enum import Enum
+from typing import Optional, Tuple
+
+from PIL import Image, ExifTags
+
+
+class ResampleFilter(str, Enum):
+    """Final resampling filter; cost and sharpness decrease down the list."""
+    LANCZOS = "lanczos"
+    BICUBIC = "bicubic"
+    BILINEAR = "bilinear"
+
+
+_PIL_FILTERS = {
+    ResampleFilter.LANCZOS: Image.Resampling.LANCZOS,
+    ResampleFilter.BICUBIC: Image.Resampling.BICUBIC,
+    ResampleFilter.BILINEAR: Image.Resampling.BILINEAR,
+}
+
+# Larger than this adds tokens without helping the vision model
+VISION_MAX_SIZE = (1024, 1024)
+VISION_JPEG_QUALITY = 85
+VISION_RESAMPLE = ResampleFilter(os.getenv('IMAGE_RESAMPLE_FILTER', 'lanczos'))
+
+# Integer box reduction stops at this multiple of the target size so the
+# final filter still has enough pixels to antialias from
+REDUCING_GAP = 2.0
+
+# Modes Pillow can resample directly; others (P, 1, CMYK, I;16...) are converted first
+_RESAMPLABLE_MODES = {'RGB', 'RGBA', 'L', 'LA'}
+
+_ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+
+def _orientation(img: Image.Image) -> int:
+    """EXIF orientation tag (1 = upright) read from the header, without decoding pixels."""
+    try:
+        return int(img.getexif().get(ExifTags.Base.Orientation, 1))
+    except Exception:
+        return 1
+
+
+def downscale(
+    img: Image.Image,
+    max_size: Tuple[int, int] = VISION_MAX_SIZE,
+    resample: Optional[ResampleFilter] = None,
+) -> Image.Image:
+    """
+    Decode an opened (not yet loaded) image at no more than max_size, upright, in RGB.
+
+    Args:
+        img: Image from Image.open; draft mode only applies before pixels are loaded
+        max_size: Bounding box (width, height); images are never upscaled
+        resample: Final resampling filter (default: IMAGE_RESAMPLE_FILTER env var)
+
+    Returns:
+        RGB image
+    """
+    resample = ResampleFilter(resample or VISION_RESAMPLE)
+    orientation = _orientation(img)
+    if orientation in (5, 6, 7, 8):
+        # Bounds apply to the upright image; the stored one is rotated 90°
+        max_size = (max_size[1], max_size[0])
+
+    scale = min(max_size[0] / img.width, max_size[1] / img.height)
+    if img.format == 'JPEG' and scale < 1:
+        # DCT-domain downscale during decode (1/2, 1/4 or 1/8, never below the
+        # target size); also decodes straight to RGB
+        img.draft('RGB', (math.ceil(img.width * scale), math.ceil(img.height * scale)))
+
+    if img.mode not in _RESAMPLABLE_MODES:
+        img = img.convert('RGB')
+
+    # Reduce-then-resample; no-op for images already within bounds
+    img.thumbnail(max_size, _PIL_FILTERS[resample], reducing_gap=REDUCING_GAP)
+
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    transpose = _ORIENTATION_TRANSPOSE.get(orientation)
+    if transpose is not None:
+        img = img.transpose(transpose)
+
+    return img
+
+
+def prepare_for_vision(
+    image_bytes: bytes,
+    max_size: Tuple[int, int] = VISION_MAX_SIZE,
+    resample: Optional[ResampleFilter] = None,
+    quality: int = VISION_JPEG_QUALITY,
+) -> bytes:
+    """
+    Convert an image to an upright RGB JPEG no larger than max_size.
+
+    Args:
+        image_bytes: Encoded image in any format Pillow can read
+        max_size: Bounding box (width, height)
+        resample: Final resampling filter (default: IMAGE_RESAMPLE_FILTER env var)
+        quality: JPEG quality
+
+    Returns:
+        JPEG bytes
+    """
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        small = downscale(img, max_size, resample)
+
+        buffer = io.BytesIO()
+        small.save(buffer, format="JPEG", quality=quality)
+        return buffer.getvalue()
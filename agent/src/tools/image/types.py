@@ -1,5 +1,8 @@
-from typing import List, Optional, Dict
-from pydantic import BaseModel, Field, HttpUrl
+import threading
+from typing import Callable, List, Optional, Dict, Union
+from pydantic import BaseModel, Field, HttpUrl, PrivateAttr, field_validator
+
+from ..media.fetcher import get_media_fetcher
 
 class ImageExtractionRequest(BaseModel):
     """Request model for image extraction."""
@@ -7,13 +10,134 @@ class ImageExtractionRequest(BaseModel):
     platform_hint: Optional[str] = None
     message_id: Optional[str] = None
 
+class ImageHandle(BaseModel):
+    """
+    An extracted image, downloaded on first access.
+    
+    Extractors return handles (URL + loader) instead of bytes, so only the
+    images that are actually analyzed are ever downloaded.
+    """
+    url: Optional[str] = None
+    width: Optional[int] = Field(None, description="Width hint from the platform, if known")
+    height: Optional[int] = Field(None, description="Height hint from the platform, if known")
+    size_bytes: Optional[int] = Field(None, description="Content size (known once loaded)")
+    public: bool = Field(False, description="URL is fetchable without credentials (public CDN), so it can be passed by reference")
+
+    _loader: Optional[Callable[[], bytes]] = PrivateAttr(default=None)
+    _content: Optional[bytes] = PrivateAttr(default=None)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @classmethod
+    def lazy(
+        cls,
+        url: str,
+        loader: Callable[[], bytes],
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        public: bool = False,
+    ) -> "ImageHandle":
+        """Handle that calls loader() on first fetch()."""
+        handle = cls(url=url, width=width, height=height, public=public)
+        handle._loader = loader
+        return handle
+
+    @classmethod
+    def from_bytes(cls, content: bytes, url: Optional[str] = None) -> "ImageHandle":
+        """Handle for an image that is already in memory."""
+        handle = cls(url=url, size_bytes=len(content))
+        handle._content = content
+        return handle
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._content is not None
+
+    def fetch(self) -> bytes:
+        """
+        Return the image bytes, downloading them on first call.
+        
+        Raises:
+            ImageExtractionError: If the handle has neither content nor a loader
+            Exception: Whatever the loader raises (e.g. requests.RequestException)
+        """
+        with self._lock:
+            if self._content is None:
+                if self._loader is None:
+                    raise ImageExtractionError(f"Image {self.url} has no content")
+                self._content = self._loader()
+                self.size_bytes = len(self._content)
+            return self._content
+
+    def release(self) -> None:
+        """Drop downloaded bytes (re-fetchable handles only)."""
+        if self._loader is not None:
+            self._content = None
+
 class ImageExtractionResponse(BaseModel):
     """Response model for image extraction."""
-    images: List[bytes] = Field(default_factory=list, description="List of image contents as bytes")
+    images: List[ImageHandle] = Field(default_factory=list, description="Images in post order, downloaded on first access")
     metadata: Dict = Field(default_factory=dict, description="Extracted metadata (caption, author, etc)")
     platform: str
     image_urls: List[str] = Field(default_factory=list, description="Original URLs of the images")
 
+    @field_validator('images', mode='before')
+    @classmethod
+    def wrap_bytes(cls, value: List[Union[ImageHandle, bytes]]) -> List[ImageHandle]:
+        """Accept raw bytes for images that are already downloaded."""
+        return [
+            ImageHandle.from_bytes(bytes(image)) if isinstance(image, (bytes, bytearray)) else image
+            for image in value
+        ]
+
+    def load(
+        self,
+        limit: Optional[int] = None,
+        download: Optional[Callable[[ImageHandle], bool]] = None,
+    ) -> List[ImageHandle]:
+        """
+        Download the first `limit` images concurrently.
+        
+        Args:
+            limit: Number of images to consider (default: all)
+            download: Chooses which of them to download (default: all); the
+                others are returned as-is, e.g. to be passed by URL
+        
+        Returns:
+            The handles that loaded or were skipped, in post order (download
+            failures are logged and dropped)
+            
+        Raises:
+            ImageExtractionError: If none of them could be downloaded
+        """
+        handles = self.images[:limit] if limit else list(self.images)
+        to_download = [handle for handle in handles if download is None or download(handle)]
+        if not to_download:
+            return handles
+
+        results = get_media_fetcher().gather(
+            [handle.fetch for handle in to_download],
+            labels=[handle.url or str(i) for i, handle in enumerate(to_download)],
+        )
+        failed = {id(handle) for handle, content in zip(to_download, results) if content is None}
+        usable = [handle for handle in handles if id(handle) not in failed]
+        if not usable:
+            raise ImageExtractionError(f"No images could be downloaded from {self.platform} post")
+        return usable
+
+class TextDensity(BaseModel):
+    """How much of an image is text, estimated without OCR."""
+    text_boxes: int = Field(0, description="Word/line-shaped high-contrast regions")
+    coverage: float = Field(0.0, description="Fraction of the image covered by those regions")
+    background: float = Field(0.0, description="Fraction of pixels in the dominant (background) tone")
+    is_text_heavy: bool = False
+
+class OcrResult(BaseModel):
+    """Text recognized in an image by the local OCR fast path."""
+    text: str
+    word_count: int
+    confidence: float = Field(..., description="Mean Tesseract word confidence (0-100)")
+    density: TextDensity
+
 class ImageExtractionError(Exception):
     """Base exception for image extraction errors."""
     pass
@@ -25,3 +149,7 @@ class UnsupportedPlatformError(ImageExtractionError):
 class ProxyError(ImageExtractionError):
     """Raised when proxy connection fails."""
     pass
+
+class RateLimitError(ImageExtractionError):
+    """Raised when the platform is rate limiting every client we have."""
+    pass
@@ -0,0 +1,41 @@
+"""
+Shared media utilities for VaultBot workers.
+Content hashing, deduplication, a vision result cache, scratch space for downloaded media, a pooled
+media fetcher and a shared process pool for CPU-bound work.
+"""
+
+from .hashing import (
+    sha256_bytes,
+    sha256_file,
+    dhash_image,
+    dhash_frame,
+    video_frame_hashes,
+    hamming_distance,
+)
+from .dedup import MediaDedupIndex
+from .vision_cache import VisionResultCache
+from .scratch import ScratchSpace, ScratchJob, get_scratch_space
+from .fetcher import MediaFetcher, get_media_fetcher
+from .cpu_pool import CpuPool, available_cores, get_cpu_pool
+from .types import MediaError, ScratchSpaceError
+
+__all__ = [
+    "sha256_bytes",
+    "sha256_file",
+    "dhash_image",
+    "dhash_frame",
+    "video_frame_hashes",
+    "hamming_distance",
+    "MediaDedupIndex",
+    "VisionResultCache",
+    "ScratchSpace",
+    "ScratchJob",
+    "get_scratch_space",
+    "MediaFetcher",
+    "get_media_fetcher",
+    "CpuPool",
+    "available_cores",
+    "get_cpu_pool",
+    "MediaError",
+    "ScratchSpaceError",
+]
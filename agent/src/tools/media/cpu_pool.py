@@ -0,0 +1,163 @@
+"""
+Shared process pool for CPU-bound media and parsing work.
+
+Workers serve several jobs per instance on FastAPI's thread pool. Video
+decoding, Pillow resizing/re-encoding and HTML parsing hold the GIL, so one
+large job stalls every other in-flight job's I/O. Running those steps in a
+process pool keeps the request threads free to wait on the network.
+
+Tasks must be module-level functions with picklable arguments and results.
+Small payloads run inline: below MEDIA_CPU_OFFLOAD_MIN_KB the IPC overhead
+costs more than the GIL contention.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def available_cores() -> int:
+    """CPU cores this process may run on (respects container CPU affinity)."""
+    if hasattr(os, 'sched_getaffinity'):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+class CpuPool:
+    """Process pool with inline fallback and a queue-depth metric."""
+
+    def __init__(self, max_workers: Optional[int] = None, min_offload_bytes: Optional[int] = None):
+        """
+        Args:
+            max_workers: Pool size (default: MEDIA_CPU_WORKERS env var, or the
+                number of available cores). 0 disables the pool; tasks run inline.
+            min_offload_bytes: Payloads smaller than this run inline
+                (default: MEDIA_CPU_OFFLOAD_MIN_KB env var, 64 KB)
+        """
+        if max_workers is None:
+            max_workers = int(os.getenv('MEDIA_CPU_WORKERS', str(available_cores())))
+        if min_offload_bytes is None:
+            min_offload_bytes = int(os.getenv('MEDIA_CPU_OFFLOAD_MIN_KB', '64')) * 1024
+        self.max_workers = max(0, max_workers)
+        self.min_offload_bytes = min_offload_bytes
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Tasks submitted but not yet started (beyond the busy workers)."""
+        with self._lock:
+            return max(0, self._pending - self.max_workers)
+
+    def stats(self) -> dict:
+        """Snapshot of pool metrics; the media workers log it with each completed job."""
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'in_flight': min(self._pending, self.max_workers),
+                'queue_depth': max(0, self._pending - self.max_workers),
+                'completed': self._completed,
+            }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # forkserver: forking a process that already runs threads is unsafe
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(method),
+                )
+                logger.info(f"Started CPU pool with {self.max_workers} workers ({method})")
+            return self._executor
+
+    def _task_done(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    def run(
+        self,
+        fn: Callable,
+        *args,
+        payload_bytes: Optional[int] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Run fn(*args, **kwargs) in the pool and wait for the result.
+
+        Blocks only the calling thread; other threads keep the GIL.
+        Exceptions raised by fn are re-raised here.
+
+        Args:
+            fn: Module-level (picklable) function
+            payload_bytes: Approximate input size; small inputs run inline
+            timeout: Seconds to wait for a pooled task; on expiry it is cancelled
+                if it hasn't started (a running one finishes unobserved) and
+                concurrent.futures.TimeoutError is raised
+        """
+        if not self.enabled or (payload_bytes is not None and payload_bytes < self.min_offload_bytes):
+            return fn(*args, **kwargs)
+
+        with self._lock:
+            self._pending += 1
+            depth = max(0, self._pending - self.max_workers)
+
+        try:
+            try:
+                future = self._get_executor().submit(fn, *args, **kwargs)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); start a fresh pool once
+                logger.warning("CPU pool is broken, restarting it")
+                self.shutdown()
+                future = self._get_executor().submit(fn, *args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        future.add_done_callback(self._task_done)
+        if depth:
+            logger.info(f"CPU pool queue depth: {depth} (workers={self.max_workers})")
+
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def shutdown(self) -> None:
+        """Stop the worker processes (registered with atexit)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_default_pool: Optional[CpuPool] = None
+_default_lock = threading.Lock()
+
+
+def get_cpu_pool() -> CpuPool:
+    """Return the process-wide CpuPool (worker processes start on first offload)."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = CpuPool()
+            atexit.register(_default_pool.shutdown)
+        return _default_pool
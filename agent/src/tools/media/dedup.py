@@ -0,0 +1,97 @@
+"""
+Content-based deduplication index backed by the link_metadata table.
+
+WhatsApp media URLs change on every forward, so URL hashes can't detect
+repeated media. This index looks up previously analyzed media by the
+SHA-256 of its bytes, and optionally by perceptual hash (Hamming distance)
+to catch re-encoded copies.
+
+A perceptual match reuses another upload's description and summary, and a
+single 64-bit dHash can match unrelated images with a similar layout, so it
+is off by default. Videos only match perceptually when every sampled frame
+is within the distance.
+"""
+
+import os
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# match_link_metadata_by_phash narrows candidates by eight one-byte bands of the
+# hash; two hashes up to 7 bits apart always share a band
+MAX_BAND_DISTANCE = 7
+
+
+class MediaDedupIndex:
+    """Looks up existing link_metadata rows by media content hash."""
+    
+    SELECT_COLUMNS = 'id, scrape_count, description, ai_summary'
+    
+    def __init__(self, supabase, use_perceptual: Optional[bool] = None, max_distance: Optional[int] = None):
+        """
+        Initialize the dedup index.
+        
+        Args:
+            supabase: Supabase client
+            use_perceptual: Also match near-duplicates by perceptual hash
+                (default: MEDIA_PHASH_DEDUP env var, false)
+            max_distance: Max Hamming distance for a perceptual match, at most 7
+                (the RPC's band index only finds matches up to 7 bits apart)
+                (default: MEDIA_PHASH_MAX_DISTANCE env var, 6)
+        """
+        self.supabase = supabase
+        if use_perceptual is None:
+            use_perceptual = os.getenv('MEDIA_PHASH_DEDUP', 'false').lower() == 'true'
+        if max_distance is None:
+            max_distance = int(os.getenv('MEDIA_PHASH_MAX_DISTANCE', '6'))
+        self.use_perceptual = use_perceptual
+        self.max_distance = min(max_distance, MAX_BAND_DISTANCE)
+    
+    def find(
+        self,
+        content_hash: Optional[str],
+        perceptual_hash: Optional[int] = None,
+        content_type: Optional[str] = None,
+        frame_hashes: Optional[List[int]] = None,
+    ) -> Optional[dict]:
+        """
+        Find previously analyzed media with the same content.
+        
+        Args:
+            content_hash: Hex SHA-256 of the media bytes
+            perceptual_hash: Optional signed 64-bit perceptual hash
+            content_type: Restrict perceptual matches to 'image' or 'video'
+            frame_hashes: Per-frame perceptual hashes of a video; a match must
+                be within the distance on every frame
+            
+        Returns:
+            The matching link_metadata row (id, scrape_count, description,
+            ai_summary) or None. Lookup errors are logged and treated as a miss.
+        """
+        try:
+            if content_hash:
+                result = self.supabase.table('link_metadata').select(
+                    self.SELECT_COLUMNS
+                ).eq('content_hash', content_hash).limit(1).execute()
+                if result and result.data:
+                    logger.info(f"Content hash match: {result.data[0]['id']}")
+                    return result.data[0]
+            
+            if self.use_perceptual and perceptual_hash is not None:
+                params = {
+                    'p_hash': perceptual_hash,
+                    'p_max_distance': self.max_distance,
+                    'p_content_type': content_type,
+                }
+                if frame_hashes:
+                    params['p_frame_hashes'] = frame_hashes
+                result = self.supabase.rpc('match_link_metadata_by_phash', params).execute()
+                if result and result.data:
+                    match = result.data[0]
+                    logger.info(f"Perceptual hash match: {match['id']} (distance {match.get('distance')})")
+                    return match
+        except Exception as e:
+            logger.warning(f"Media dedup lookup failed: {e}")
+        
+        return None
@@ -0,0 +1,175 @@
+"""
+Shared, pooled HTTP fetcher for media files (images, thumbnails).
+
+Extractors used to download a post's images one by one with bare
+requests.get, paying a new TCP/TLS handshake per image. MediaFetcher keeps
+one requests.Session with a keep-alive connection pool and downloads a
+post's images concurrently on a shared thread pool, so a 10-image carousel
+takes about as long as its slowest image.
+
+Concurrency per host is capped (MEDIA_FETCH_PER_HOST) so carousels don't
+hammer a single CDN node and trip rate limits.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'image/avif,image/webp,image/*,*/*;q=0.8',
+}
+
+
+class MediaFetcher:
+    """Concurrent media downloads over a pooled keep-alive session."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        per_host_limit: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ):
+        """
+        Args:
+            max_workers: Concurrent downloads across all hosts
+                (default: MEDIA_FETCH_WORKERS env var, 16)
+            per_host_limit: Concurrent downloads (and pooled connections) per host
+                (default: MEDIA_FETCH_PER_HOST env var, 6)
+            connect_timeout: Seconds to establish a connection
+                (default: MEDIA_FETCH_CONNECT_TIMEOUT env var, 5)
+            read_timeout: Seconds to wait between bytes
+                (default: MEDIA_FETCH_READ_TIMEOUT env var, 30)
+        """
+        self.max_workers = max_workers or int(os.getenv('MEDIA_FETCH_WORKERS', '16'))
+        self.per_host_limit = per_host_limit or int(os.getenv('MEDIA_FETCH_PER_HOST', '6'))
+        self.timeout = (
+            connect_timeout or float(os.getenv('MEDIA_FETCH_CONNECT_TIMEOUT', '5')),
+            read_timeout or float(os.getenv('MEDIA_FETCH_READ_TIMEOUT', '30')),
+        )
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        # Retry connection errors and throttling; idempotent GETs only
+        retry = Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=self.per_host_limit, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='media-fetch')
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return slot
+
+    def fetch(
+        self,
+        url: str,
+        proxies: Optional[Dict[str, str]] = None,
+        auth: Optional[Tuple[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> bytes:
+        """
+        Download one URL.
+
+        Raises:
+            requests.RequestException: On connection errors, timeouts or non-2xx status
+        """
+        with self._host_slot(url):
+            response = self.session.get(
+                url,
+                proxies=proxies,
+                auth=auth,
+                headers=headers,
+                timeout=self.timeout,
+                allow_redirects=True,
+            )
+            response.raise_for_status()
+            return response.content
+
+    @staticmethod
+    def _call_or_none(task: Callable[[], T], label: str) -> Optional[T]:
+        try:
+            return task()
+        except Exception as e:
+            logger.warning(f"Failed to download media {label}: {e}")
+            return None
+
+    def gather(self, tasks: List[Callable[[], T]], labels: Optional[List[str]] = None) -> List[Optional[T]]:
+        """
+        Run download callables concurrently on the shared fetch threads.
+
+        Failures are logged, not raised, so one broken image doesn't lose the
+        rest of a carousel.
+
+        Args:
+            tasks: Zero-argument callables (e.g. bound fetch methods)
+            labels: Names for log messages (default: task index)
+
+        Returns:
+            Each task's result in input order; None where it raised
+        """
+        labels = labels or [str(i) for i in range(len(tasks))]
+        if len(tasks) <= 1:
+            return [self._call_or_none(task, label) for task, label in zip(tasks, labels)]
+
+        futures = [self._executor.submit(self._call_or_none, task, label) for task, label in zip(tasks, labels)]
+        return [future.result() for future in futures]
+
+    def fetch_all(
+        self,
+        urls: List[str],
+        proxies: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> List[Optional[bytes]]:
+        """
+        Download URLs concurrently (see gather).
+
+        Returns:
+            Content for each URL in input order; None where the download failed
+        """
+        tasks = [partial(self.fetch, url, proxies=proxies, headers=headers) for url in urls]
+        return self.gather(tasks, labels=urls)
+
+    def close(self) -> None:
+        """Release pooled connections and worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+
+_default_fetcher: Optional[MediaFetcher] = None
+_default_lock = threading.Lock()
+
+
+def get_media_fetcher() -> MediaFetcher:
+    """Return the process-wide MediaFetcher."""
+    global _default_fetcher
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = MediaFetcher()
+        return _default_fetcher
@@ -0,0 +1,131 @@
+"""
+Content and perceptual hashing for media deduplication.
+
+SHA-256 identifies byte-identical media (e.g. the same WhatsApp video
+forwarded across chats). A 64-bit difference hash (dHash) identifies
+visually identical media that was re-encoded, resized or re-compressed;
+videos get one per sampled frame, since one frame says little about the rest.
+
+Perceptual hashes are returned as signed 64-bit integers so they can be
+stored in a Postgres BIGINT column and compared with XOR + bit_count.
+"""
+
+import hashlib
+import io
+import logging
+from typing import List, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+HASH_SIZE = 8  # 8x8 comparisons -> 64-bit hash
+VIDEO_HASH_FRAMES = 5  # Frames hashed per video
+CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_bytes(data: bytes) -> str:
+    """Return the hex SHA-256 of an in-memory payload."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: str, chunk_size: int = CHUNK_SIZE) -> str:
+    """Return the hex SHA-256 of a file, reading it in chunks."""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _to_signed64(value: int) -> int:
+    """Map an unsigned 64-bit value into Postgres BIGINT range."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _dhash_gray(gray: np.ndarray) -> int:
+    """Compute dHash from a (HASH_SIZE, HASH_SIZE + 1) grayscale array."""
+    diff = gray[:, 1:] > gray[:, :-1]
+    value = 0
+    for bit in diff.flatten():
+        value = (value << 1) | int(bit)
+    return _to_signed64(value)
+
+
+def dhash_image(image: Union[bytes, "Image.Image"]) -> Optional[int]:
+    """
+    Compute a 64-bit difference hash for an image.
+    
+    Args:
+        image: Encoded image bytes or a PIL Image
+        
+    Returns:
+        Signed 64-bit perceptual hash, or None if the image can't be decoded
+    """
+    from PIL import Image
+
+    try:
+        if isinstance(image, (bytes, bytearray)):
+            image = Image.open(io.BytesIO(image))
+        small = image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS)
+        return _dhash_gray(np.asarray(small, dtype=np.int16))
+    except Exception as e:
+        logger.warning(f"Failed to compute perceptual hash for image: {e}")
+        return None
+
+
+def dhash_frame(frame: np.ndarray) -> Optional[int]:
+    """
+    Compute a 64-bit difference hash for a BGR video frame (OpenCV).
+    
+    Returns:
+        Signed 64-bit perceptual hash, or None on failure
+    """
+    import cv2
+
+    try:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        small = cv2.resize(gray, (HASH_SIZE + 1, HASH_SIZE), interpolation=cv2.INTER_AREA)
+        return _dhash_gray(small.astype(np.int16))
+    except Exception as e:
+        logger.warning(f"Failed to compute perceptual hash for frame: {e}")
+        return None
+
+
+def video_frame_hashes(video_path: str, num_frames: int = VIDEO_HASH_FRAMES) -> Optional[List[int]]:
+    """
+    Compute perceptual hashes of equidistant frames across a video.
+    
+    Frames are taken from the interior of the timeline (not the first or
+    last frame, which are often black or a shared intro/outro card). Only
+    num_frames frames are decoded, so it is cheap compared to full frame
+    extraction.
+    
+    Returns:
+        Signed 64-bit perceptual hashes in timeline order, or None if any
+        sampled frame can't be read (a partial list can't be compared)
+    """
+    import cv2
+
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            return None
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        positions = [total_frames * (i + 1) // (num_frames + 1) for i in range(num_frames)]
+        hashes = []
+        for position in positions:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, position)
+            ret, frame = cap.read()
+            frame_hash = dhash_frame(frame) if ret else None
+            if frame_hash is None:
+                return None
+            hashes.append(frame_hash)
+        return hashes
+    finally:
+        cap.release()
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two 64-bit hashes."""
+    return bin((a ^ b) & ((1 << 64) - 1)).count('1')
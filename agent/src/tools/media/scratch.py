@@ -0,0 +1,220 @@
+"""
+Managed scratch space for media temp files.
+
+Cloud Run's filesystem is memory-backed, so every downloaded video counts
+against the instance's memory limit. Instead of ad-hoc NamedTemporaryFile
+calls, downloads go into a per-job directory under a single scratch root:
+
+- Each job reserves its quota from a global byte budget before downloading;
+  when the budget is used up, new jobs wait for running ones to finish.
+- A job's directory is removed when the job's context exits, whatever
+  files the downloader (or yt-dlp/ffmpeg) left in it.
+- Directories left behind by crashed processes are swept on startup.
+"""
+
+import atexit
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from .types import ScratchSpaceError
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+PROCESS_DIR_PREFIX = 'pid-'
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process with this PID exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ScratchJob:
+    """A job's private scratch directory and its byte quota."""
+
+    def __init__(self, job_id: str, path: str, quota_bytes: int):
+        self.job_id = job_id
+        self.path = path
+        self.quota_bytes = quota_bytes
+
+    def file_path(self, suffix: str = '') -> str:
+        """Return a new, unused file path inside the job directory."""
+        return os.path.join(self.path, f"{uuid.uuid4().hex}{suffix}")
+
+    def used_bytes(self) -> int:
+        """Total size of files currently in the job directory."""
+        total = 0
+        for dirpath, _, filenames in os.walk(self.path):
+            for name in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, name))
+                except OSError:
+                    pass
+        return total
+
+
+class ScratchSpace:
+    """Allocates per-job scratch directories under a global byte budget."""
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        budget_bytes: Optional[int] = None,
+        job_quota_bytes: Optional[int] = None,
+        wait_timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the scratch space and sweep leftovers from dead processes.
+
+        Args:
+            root: Scratch root directory (default: MEDIA_SCRATCH_ROOT env var,
+                or <tmp>/vaultbot-scratch). Point it at /dev/shm for RAM-backed storage.
+            budget_bytes: Total bytes all concurrent jobs may reserve
+                (default: MEDIA_SCRATCH_BUDGET_MB env var, 1024 MB)
+            job_quota_bytes: Default per-job quota
+                (default: MEDIA_SCRATCH_JOB_QUOTA_MB env var, 128 MB)
+            wait_timeout: Seconds a job waits for budget before failing
+                (default: MEDIA_SCRATCH_WAIT_SECONDS env var, 300)
+        """
+        self.root = root or os.getenv(
+            'MEDIA_SCRATCH_ROOT', os.path.join(tempfile.gettempdir(), 'vaultbot-scratch')
+        )
+        self.budget_bytes = budget_bytes or int(os.getenv('MEDIA_SCRATCH_BUDGET_MB', '1024')) * MB
+        self.job_quota_bytes = job_quota_bytes or int(os.getenv('MEDIA_SCRATCH_JOB_QUOTA_MB', '128')) * MB
+        self.wait_timeout = wait_timeout if wait_timeout is not None else float(
+            os.getenv('MEDIA_SCRATCH_WAIT_SECONDS', '300')
+        )
+
+        self._reserved = 0
+        self._condition = threading.Condition()
+
+        self.process_dir = os.path.join(self.root, f"{PROCESS_DIR_PREFIX}{os.getpid()}")
+        self.sweep()
+        os.makedirs(self.process_dir, exist_ok=True)
+        atexit.register(self.cleanup)
+
+        logger.info(
+            f"Scratch space at {self.process_dir} "
+            f"(budget={self.budget_bytes // MB}MB, job quota={self.job_quota_bytes // MB}MB)"
+        )
+
+    @property
+    def reserved_bytes(self) -> int:
+        """Bytes currently reserved by running jobs."""
+        with self._condition:
+            return self._reserved
+
+    def sweep(self) -> int:
+        """
+        Remove scratch directories left by processes that are no longer running.
+
+        This process's own directory is cleared too: it is only swept before any
+        job starts, and a restarted container often reuses the same PID.
+
+        Returns:
+            Number of directories removed
+        """
+        if not os.path.isdir(self.root):
+            return 0
+
+        removed = 0
+        for entry in os.listdir(self.root):
+            if not entry.startswith(PROCESS_DIR_PREFIX):
+                continue
+            try:
+                pid = int(entry[len(PROCESS_DIR_PREFIX):])
+            except ValueError:
+                continue
+            if pid == os.getpid() or not _pid_alive(pid):
+                shutil.rmtree(os.path.join(self.root, entry), ignore_errors=True)
+                removed += 1
+
+        if removed:
+            logger.info(f"Swept {removed} stale scratch directories from {self.root}")
+        return removed
+
+    def reserve(self, nbytes: int) -> None:
+        """
+        Reserve bytes from the global budget, waiting if it is exhausted.
+
+        Raises:
+            ScratchSpaceError: If nbytes exceeds the whole budget or the wait times out
+        """
+        if nbytes > self.budget_bytes:
+            raise ScratchSpaceError(
+                f"Requested {nbytes} bytes exceeds scratch budget of {self.budget_bytes} bytes"
+            )
+
+        deadline = time.monotonic() + self.wait_timeout
+        with self._condition:
+            while self._reserved + nbytes > self.budget_bytes:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise ScratchSpaceError(
+                        f"Timed out after {self.wait_timeout}s waiting for {nbytes} bytes of scratch space"
+                    )
+                logger.info(f"Scratch budget full ({self._reserved} bytes reserved), waiting")
+                self._condition.wait(remaining)
+            self._reserved += nbytes
+
+    def release(self, nbytes: int) -> None:
+        """Return bytes to the global budget and wake waiting jobs."""
+        with self._condition:
+            self._reserved = max(0, self._reserved - nbytes)
+            self._condition.notify_all()
+
+    @contextmanager
+    def job(self, job_id: str, quota_bytes: Optional[int] = None) -> Iterator[ScratchJob]:
+        """
+        Reserve scratch space for a job and remove its directory afterwards.
+
+        Args:
+            job_id: Job identifier (used in the directory name for debugging)
+            quota_bytes: Per-job quota (default: job_quota_bytes)
+
+        Yields:
+            ScratchJob whose directory exists for the duration of the context
+        """
+        quota = quota_bytes or self.job_quota_bytes
+        self.reserve(quota)
+        path = None
+        try:
+            os.makedirs(self.process_dir, exist_ok=True)
+            safe_id = re.sub(r'[^A-Za-z0-9_-]', '_', str(job_id))[:64]
+            path = tempfile.mkdtemp(prefix=f"{safe_id}-", dir=self.process_dir)
+            yield ScratchJob(job_id, path, quota)
+        finally:
+            if path:
+                shutil.rmtree(path, ignore_errors=True)
+            self.release(quota)
+
+    def cleanup(self) -> None:
+        """Remove this process's scratch directory (registered with atexit)."""
+        shutil.rmtree(self.process_dir, ignore_errors=True)
+
+
+_default_scratch: Optional[ScratchSpace] = None
+_default_lock = threading.Lock()
+
+
+def get_scratch_space() -> ScratchSpace:
+    """Return the process-wide ScratchSpace, creating (and sweeping) it on first use."""
+    global _default_scratch
+    with _default_lock:
+        if _default_scratch is None:
+            _default_scratch = ScratchSpace()
+        return _default_scratch
@@ -0,0 +1,13 @@
+"""
+Exceptions for shared media utilities.
+"""
+
+
+class MediaError(Exception):
+    """Base exception for shared media utilities."""
+    pass
+
+
+class ScratchSpaceError(MediaError):
+    """Raised when scratch space can't be reserved (budget wait timed out or quota too large)."""
+    pass
@@ -0,0 +1,197 @@
+"""
+Perceptual-hash cache for vision analyses.
+
+The same meme or screenshot gets forwarded across many chats, and each copy
+is re-encoded or resized along the way. This cache maps an image's 64-bit
+dHash to its vision description (and the link_metadata row it was saved
+under), so near-identical images within MEDIA_PHASH_MAX_DISTANCE bits reuse
+the earlier analysis instead of calling the vision API again.
+
+Lookups check a small in-process LRU first, then the vision_result_cache
+table (match_vision_cache_by_phash RPC). Entries are keyed by prompt, so
+changing the prompt invalidates them.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from .hashing import hamming_distance
+
+logger = logging.getLogger(__name__)
+
+# The table's band index only finds matches within 7 bits
+MAX_INDEXED_DISTANCE = 7
+
+
+def prompt_key(prompt: str) -> str:
+    """Short stable key for a vision prompt."""
+    return hashlib.sha256(prompt.encode()).hexdigest()[:16]
+
+
+class VisionResultCache:
+    """Near-duplicate lookup of previous vision descriptions by perceptual hash."""
+
+    TABLE = 'vision_result_cache'
+
+    def __init__(
+        self,
+        supabase=None,
+        enabled: Optional[bool] = None,
+        max_distance: Optional[int] = None,
+        memory_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            supabase: Supabase client; None keeps the cache in memory only
+            enabled: Default: VISION_CACHE_ENABLED env var, true
+            max_distance: Max Hamming distance for a match
+                (default: MEDIA_PHASH_MAX_DISTANCE env var, 6; at most 7)
+            memory_size: Entries kept in the in-process LRU
+                (default: VISION_CACHE_MEMORY_SIZE env var, 1024)
+        """
+        self.supabase = supabase
+        if enabled is None:
+            enabled = os.getenv('VISION_CACHE_ENABLED', 'true').lower() == 'true'
+        if max_distance is None:
+            max_distance = int(os.getenv('MEDIA_PHASH_MAX_DISTANCE', '6'))
+        if memory_size is None:
+            memory_size = int(os.getenv('VISION_CACHE_MEMORY_SIZE', '1024'))
+        self.enabled = enabled
+        self.max_distance = min(max_distance, MAX_INDEXED_DISTANCE)
+        self.memory_size = memory_size
+
+        # (prompt_key, perceptual_hash) -> entry dict
+        self._memory: "OrderedDict[Tuple[str, int], dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key: Tuple[str, int], entry: dict) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def _lookup_memory(self, perceptual_hash: int, key: str) -> Optional[dict]:
+        with self._lock:
+            exact = self._memory.get((key, perceptual_hash))
+            if exact is not None:
+                self._memory.move_to_end((key, perceptual_hash))
+                return {**exact, 'distance': 0}
+
+            best, best_distance = None, self.max_distance + 1
+            for (entry_key, entry_hash), entry in self._memory.items():
+                if entry_key != key:
+                    continue
+                distance = hamming_distance(entry_hash, perceptual_hash)
+                if distance < best_distance:
+                    best, best_distance = entry, distance
+            return {**best, 'distance': best_distance} if best else None
+
+    def lookup(self, perceptual_hash: Optional[int], prompt: str) -> Optional[dict]:
+        """
+        Find a cached analysis of a near-identical image.
+
+        Args:
+            perceptual_hash: Signed 64-bit dHash of the image
+            prompt: The vision prompt the analysis must have been made with
+
+        Returns:
+            Dict with id, description, link_metadata_id and distance, or None.
+            Lookup errors are logged and treated as a miss.
+        """
+        if not self.enabled or perceptual_hash is None:
+            return None
+
+        key = prompt_key(prompt)
+        hit = self._lookup_memory(perceptual_hash, key)
+        if hit:
+            logger.info(f"Vision cache hit in memory (distance {hit['distance']})")
+            return hit
+
+        if self.supabase is None:
+            return None
+
+        try:
+            result = self.supabase.rpc('match_vision_cache_by_phash', {
+                'p_hash': perceptual_hash,
+                'p_prompt_key': key,
+                'p_max_distance': self.max_distance,
+            }).execute()
+            if result and result.data:
+                hit = result.data[0]
+                logger.info(f"Vision cache hit {hit['id']} (distance {hit.get('distance')})")
+                self._remember((key, perceptual_hash), {
+                    'id': hit['id'],
+                    'description': hit['description'],
+                    'link_metadata_id': hit.get('link_metadata_id'),
+                })
+                return hit
+        except Exception as e:
+            logger.warning(f"Vision cache lookup failed: {e}")
+
+        return None
+
+    def store(
+        self,
+        perceptual_hash: Optional[int],
+        prompt: str,
+        description: str,
+        content_hash: Optional[str] = None,
+        link_metadata_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Cache a vision description.
+
+        Returns:
+            Id of the new cache row (None if memory-only or the insert failed)
+        """
+        if not self.enabled or perceptual_hash is None or not description:
+            return None
+
+        key = prompt_key(prompt)
+        entry = {'id': None, 'description': description, 'link_metadata_id': link_metadata_id}
+        self._remember((key, perceptual_hash), entry)
+
+        if self.supabase is None:
+            return None
+
+        try:
+            result = self.supabase.table(self.TABLE).insert({
+                'perceptual_hash': perceptual_hash,
+                'prompt_key': key,
+                'description': description,
+                'content_hash': content_hash,
+                'link_metadata_id': link_metadata_id,
+            }).execute()
+            if result and result.data:
+                entry['id'] = result.data[0]['id']
+                return entry['id']
+        except Exception as e:
+            logger.warning(f"Vision cache store failed: {e}")
+
+        return None
+
+    def link(self, cache_ids: List[str], link_metadata_id: str) -> None:
+        """Record the link_metadata row that new cache entries were saved under."""
+        cache_ids = [cache_id for cache_id in cache_ids if cache_id]
+        if not cache_ids or not link_metadata_id:
+            return
+
+        with self._lock:
+            for entry in self._memory.values():
+                if entry.get('id') in cache_ids:
+                    entry['link_metadata_id'] = link_metadata_id
+
+        if self.supabase is None:
+            return
+
+        try:
+            self.supabase.table(self.TABLE).update({
+                'link_metadata_id': link_metadata_id
+            }).in_('id', cache_ids).execute()
+        except Exception as e:
+            logger.warning(f"Failed to link vision cache entries to {link_metadata_id}: {e}")
@@ -1,11 +1,11 @@
 import os
 import json
 import logging
-from typing import Optional
+from typing import List, Optional
 from openai import OpenAI
 
-from .types import NormalizerRequest, NormalizerResponse
-from prompts.normalizer import NormalizerSystemPrompt
+from .types import NormalizerRequest, NormalizerResponse, NormalizerBatchResponse
+from prompts.normalizer import NormalizerSystemPrompt, NormalizerBatchSystemPrompt
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +23,19 @@ class NormalizerService:
             
         self.model = os.environ.get("NORMALIZER_MODEL", "openai/gpt-4o-mini")
         self.system_prompt = NormalizerSystemPrompt()
+        self.batch_system_prompt = NormalizerBatchSystemPrompt()
+
+    @staticmethod
+    def _format_request(request: NormalizerRequest) -> str:
+        """Format one item as the user message body."""
+        user_content = f"Title: {request.title}\n"
+        if request.description:
+            user_content += f"Description: {request.description}\n"
+        if request.raw_content:
+            # Truncate raw content to avoid token limits, just in case
+            user_content += f"Raw Content: {request.raw_content[:2000]}\n"
+        user_content += f"URL: {request.source_url}"
+        return user_content
 
     def normalize(self, request: NormalizerRequest) -> Optional[NormalizerResponse]:
         """
@@ -34,13 +47,7 @@ class NormalizerService:
 
         try:
             # Construct user message
-            user_content = f"Title: {request.title}\n"
-            if request.description:
-                user_content += f"Description: {request.description}\n"
-            if request.raw_content:
-                # Truncate raw content to avoid token limits, just in case
-                user_content += f"Raw Content: {request.raw_content[:2000]}\n"
-            user_content += f"URL: {request.source_url}"
+            user_content = self._format_request(request)
 
             response = self.client.chat.completions.create(
                 model=self.model,
@@ -72,3 +79,37 @@ class NormalizerService:
         except Exception as e:
             logger.error(f"Error calling normalizer LLM: {e}")
             return None
+
+    def normalize_batch(self, requests: List[NormalizerRequest]) -> List[Optional[NormalizerResponse]]:
+        """
+        Normalize several items (e.g. every photo of an album) with one LLM call.
+        Falls back to one call per item if the batched response is unusable.
+        Returns one entry per request, None where normalization failed.
+        """
+        if len(requests) <= 1 or not self.client:
+            return [self.normalize(request) for request in requests]
+
+        try:
+            user_content = "\n\n".join(
+                f"Item {i}:\n{self._format_request(request)}" for i, request in enumerate(requests, 1)
+            )
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": self.batch_system_prompt.compile()},
+                    {"role": "user", "content": user_content}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.1
+            )
+
+            content = response.choices[0].message.content
+            batch = NormalizerBatchResponse(**json.loads(content or "{}"))
+            if len(batch.items) == len(requests):
+                return list(batch.items)
+            logger.warning(f"Normalizer returned {len(batch.items)} items for {len(requests)} inputs")
+        except Exception as e:
+            logger.warning(f"Batched normalization failed: {e}")
+
+        logger.info(f"Normalizing {len(requests)} items individually")
+        return [self.normalize(request) for request in requests]
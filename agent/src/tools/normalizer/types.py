@@ -12,3 +12,6 @@ class NormalizerResponse(BaseModel):
     category: CategoryEnum = Field(..., description="The primary category of the content")
     price_range: Optional[PriceRangeEnum] = Field(None, description="The price range of the content, if applicable")
     tags: List[str] = Field(..., description="A list of 3-7 semantic tags describing the content", min_items=1, max_items=10)
+
+class NormalizerBatchResponse(BaseModel):
+    items: List[NormalizerResponse] = Field(..., description="One normalized entry per input item, in input order")
@@ -0,0 +1,109 @@
+"""
+Caption helpers for the yt-dlp extractor.
+
+Selects a subtitle track from a yt-dlp info dict (manual captions first,
+then automatic captions) and flattens WebVTT/SRT payloads into plain text
+that can be passed to the summarizer as a transcript.
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Caption formats we know how to flatten, in order of preference
+SUPPORTED_CAPTION_EXTS = ('vtt', 'srt')
+
+_TIMING_LINE = re.compile(r'-->')
+_CUE_INDEX = re.compile(r'^\d+$')
+_INLINE_TAG = re.compile(r'<[^>]+>')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _language_matches(track_lang: str, wanted: str) -> bool:
+    """Match 'en' against 'en', 'en-US', 'en-orig', etc."""
+    track_lang = track_lang.lower()
+    wanted = wanted.lower()
+    return track_lang == wanted or track_lang.startswith(f"{wanted}-")
+
+
+def _pick_format(tracks: List[dict]) -> Optional[dict]:
+    """Pick the first supported caption format from a list of track formats."""
+    for ext in SUPPORTED_CAPTION_EXTS:
+        for track in tracks:
+            if track.get('ext') == ext and track.get('url'):
+                return track
+    return None
+
+
+def select_caption_track(info: dict, languages: Sequence[str]) -> Optional[Tuple[str, dict, bool]]:
+    """
+    Select the best caption track from a yt-dlp info dict.
+
+    Manual subtitles are preferred over automatic captions. Within each group,
+    languages are tried in the order given.
+
+    Args:
+        info: yt-dlp info dict (from extract_info(download=False))
+        languages: Preferred language codes (e.g. ['en'])
+
+    Returns:
+        Tuple of (language, track format dict, is_automatic) or None if no
+        supported track is available.
+    """
+    groups: List[Tuple[Dict[str, List[dict]], bool]] = [
+        (info.get('subtitles') or {}, False),
+        (info.get('automatic_captions') or {}, True),
+    ]
+
+    for captions, is_automatic in groups:
+        for wanted in languages:
+            # Prefer an exact match, then regional/original variants
+            candidates = sorted(
+                (lang for lang in captions if _language_matches(lang, wanted)),
+                key=lambda lang: (lang.lower() != wanted.lower(), not lang.lower().endswith('-orig'), lang),
+            )
+            for lang in candidates:
+                track = _pick_format(captions[lang])
+                if track:
+                    return lang, track, is_automatic
+
+    return None
+
+
+def parse_caption_text(raw: str) -> str:
+    """
+    Flatten a WebVTT or SRT payload into plain transcript text.
+
+    Drops headers, cue numbers, timing lines and inline tags, and removes the
+    rolling duplicate lines that YouTube automatic captions produce.
+
+    Args:
+        raw: Caption file contents
+
+    Returns:
+        Plain text transcript (may be empty)
+    """
+    lines = []
+    in_header_block = False
+
+    for line in raw.splitlines():
+        line = line.strip()
+
+        if not line:
+            in_header_block = False
+            continue
+        if line.startswith('WEBVTT') or line.startswith('NOTE') or line.startswith('STYLE'):
+            in_header_block = True
+            continue
+        if in_header_block or _TIMING_LINE.search(line) or _CUE_INDEX.match(line):
+            continue
+
+        text = _WHITESPACE.sub(' ', _INLINE_TAG.sub('', line)).strip()
+        if not text:
+            continue
+
+        # Auto captions repeat the previous line as the next cue scrolls in
+        if lines and lines[-1] == text:
+            continue
+        lines.append(text)
+
+    return ' '.join(lines)
@@ -3,13 +3,26 @@ OpenGraph extractor for generic URLs.
 
 Extracts basic metadata from web pages using OpenGraph tags.
 Falls back to standard HTML meta tags if OpenGraph is not available.
+Pages go through the shared HTTP cache (tools.web.http_cache); when a page
+is fresh or unchanged, the previous result is reused without parsing.
+Only the page's <head> is downloaded and parsed (tools.web.head); non-HTML
+responses are rejected (tools.web.fetcher).
 """
 
 import logging
 from typing import Optional
 import requests
-from bs4 import BeautifulSoup
 
+from ...web import (
+    HEAD_END,
+    HttpCache,
+    PageFetcher,
+    WebFetchError,
+    fetch_with_cache,
+    get_http_cache,
+    get_page_fetcher,
+    parse_head,
+)
 from ..types import (
     ScraperResponse,
     ContentType,
@@ -23,19 +36,37 @@ logger = logging.getLogger(__name__)
 class OpenGraphExtractor:
     """Extracts metadata using OpenGraph tags."""
     
-    def __init__(self, timeout: int = 10, user_agent: str = None):
+    # Key for results attached to cached pages
+    CACHE_KEY = 'opengraph'
+    
+    def __init__(
+        self,
+        timeout: int = 10,
+        user_agent: str = None,
+        cache: Optional[HttpCache] = None,
+        page_fetcher: Optional[PageFetcher] = None,
+    ):
         """
         Initialize OpenGraph extractor.
         
         Args:
             timeout: Request timeout in seconds
             user_agent: Optional custom user agent string
+            cache: HTTP cache (default: the shared one)
+            page_fetcher: Streaming fetcher (default: the shared one)
         """
         self.timeout = timeout
+        self.cache = cache or get_http_cache()
+        self.page_fetcher = page_fetcher or get_page_fetcher()
         self.headers = {
             'User-Agent': user_agent or 'Mozilla/5.0 (compatible; VaultBot/1.0; +https://vaultbot.app)'
         }
     
+    def _get(self, url: str, extra_headers: dict):
+        return self.page_fetcher.get(
+            url, headers={**self.headers, **extra_headers}, timeout=self.timeout, until=HEAD_END
+        )
+    
     def extract(self, url: str) -> ScraperResponse:
         """
         Extract metadata from a generic URL using OpenGraph tags.
@@ -50,19 +81,23 @@ class OpenGraphExtractor:
             ScraperError: If extraction fails
         """
         try:
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
-            response.raise_for_status()
+            page = fetch_with_cache(
+                self.cache, url, lambda extra_headers: self._get(url, extra_headers), partial_ok=True
+            )
+            if page.unchanged:
+                cached = self.cache.recall(url, self.CACHE_KEY)
+                if cached:
+                    return ScraperResponse.model_validate({**cached, 'raw_url': url})
             
-            # Use lxml parser for better performance
-            soup = BeautifulSoup(response.content, 'lxml')
+            head = parse_head(page.html)
             
             # Try OpenGraph tags first
-            title = self._get_og_tag(soup, 'og:title') or self._get_title_tag(soup)
-            description = self._get_og_tag(soup, 'og:description') or self._get_meta_description(soup)
-            image = self._get_og_tag(soup, 'og:image')
-            site_name = self._get_og_tag(soup, 'og:site_name')
+            title = head.meta.get('og:title') or head.title
+            description = head.meta.get('og:description') or head.meta.get('description')
+            image = head.meta.get('og:image')
+            site_name = head.meta.get('og:site_name')
             
-            return ScraperResponse(
+            result = ScraperResponse(
                 title=title,
                 description=description,
                 author=site_name,  # Use site name as author
@@ -72,25 +107,15 @@ class OpenGraphExtractor:
                 thumbnail_url=image,
                 raw_url=url,
             )
+            self.cache.remember(url, self.CACHE_KEY, result.model_dump())
+            return result
             
         except requests.RequestException as e:
             logger.error(f"Failed to fetch {url}: {e}")
             raise ScraperError(f"Failed to fetch URL: {e}")
+        except WebFetchError as e:
+            logger.warning(f"Skipping {url}: {e}")
+            raise ScraperError(str(e))
         except Exception as e:
             logger.error(f"Unexpected error extracting {url}: {e}")
             raise ScraperError(f"Unexpected error: {e}")
-    
-    def _get_og_tag(self, soup: BeautifulSoup, property_name: str) -> Optional[str]:
-        """Extract OpenGraph tag value."""
-        tag = soup.find('meta', property=property_name)
-        return tag.get('content') if tag else None
-    
-    def _get_title_tag(self, soup: BeautifulSoup) -> Optional[str]:
-        """Fallback to <title> tag."""
-        title_tag = soup.find('title')
-        return title_tag.string if title_tag else None
-    
-    def _get_meta_description(self, soup: BeautifulSoup) -> Optional[str]:
-        """Fallback to <meta name="description"> tag."""
-        meta_tag = soup.find('meta', attrs={'name': 'description'})
-        return meta_tag.get('content') if meta_tag else None
@@ -46,9 +46,20 @@ class ScraperService:
         ytdlp_timeout = int(os.getenv('YTDLP_TIMEOUT', '30'))
         opengraph_timeout = int(os.getenv('OPENGRAPH_TIMEOUT', '10'))
         
+        # Caption transcripts for social videos (cheaper than frame analysis)
+        self.fetch_captions = os.getenv('YTDLP_FETCH_CAPTIONS', 'true').lower() == 'true'
+        caption_languages = [
+            lang.strip() for lang in os.getenv('YTDLP_CAPTION_LANGS', 'en').split(',') if lang.strip()
+        ]
+        
         # Initialize extractors
         proxy_url = self.proxy_manager.get_proxy_url()
-        self.ytdlp_extractor = YtDlpExtractor(proxy_url=proxy_url, timeout=ytdlp_timeout)
+        self.ytdlp_extractor = YtDlpExtractor(
+            proxy_url=proxy_url,
+            timeout=ytdlp_timeout,
+            fetch_captions=self.fetch_captions,
+            caption_languages=caption_languages,
+        )
         self.youtube_api_extractor = YouTubeAPIExtractor()  # Uses YOUTUBE_API_KEY env var
         self.opengraph_extractor = OpenGraphExtractor(timeout=opengraph_timeout)
         self.passthrough_handler = PassthroughHandler()
@@ -100,6 +111,12 @@ class ScraperService:
                 try:
                     logger.info("Using YouTube Data API (primary)")
                     response = self.youtube_api_extractor.extract(request.url)
+                    # Data API does not expose captions to API keys; use yt-dlp for those only.
+                    # Keep its info dict so a later download doesn't extract it again.
+                    if self.fetch_captions:
+                        response.transcript, response.extractor_info = self.ytdlp_extractor.fetch_transcript(
+                            request.url, platform
+                        )
                 except ScraperError as e:
                     logger.warning(f"YouTube API failed, falling back to yt-dlp: {e}")
                     response = self.ytdlp_extractor.extract(request.url, platform)
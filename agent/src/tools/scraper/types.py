@@ -67,8 +67,15 @@ class ScraperResponse(BaseModel):
     # Full text content (for articles/blogs - Story 2.5)
     full_text: Optional[str] = Field(None, description="Full article text (if applicable)")
     
+    # Caption transcript (manual or automatic subtitles, no media download)
+    transcript: Optional[str] = Field(None, description="Video transcript built from platform captions")
+    
     # Visual extraction
     visual_summary: Optional[str] = Field(None, description="Detailed visual content summary extracted from video frames")
+    
+    # Resolved yt-dlp info dict, kept in-process so the video download can reuse it
+    # instead of re-extracting (never serialized)
+    extractor_info: Optional[dict] = Field(None, exclude=True, repr=False, description="Raw yt-dlp info dict")
 
     class Config:
         json_schema_extra = {
@@ -1,11 +1,11 @@
 import os
 import json
 import logging
-from typing import Optional
+from typing import List, Optional
 from openai import OpenAI
 
-from .types import SummarizerRequest, SummarizerResponse
-from prompts.summarizer import SummarizerSystemPrompt, SummarizerUserPrompt
+from .types import SummarizerRequest, SummarizerResponse, SummarizerBatchResponse
+from prompts.summarizer import SummarizerSystemPrompt, SummarizerBatchSystemPrompt, SummarizerUserPrompt
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +25,7 @@ class SummarizerService:
         self.model = os.environ.get("SUMMARIZER_MODEL", "openai/gpt-4o-mini")
         self.system_prompt = SummarizerSystemPrompt()
         self.user_prompt_template = SummarizerUserPrompt()
+        self.batch_system_prompt = SummarizerBatchSystemPrompt()
 
     def generate_summary(self, request: SummarizerRequest) -> Optional[str]:
         """
@@ -81,3 +82,58 @@ class SummarizerService:
         except Exception as e:
             logger.error(f"Error calling summarizer LLM: {e}")
             return None
+
+    def generate_summaries(self, requests: List[SummarizerRequest]) -> List[Optional[str]]:
+        """
+        Summarize several items (e.g. every photo of an album) with one LLM call.
+        Falls back to one call per item if the batched response is unusable.
+        Returns one entry per request, None where summarization failed or was skipped.
+        """
+        if not self.client:
+            return [None] * len(requests)
+
+        # Items with nothing to summarize are skipped, as in generate_summary
+        indexed = [
+            (i, request) for i, request in enumerate(requests)
+            if any([request.title, request.description, request.vision_analysis, request.transcript])
+        ]
+        summaries: List[Optional[str]] = [None] * len(requests)
+        if len(indexed) <= 1:
+            for i, request in indexed:
+                summaries[i] = self.generate_summary(request)
+            return summaries
+
+        try:
+            user_content = "\n\n".join(
+                f"Item {n}:\n" + self.user_prompt_template.compile(
+                    title=request.title,
+                    description=request.description,
+                    vision_analysis=request.vision_analysis,
+                    transcript=request.transcript
+                )
+                for n, (_, request) in enumerate(indexed, 1)
+            )
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": self.batch_system_prompt.compile()},
+                    {"role": "user", "content": user_content}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.3
+            )
+
+            content = response.choices[0].message.content
+            batch = SummarizerBatchResponse(**json.loads(content or "{}"))
+            if len(batch.items) == len(indexed):
+                for (i, _), item in zip(indexed, batch.items):
+                    summaries[i] = item.summary
+                return summaries
+            logger.warning(f"Summarizer returned {len(batch.items)} items for {len(indexed)} inputs")
+        except Exception as e:
+            logger.warning(f"Batched summarization failed: {e}")
+
+        logger.info(f"Summarizing {len(indexed)} items individually")
+        for i, request in indexed:
+            summaries[i] = self.generate_summary(request)
+        return summaries
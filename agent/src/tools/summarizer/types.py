@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field, field_validator
 import re
 
@@ -19,3 +19,6 @@ class SummarizerResponse(BaseModel):
         if len(sentences) > 2:
             return " ".join(sentences[:2])
         return v
+
+class SummarizerBatchResponse(BaseModel):
+    items: List[SummarizerResponse] = Field(..., description="One summary per input item, in input order.")
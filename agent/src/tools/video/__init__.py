@@ -4,6 +4,9 @@ Handles video download, frame extraction, and analysis.
 """
 
 from .types import (
+    AnalysisMode,
+    DownloadProfile,
+    FramePlan,
     VideoProcessingRequest,
     VideoProcessingResponse,
     VideoProcessingError,
@@ -11,12 +14,22 @@ from .types import (
     VideoExtractionError
 )
 from .service import VideoProcessingService
+from .probe import probe_duration, plan_frames
+from .frame_sources import FrameSource, FileFrameSource, StoryboardFrameSource
 
 __all__ = [
+    "AnalysisMode",
+    "DownloadProfile",
+    "FramePlan",
     "VideoProcessingRequest",
     "VideoProcessingResponse",
     "VideoProcessingError",
     "VideoDownloadError",
     "VideoExtractionError",
-    "VideoProcessingService"
+    "VideoProcessingService",
+    "probe_duration",
+    "plan_frames",
+    "FrameSource",
+    "FileFrameSource",
+    "StoryboardFrameSource"
 ]
@@ -0,0 +1,71 @@
+"""
+Frame collages for single-request video analysis.
+
+Tiles the sampled frames into one labeled grid image (frame number and
+timestamp burned into each cell) so the whole timeline can be described
+by one vision call instead of one call per frame.
+"""
+
+import math
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+# Cell height in the grid; frames are shrunk to this as they stream in
+COLLAGE_CELL_HEIGHT = 240
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds as m:ss."""
+    minutes, secs = divmod(int(round(seconds)), 60)
+    return f"{minutes}:{secs:02d}"
+
+
+def build_collage(
+    frames: List[np.ndarray],
+    timestamps: List[float],
+    columns: Optional[int] = None,
+    cell_height: int = COLLAGE_CELL_HEIGHT,
+) -> np.ndarray:
+    """
+    Tile frames into a labeled grid.
+
+    Args:
+        frames: BGR frames in timeline order
+        timestamps: Timestamp (seconds) of each frame
+        columns: Grid columns (default: ceil(sqrt(len(frames))))
+        cell_height: Height of each cell in pixels; width follows the first
+            frame's aspect ratio
+
+    Returns:
+        BGR collage image
+    """
+    if not frames:
+        raise ValueError("Cannot build a collage without frames")
+
+    columns = columns or math.ceil(math.sqrt(len(frames)))
+    rows = math.ceil(len(frames) / columns)
+    first_h, first_w = frames[0].shape[:2]
+    cell_width = max(1, int(first_w * cell_height / first_h))
+
+    collage = np.zeros((rows * cell_height, columns * cell_width, 3), dtype=np.uint8)
+    font_scale = max(0.4, cell_height / 400)
+    thickness = max(1, int(font_scale * 2))
+
+    for i, (frame, timestamp) in enumerate(zip(frames, timestamps)):
+        row, col = divmod(i, columns)
+        cell = cv2.resize(frame, (cell_width, cell_height), interpolation=cv2.INTER_AREA)
+
+        label = f"#{i + 1} {format_timestamp(timestamp)}"
+        (text_w, text_h), baseline = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+        cv2.rectangle(cell, (0, 0), (text_w + 8, text_h + baseline + 8), (0, 0, 0), -1)
+        cv2.putText(
+            cell, label, (4, text_h + 4),
+            cv2.FONT_HERSHEY_SIMPLEX, font_scale, (255, 255, 255), thickness, cv2.LINE_AA
+        )
+
+        y, x = row * cell_height, col * cell_width
+        collage[y:y + cell_height, x:x + cell_width] = cell
+
+    return collage
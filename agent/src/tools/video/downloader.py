@@ -8,30 +8,74 @@ import tempfile
 from typing import Optional
 import yt_dlp
 
-from .types import VideoDownloadError
+from .types import INFO_PROXY_KEY, VideoDownloadError, DownloadProfile
+from ..media.scratch import ScratchJob
 
 logger = logging.getLogger(__name__)
 
 import requests
 
+MAX_DOWNLOAD_BYTES = 50 * 1024 * 1024  # AC 8 safeguarding: Max 50MB download
+
 class SocialVideoDownloader:
     """Downloads videos from social media platforms to a temporary file using yt-dlp."""
     
-    def __init__(self, proxy_url: Optional[str] = None):
+    def __init__(
+        self,
+        proxy_url: Optional[str] = None,
+        profile: DownloadProfile = DownloadProfile.FULL,
+        target_height: int = 480,
+        max_seconds: Optional[int] = None,
+    ):
         """
         Initialize the video downloader.
         
         Args:
             proxy_url: Optional proxy URL for avoiding rate limits/geo-blocks.
+            profile: FULL (best video + audio) or FRAMES_ONLY (smallest video-only
+                stream at or above target_height, no audio, no merge).
+            target_height: Minimum height in pixels for the FRAMES_ONLY profile.
+            max_seconds: If set, only download the first N seconds (yt-dlp download_ranges).
         """
         self.proxy_url = proxy_url
+        self.profile = DownloadProfile(profile)
+        self.target_height = target_height
+        self.max_seconds = max_seconds
+
+    def _format_opts(self) -> dict:
+        """Build the format-related yt-dlp options for the selected profile."""
+        if self.profile == DownloadProfile.FRAMES_ONLY:
+            h = self.target_height
+            opts = {
+                # Smallest video-only stream >= target height (AV1 avoided for OpenCV decoding),
+                # then the best video-only stream below it, then muxed formats as a last resort
+                'format': f'wv[height>={h}][vcodec!^=av01]/bv[vcodec!^=av01]/wv*[height>={h}]/b',
+            }
+        else:
+            opts = {
+                'format': 'bestvideo[ext=mp4]+bestaudio[m4a]/best[ext=mp4]/best',
+            }
+        
+        if self.max_seconds:
+            opts['download_ranges'] = yt_dlp.utils.download_range_func(None, [(0, self.max_seconds)])
+        
+        return opts
 
-    def download(self, url: str) -> str:
+    def download(self, url: str, info: Optional[dict] = None, scratch: Optional[ScratchJob] = None) -> str:
         """
         Download a video from a given URL to a temporary local file.
         
         Args:
             url: URL of the video to download.
+            info: Optional yt-dlp info dict from a previous metadata extraction
+                (ScraperResponse.extractor_info). When given, the download reuses it
+                via process_ie_result instead of hitting the platform's extractor
+                again; it falls back to a fresh extraction if the cached format
+                URLs are rejected (e.g. expired). A dict extracted through a
+                different proxy than this downloader's is not reused, since its
+                format URLs are bound to the extracting IP.
+            scratch: Optional job scratch space. The file (and any yt-dlp/ffmpeg
+                intermediates) is written there and capped at the job quota.
             
         Returns:
             str: Path to the downloaded temporary video file.
@@ -39,19 +83,24 @@ class SocialVideoDownloader:
         Raises:
             VideoDownloadError: If the download fails.
         """
-        # Create a temporary file to store the video
-        temp_file = tempfile.NamedTemporaryFile(suffix=".mp4", delete=False)
-        temp_path = temp_file.name
-        temp_file.close()  # yt-dlp will write to it
+        max_filesize = MAX_DOWNLOAD_BYTES
+        if scratch:
+            temp_path = scratch.file_path(".mp4")
+            max_filesize = min(max_filesize, scratch.quota_bytes)
+        else:
+            # Create a temporary file to store the video
+            temp_file = tempfile.NamedTemporaryFile(suffix=".mp4", delete=False)
+            temp_path = temp_file.name
+            temp_file.close()  # yt-dlp will write to it
         
         ydl_opts = {
-            'format': 'bestvideo[ext=mp4]+bestaudio[m4a]/best[ext=mp4]/best',
+            **self._format_opts(),
             'outtmpl': temp_path,
             'quiet': True,
             'no_warnings': True,
             # User-agent spoofing to avoid bot detection
             'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'max_filesize': 50 * 1024 * 1024,  # AC 8 safeguarding: Max 50MB download
+            'max_filesize': max_filesize,
         }
         
         if self.proxy_url:
@@ -61,10 +110,17 @@ class SocialVideoDownloader:
         if os.path.exists(cookies_file):
             ydl_opts['cookiefile'] = cookies_file
         
+        if info and (info.get(INFO_PROXY_KEY) or None) != (self.proxy_url or None):
+            logger.info(f"Not reusing yt-dlp info for {url}: it was extracted through a different proxy")
+            info = None
+        
         try:
-            logger.info(f"Downloading video from {url} to {temp_path}")
+            logger.info(f"Downloading video from {url} to {temp_path} (profile={self.profile.value})")
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.extract_info(url, download=True)
+                if info:
+                    self._download_from_info(ydl, info, url)
+                else:
+                    ydl.extract_info(url, download=True)
                 
             if not os.path.exists(temp_path) or os.path.getsize(temp_path) == 0:
                 raise VideoDownloadError(f"Downloaded file is empty or missing: {temp_path}")
@@ -81,6 +137,17 @@ class SocialVideoDownloader:
             logger.error(f"yt-dlp failed to download {url}: {e}")
             raise VideoDownloadError(f"Failed to download video: {str(e)}")
 
+    @staticmethod
+    def _download_from_info(ydl: yt_dlp.YoutubeDL, info: dict, url: str) -> None:
+        """Download from a pre-resolved info dict, re-extracting only if that fails."""
+        try:
+            # Same path as yt-dlp's --load-info-json: format selection re-runs
+            # with this downloader's options against the cached formats list
+            ydl.process_ie_result(ydl.sanitize_info(dict(info), remove_private_keys=True), download=True)
+        except yt_dlp.utils.DownloadError as e:
+            logger.warning(f"Cached yt-dlp info failed for {url}, re-extracting: {e}")
+            ydl.extract_info(url, download=True)
+
 
 class DirectVideoDownloader:
     """Downloads raw video files directly from a URL (e.g. Twilio MediaUrl) to a temporary file."""
@@ -90,6 +157,8 @@ class DirectVideoDownloader:
         video_url: str,
         auth_token: Optional[str] = None,
         account_sid: Optional[str] = None,
+        hasher=None,
+        scratch: Optional[ScratchJob] = None,
     ) -> str:
         """
         Download video from URL to temporary file.
@@ -98,6 +167,10 @@ class DirectVideoDownloader:
             video_url: URL to download video from
             auth_token: Optional authentication token (e.g., for Twilio)
             account_sid: Optional Account SID
+            hasher: Optional hashlib object updated with each chunk as it streams
+                (e.g. hashlib.sha256() for content-hash deduplication)
+            scratch: Optional job scratch space; the download is written there and
+                aborted if it exceeds the job quota
             
         Returns:
             Path to downloaded temporary file
@@ -131,11 +204,23 @@ class DirectVideoDownloader:
             else:
                 suffix = '.mp4'
             
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-            temp_path = temp_file.name
+            if scratch:
+                temp_path = scratch.file_path(suffix)
+                temp_file = open(temp_path, 'wb')
+                max_bytes = scratch.quota_bytes
+            else:
+                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+                temp_path = temp_file.name
+                max_bytes = None
             
+            written = 0
             for chunk in response.iter_content(chunk_size=8192):
+                written += len(chunk)
+                if max_bytes is not None and written > max_bytes:
+                    raise VideoDownloadError(f"Video exceeds scratch quota of {max_bytes} bytes")
                 temp_file.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
             
             temp_file.close()
             return temp_path
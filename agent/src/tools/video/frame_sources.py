@@ -0,0 +1,223 @@
+"""
+Frame sources for video analysis.
+
+VideoProcessingService only needs a handful of frames and a duration; where
+they come from is a FrameSource:
+
+- FileFrameSource: decodes frames from a downloaded video file (OpenCV).
+- StoryboardFrameSource: slices tiles out of YouTube storyboard sprite
+  sheets (yt-dlp's `sb*` formats). A few hundred KB of JPEG sprites cover
+  the whole timeline, so no video download is needed.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+import requests
+
+from .processor import VideoFrameExtractor, decode_frame
+from .probe import probe_duration
+from .types import VideoExtractionError
+from ..media.cpu_pool import CpuPool
+
+logger = logging.getLogger(__name__)
+
+
+class FrameSource(ABC):
+    """Provides sampled frames (BGR arrays) and a duration for one video."""
+
+    @abstractmethod
+    def probe_duration(self) -> Optional[float]:
+        """Return the video duration in seconds without extracting frames, if known."""
+
+    @abstractmethod
+    def iter_frames(
+        self,
+        num_frames: int,
+        max_height: Optional[int] = None,
+    ) -> Iterator[Tuple[float, np.ndarray]]:
+        """
+        Stream equidistant frames one at a time, in timeline order.
+
+        Yields:
+            Tuple of (timestamp in seconds, downscaled BGR frame)
+
+        Raises:
+            VideoExtractionError: If no frames can be produced
+        """
+
+    def extract_frames(
+        self,
+        num_frames: int,
+        max_height: Optional[int] = None,
+    ) -> Tuple[List[np.ndarray], float]:
+        """
+        Extract equidistant frames into a list.
+
+        Returns:
+            Tuple of (list of BGR frame arrays, duration in seconds)
+        """
+        frames = [frame for _, frame in self.iter_frames(num_frames, max_height)]
+        return frames, self.probe_duration() or 0.0
+
+
+class FileFrameSource(FrameSource):
+    """Frames decoded from a local video file."""
+
+    def __init__(
+        self,
+        video_path: str,
+        extractor: Optional[VideoFrameExtractor] = None,
+        cpu_pool: Optional[CpuPool] = None,
+    ):
+        """
+        Args:
+            video_path: Local video file
+            extractor: Frame extractor (default: VideoFrameExtractor())
+            cpu_pool: If given, each frame is decoded in this process pool and
+                comes back as a downscaled JPEG
+        """
+        self.video_path = video_path
+        self.extractor = extractor or VideoFrameExtractor()
+        self.cpu_pool = cpu_pool
+
+    def probe_duration(self) -> Optional[float]:
+        return probe_duration(self.video_path)
+
+    def iter_frames(self, num_frames: int, max_height: Optional[int] = None) -> Iterator[Tuple[float, np.ndarray]]:
+        if self.cpu_pool and self.cpu_pool.enabled:
+            return self._iter_pooled(num_frames, max_height)
+        return self.extractor.iter_frames(self.video_path, num_frames=num_frames, max_height=max_height)
+
+    def _iter_pooled(self, num_frames: int, max_height: Optional[int]) -> Iterator[Tuple[float, np.ndarray]]:
+        """Decode in the pool one frame per task, so only one frame is in flight at a time."""
+        frame_positions, fps = self.extractor.sample_positions(self.video_path, num_frames)
+        yielded = 0
+        for frame_pos in frame_positions:
+            encoded = self.cpu_pool.run(decode_frame, self.video_path, frame_pos, max_height)
+            if encoded is None:
+                continue
+            frame = cv2.imdecode(np.frombuffer(encoded, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if frame is None:
+                continue
+            yielded += 1
+            yield (frame_pos / fps if fps > 0 else 0.0), frame
+
+        if not yielded:
+            raise VideoExtractionError("Failed to extract any frames from video")
+
+    def extract_frames(self, num_frames: int, max_height: Optional[int] = None) -> Tuple[List[np.ndarray], float]:
+        return self.extractor.extract_frames(self.video_path, num_frames=num_frames, max_height=max_height)
+
+
+class StoryboardFrameSource(FrameSource):
+    """Frames sliced from storyboard sprite sheets listed in a yt-dlp info dict."""
+
+    def __init__(self, storyboard: dict, duration: float, timeout: int = 10):
+        """
+        Args:
+            storyboard: A yt-dlp storyboard format (rows, columns, width, height,
+                fps, fragments[{url, duration}])
+            duration: Video duration in seconds
+            timeout: HTTP timeout for each sprite sheet request
+        """
+        self.storyboard = storyboard
+        self.duration = duration
+        self.timeout = timeout
+        self.rows = int(storyboard['rows'])
+        self.columns = int(storyboard['columns'])
+        self.tile_width = storyboard.get('width')
+        self.tile_height = storyboard.get('height')
+        self.fragments = storyboard['fragments']
+        self.tiles_per_sheet = self.rows * self.columns
+        fps = storyboard.get('fps')
+        # fps is tiles per second; derive it from the fragment layout if missing
+        self.tile_rate = fps if fps else (self.tiles_per_sheet * len(self.fragments)) / duration
+
+    @classmethod
+    def from_info(cls, info: Optional[dict], timeout: int = 10) -> Optional['StoryboardFrameSource']:
+        """
+        Build a source from a yt-dlp info dict, or None if it has no usable storyboard.
+
+        Picks the storyboard with the largest tiles; only the sheets containing
+        sampled tiles are ever fetched.
+        """
+        if not info or not info.get('duration'):
+            return None
+
+        candidates = [
+            fmt for fmt in info.get('formats') or []
+            if (fmt.get('format_note') == 'storyboard' or str(fmt.get('format_id', '')).startswith('sb'))
+            and fmt.get('fragments') and fmt.get('rows') and fmt.get('columns')
+        ]
+        if not candidates:
+            return None
+
+        best = max(candidates, key=lambda fmt: (fmt.get('width') or 0) * (fmt.get('height') or 0))
+        return cls(best, float(info['duration']), timeout=timeout)
+
+    def probe_duration(self) -> Optional[float]:
+        return self.duration
+
+    def _tile_index(self, timestamp: float) -> int:
+        """Map a timestamp to a global tile index."""
+        total_tiles = max(1, int(round(self.tile_rate * self.duration)))
+        return min(int(timestamp * self.tile_rate), total_tiles - 1)
+
+    def _fetch_sheet(self, index: int) -> np.ndarray:
+        """Download and decode one sprite sheet."""
+        url = self.fragments[index]['url']
+        try:
+            response = requests.get(url, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise VideoExtractionError(f"Failed to fetch storyboard sheet {index}: {e}")
+
+        sheet = cv2.imdecode(np.frombuffer(response.content, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if sheet is None:
+            raise VideoExtractionError(f"Failed to decode storyboard sheet {index}")
+        return sheet
+
+    def _slice_tile(self, sheet: np.ndarray, position: int) -> Optional[np.ndarray]:
+        """Cut tile `position` (row-major) out of a sprite sheet."""
+        tile_h = self.tile_height or sheet.shape[0] // self.rows
+        tile_w = self.tile_width or sheet.shape[1] // self.columns
+        row, col = divmod(position, self.columns)
+        tile = sheet[row * tile_h:(row + 1) * tile_h, col * tile_w:(col + 1) * tile_w]
+        # The last sheet is often only partly filled
+        if tile.size == 0 or tile.shape[0] < tile_h or tile.shape[1] < tile_w:
+            return None
+        return tile.copy()
+
+    def iter_frames(self, num_frames: int, max_height: Optional[int] = None) -> Iterator[Tuple[float, np.ndarray]]:
+        if num_frames == 1:
+            timestamps = [self.duration / 2]
+        else:
+            timestamps = [i * self.duration / (num_frames - 1) for i in range(num_frames)]
+
+        # Timestamps are ascending, so only the current sprite sheet is kept decoded
+        current_index: Optional[int] = None
+        sheet: Optional[np.ndarray] = None
+        sheets_fetched = 0
+        yielded = 0
+        for timestamp in timestamps:
+            sheet_index, position = divmod(self._tile_index(timestamp), self.tiles_per_sheet)
+            sheet_index = min(sheet_index, len(self.fragments) - 1)
+            if sheet_index != current_index:
+                sheet = None
+                sheet = self._fetch_sheet(sheet_index)
+                current_index = sheet_index
+                sheets_fetched += 1
+
+            tile = self._slice_tile(sheet, position)
+            if tile is not None:
+                yielded += 1
+                yield timestamp, VideoFrameExtractor.downscale(tile, max_height)
+
+        if not yielded:
+            raise VideoExtractionError("Storyboard produced no frames")
+
+        logger.info(f"Sliced {yielded} storyboard frames from {sheets_fetched} sprite sheets")
@@ -0,0 +1,94 @@
+"""
+Cheap duration probe and duration-adaptive frame budgets.
+
+A 3-second clip doesn't need five vision calls, and a 2-minute tutorial
+benefits from more than five. The duration comes either from metadata the
+scraper already has (yt-dlp / YouTube API) or from the container header,
+which OpenCV reads without decoding any frames.
+"""
+
+import os
+import logging
+from typing import Optional
+
+import cv2
+
+from .processor import MAX_DURATION_SEC
+from .types import FramePlan
+
+logger = logging.getLogger(__name__)
+
+# Used when the duration can't be determined (matches the old fixed budget)
+DEFAULT_NUM_FRAMES = 5
+
+
+def probe_duration(video_path: str) -> Optional[float]:
+    """
+    Read a video's duration from its container metadata.
+
+    Args:
+        video_path: Path to a local video file
+
+    Returns:
+        Duration in seconds, or None if it can't be determined
+    """
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            return None
+        total_frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if fps <= 0 or total_frames <= 0:
+            return None
+        return total_frames / fps
+    except cv2.error as e:
+        logger.warning(f"Failed to probe duration of {video_path}: {e}")
+        return None
+    finally:
+        cap.release()
+
+
+def plan_frames(
+    duration: Optional[float],
+    min_frames: Optional[int] = None,
+    max_frames: Optional[int] = None,
+    seconds_per_frame: Optional[float] = None,
+    max_height: Optional[int] = None,
+) -> FramePlan:
+    """
+    Choose how many frames to analyze (and at what size) for a video.
+
+    One frame, plus one more per `seconds_per_frame` of analyzed video,
+    clamped to [min_frames, max_frames]. With the defaults a 3s clip gets 1
+    frame, a 60s video 5 and a 2-minute video 8. Only the first
+    MAX_DURATION_SEC seconds are ever sampled.
+
+    Args:
+        duration: Video duration in seconds (None if unknown)
+        min_frames: Lower bound (default: VIDEO_FRAMES_MIN env var, 1)
+        max_frames: Upper bound (default: VIDEO_FRAMES_MAX env var, 8)
+        seconds_per_frame: Coverage step (default: VIDEO_SECONDS_PER_FRAME env var, 15)
+        max_height: Frame/download height cap (default: VIDEO_TARGET_HEIGHT env var, 480)
+
+    Returns:
+        FramePlan with the frame count and resolution policy
+    """
+    if min_frames is None:
+        min_frames = int(os.getenv('VIDEO_FRAMES_MIN', '1'))
+    if max_frames is None:
+        max_frames = int(os.getenv('VIDEO_FRAMES_MAX', '8'))
+    if seconds_per_frame is None:
+        seconds_per_frame = float(os.getenv('VIDEO_SECONDS_PER_FRAME', '15'))
+    if max_height is None:
+        max_height = int(os.getenv('VIDEO_TARGET_HEIGHT', '480'))
+    min_frames = max(1, min_frames)
+    max_frames = max(min_frames, max_frames)
+
+    if duration is None or duration <= 0:
+        num_frames = DEFAULT_NUM_FRAMES
+    else:
+        analyzed = min(duration, MAX_DURATION_SEC)
+        num_frames = 1 + int(analyzed // seconds_per_frame)
+
+    num_frames = max(min_frames, min(max_frames, num_frames))
+    return FramePlan(num_frames=num_frames, max_height=max_height or None, duration=duration)
@@ -5,10 +5,29 @@ Video frame extraction using OpenCV.
 import cv2
 import tempfile
 import os
-from typing import List, Tuple
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
 import numpy as np
 from .types import VideoExtractionError
 
+# AC 8: Process only the first 2 minutes (120 seconds) if long
+MAX_DURATION_SEC = 120.0
+# Quality of frames sent back from the CPU pool (re-encoded again for the Vision API)
+FRAME_JPEG_QUALITY = 95
+
+
+@contextmanager
+def _extraction_errors():
+    """Map OpenCV and unexpected errors to VideoExtractionError."""
+    try:
+        yield
+    except VideoExtractionError:
+        raise
+    except cv2.error as e:
+        raise VideoExtractionError(f"OpenCV error during frame extraction: {str(e)}")
+    except Exception as e:
+        raise VideoExtractionError(f"Unexpected error during frame extraction: {str(e)}")
+
 
 class VideoFrameExtractor:
     """
@@ -24,12 +43,98 @@ class VideoFrameExtractor:
         """
         self.num_frames = num_frames
 
-    def extract_frames(self, video_path: str) -> Tuple[List[np.ndarray], float]:
+    def _open(self, video_path: str, num_frames: Optional[int]) -> Tuple[cv2.VideoCapture, List[int], float, float]:
+        """
+        Open a video and choose equidistant frame positions to sample.
+        
+        Returns:
+            Tuple of (capture, frame positions, fps, duration in seconds)
+        """
+        # Open video file
+        cap = cv2.VideoCapture(video_path)
+        
+        if not cap.isOpened():
+            raise VideoExtractionError(f"Failed to open video file: {video_path}")
+        
+        # Get video properties
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        duration = total_frames / fps if fps > 0 else 0
+        
+        if duration > MAX_DURATION_SEC:
+            total_frames = int(MAX_DURATION_SEC * fps)
+            duration = MAX_DURATION_SEC
+            
+        if total_frames == 0:
+            cap.release()
+            raise VideoExtractionError("Video has no frames")
+        
+        # Calculate frame positions to extract
+        # Extract frames at: start, 25%, 50%, 75%, end
+        # Adjust num_frames based on video length
+        actual_num_frames = min(num_frames or self.num_frames, total_frames)
+        
+        if actual_num_frames == 1:
+            frame_positions = [0]
+        else:
+            # Equidistant positions
+            frame_positions = [
+                int(i * (total_frames - 1) / (actual_num_frames - 1))
+                for i in range(actual_num_frames)
+            ]
+        
+        return cap, frame_positions, fps, duration
+
+    def sample_positions(self, video_path: str, num_frames: Optional[int] = None) -> Tuple[List[int], float]:
+        """
+        Frame indices iter_frames would sample, without decoding any frame.
+        
+        Returns:
+            Tuple of (frame positions, fps)
+            
+        Raises:
+            VideoExtractionError: If the video can't be opened
+        """
+        with _extraction_errors():
+            cap, frame_positions, fps, _ = self._open(video_path, num_frames)
+            cap.release()
+            return frame_positions, fps
+
+    def _read_frames(
+        self,
+        cap: cv2.VideoCapture,
+        frame_positions: List[int],
+        fps: float,
+        max_height: Optional[int],
+    ) -> Iterator[Tuple[float, np.ndarray]]:
+        """Seek to each position and yield (timestamp, downscaled frame)."""
+        for frame_pos in frame_positions:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_pos)
+            ret, frame = cap.read()
+            
+            if not ret:
+                # If we can't read a specific frame, try to continue
+                continue
+            
+            # Rebind so the full-resolution decode is freed while the consumer holds the copy
+            frame = self.downscale(frame, max_height)
+            yield (frame_pos / fps if fps > 0 else 0.0), frame
+
+    def extract_frames(
+        self,
+        video_path: str,
+        num_frames: Optional[int] = None,
+        max_height: Optional[int] = None,
+    ) -> Tuple[List[np.ndarray], float]:
         """
         Extract equidistant keyframes from a video file.
         
+        Holds every frame in memory; prefer iter_frames for analysis.
+        
         Args:
             video_path: Path to the video file
+            num_frames: Override the extractor's frame count for this video
+            max_height: Downscale frames taller than this (keeps aspect ratio)
             
         Returns:
             Tuple of (list of frame arrays, video duration in seconds)
@@ -37,67 +142,57 @@ class VideoFrameExtractor:
         Raises:
             VideoExtractionError: If frame extraction fails
         """
-        try:
-            # Open video file
-            cap = cv2.VideoCapture(video_path)
-            
-            if not cap.isOpened():
-                raise VideoExtractionError(f"Failed to open video file: {video_path}")
-            
-            # Get video properties
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            duration = total_frames / fps if fps > 0 else 0
-            
-            # AC 8: Process only the first 2 minutes (120 seconds) if long
-            MAX_DURATION_SEC = 120.0
-            if duration > MAX_DURATION_SEC:
-                total_frames = int(MAX_DURATION_SEC * fps)
-                duration = MAX_DURATION_SEC
-                
-            if total_frames == 0:
-                raise VideoExtractionError("Video has no frames")
-            
-            # Calculate frame positions to extract
-            # Extract frames at: start, 25%, 50%, 75%, end
-            # Adjust num_frames based on video length
-            actual_num_frames = min(self.num_frames, total_frames)
-            
-            if actual_num_frames == 1:
-                frame_positions = [0]
-            else:
-                # Equidistant positions
-                frame_positions = [
-                    int(i * (total_frames - 1) / (actual_num_frames - 1))
-                    for i in range(actual_num_frames)
-                ]
-            
-            # Extract frames
-            frames = []
-            for frame_pos in frame_positions:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_pos)
-                ret, frame = cap.read()
-                
-                if ret:
-                    frames.append(frame)
-                else:
-                    # If we can't read a specific frame, try to continue
-                    # but log the issue
-                    continue
-            
-            cap.release()
+        with _extraction_errors():
+            cap, frame_positions, fps, duration = self._open(video_path, num_frames)
+            try:
+                frames = [frame for _, frame in self._read_frames(cap, frame_positions, fps, max_height)]
+            finally:
+                cap.release()
             
             if not frames:
                 raise VideoExtractionError("Failed to extract any frames from video")
             
             return frames, duration
+
+    def iter_frames(
+        self,
+        video_path: str,
+        num_frames: Optional[int] = None,
+        max_height: Optional[int] = None,
+    ) -> Iterator[Tuple[float, np.ndarray]]:
+        """
+        Stream equidistant keyframes one at a time.
+        
+        Each full-resolution decode is downscaled and dropped before the next
+        seek, so memory stays at about one frame regardless of frame count.
+        
+        Yields:
+            Tuple of (timestamp in seconds, downscaled BGR frame)
             
-        except cv2.error as e:
-            raise VideoExtractionError(f"OpenCV error during frame extraction: {str(e)}")
-        except Exception as e:
-            if isinstance(e, VideoExtractionError):
-                raise
-            raise VideoExtractionError(f"Unexpected error during frame extraction: {str(e)}")
+        Raises:
+            VideoExtractionError: If the video can't be opened or yields no frames
+        """
+        with _extraction_errors():
+            cap, frame_positions, fps, _ = self._open(video_path, num_frames)
+            try:
+                yielded = 0
+                for item in self._read_frames(cap, frame_positions, fps, max_height):
+                    yielded += 1
+                    yield item
+            finally:
+                cap.release()
+            
+            if not yielded:
+                raise VideoExtractionError("Failed to extract any frames from video")
+
+    @staticmethod
+    def downscale(frame: np.ndarray, max_height: Optional[int]) -> np.ndarray:
+        """Resize a frame to max_height (aspect preserved); smaller frames are returned as-is."""
+        height, width = frame.shape[:2]
+        if not max_height or height <= max_height:
+            return frame
+        new_width = max(1, int(width * max_height / height))
+        return cv2.resize(frame, (new_width, max_height), interpolation=cv2.INTER_AREA)
 
     @staticmethod
     def frame_to_base64(frame: np.ndarray) -> str:
@@ -122,3 +217,29 @@ class VideoFrameExtractor:
         jpg_as_text = base64.b64encode(buffer).decode('utf-8')
         
         return f"data:image/jpeg;base64,{jpg_as_text}"
+
+
+def decode_frame(video_path: str, frame_pos: int, max_height: Optional[int] = None) -> Optional[bytes]:
+    """
+    Decode, downscale and JPEG-encode one frame.
+    
+    Module-level so it can run in the shared CPU pool, one task per frame;
+    only the encoded frame is sent back to the caller's process.
+    
+    Returns:
+        JPEG bytes, or None if the frame can't be read
+    """
+    with _extraction_errors():
+        cap = cv2.VideoCapture(video_path)
+        try:
+            if not cap.isOpened():
+                return None
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_pos)
+            ret, frame = cap.read()
+        finally:
+            cap.release()
+        if not ret:
+            return None
+        frame = VideoFrameExtractor.downscale(frame, max_height)
+        success, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, FRAME_JPEG_QUALITY])
+        return buffer.tobytes() if success else None
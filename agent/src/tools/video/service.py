@@ -2,20 +2,38 @@
 Video processing service that orchestrates download, extraction, and analysis.
 """
 
-import tempfile
 import os
-import os
-from typing import Optional
+import logging
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
 from .types import (
+    AnalysisMode,
+    FramePlan,
     VideoProcessingRequest,
     VideoProcessingResponse,
     VideoDownloadError,
     VideoExtractionError
 )
 from .processor import VideoFrameExtractor
+from .probe import plan_frames, DEFAULT_NUM_FRAMES
+from .frame_sources import FrameSource, FileFrameSource
+from .collage import build_collage, format_timestamp, COLLAGE_CELL_HEIGHT
 from .downloader import DirectVideoDownloader
+from ..media.scratch import get_scratch_space
+from ..media.cpu_pool import CpuPool, get_cpu_pool
 from ..vision.service import VisionService
-from ..vision.types import VisionRequest
+from ..vision.profiles import VisionProfileName, get_profile
+
+logger = logging.getLogger(__name__)
+
+COLLAGE_PROMPT = (
+    "This image is a grid of {count} frames sampled in order from one video. "
+    "Each frame is labeled with its number and timestamp (m:ss). "
+    "Return JSON with 'timeline': a list of {{'timestamp', 'description'}} objects, one per frame in order, "
+    "describing objects, actions, people and setting; and 'summary': one or two sentences describing "
+    "what happens across the whole video. Be concise but informative."
+)
 
 
 class VideoProcessingService:
@@ -23,17 +41,52 @@ class VideoProcessingService:
     Service for processing videos: download, extract frames, analyze with Vision API.
     """
 
-    def __init__(self, num_frames: int = 5):
+    def __init__(
+        self,
+        num_frames: Optional[int] = 5,
+        max_height: Optional[int] = None,
+        analysis_mode: Optional[AnalysisMode] = None,
+        cpu_pool: Optional[CpuPool] = None,
+        vision_profile: Optional[VisionProfileName] = None,
+    ):
         """
         Initialize the video processing service.
         
         Args:
-            num_frames: Number of frames to extract from each video (default: 5)
+            num_frames: Number of frames to extract from each video (default: 5).
+                None picks a frame budget from each video's duration (see plan_frames).
+            max_height: Downscale frames to this height before analysis. In adaptive
+                mode defaults to the plan's height (VIDEO_TARGET_HEIGHT).
+            analysis_mode: FRAMES (one vision call per frame) or COLLAGE (one call
+                for a labeled grid of all frames). Default: VIDEO_ANALYSIS_MODE env var.
+            cpu_pool: Process pool for decoding downloaded videos (default: shared pool)
+            vision_profile: Detail level, token cap and response schema for per-frame
+                requests (default: VIDEO_VISION_PROFILE env var, video_frame).
+                Collages always use the video_collage profile.
         """
-        self.extractor = VideoFrameExtractor(num_frames=num_frames)
+        self.num_frames = num_frames
+        self.max_height = max_height
+        self.analysis_mode = AnalysisMode(analysis_mode or os.getenv('VIDEO_ANALYSIS_MODE', 'frames'))
+        self.cpu_pool = cpu_pool or get_cpu_pool()
+        self.frame_profile = get_profile(vision_profile or os.getenv('VIDEO_VISION_PROFILE', 'video_frame'))
+        self.collage_profile = get_profile(VisionProfileName.VIDEO_COLLAGE)
+        self.extractor = VideoFrameExtractor(num_frames=num_frames or DEFAULT_NUM_FRAMES)
         self.vision_service = VisionService()
 
-
+    def plan(self, source: FrameSource, duration_hint: Optional[float] = None) -> FramePlan:
+        """
+        Choose the frame budget for a video before extracting frames.
+        
+        Fixed mode returns the configured count. Adaptive mode uses the known
+        duration if given, otherwise asks the source (e.g. container header).
+        """
+        if self.num_frames:
+            return FramePlan(num_frames=self.num_frames, max_height=self.max_height, duration=duration_hint)
+        
+        duration = duration_hint or source.probe_duration()
+        plan = plan_frames(duration, max_height=self.max_height)
+        logger.info(f"Frame plan for {duration}s video: {plan.num_frames} frames, max height {plan.max_height}")
+        return plan
 
     def aggregate_descriptions(self, descriptions: list[str]) -> str:
         """
@@ -84,72 +137,140 @@ class VideoProcessingService:
             VideoDownloadError: If download fails
             VideoExtractionError: If frame extraction fails
         """
-        temp_video_path = None
+        if request.video_path:
+            return self._process_file(request.video_path, request.duration_hint)
         
-        try:
-            if request.video_path:
-                video_path_to_process = request.video_path
-            else:
-                # Step 1: Download video using DirectVideoDownloader
-                downloader = DirectVideoDownloader()
-                temp_video_path = downloader.download(
-                    request.video_url,
-                    request.auth_token,
-                    request.account_sid
-                )
-                video_path_to_process = temp_video_path
-            
-            # Step 2: Extract frames
-            frames, duration = self.extractor.extract_frames(video_path_to_process)
-            
-            # Step 3: Analyze each frame with Vision API
-            frame_descriptions = []
+        # Step 1: Download video into managed scratch space (removed on exit)
+        with get_scratch_space().job(request.message_id) as scratch:
+            downloader = DirectVideoDownloader()
+            video_path = downloader.download(
+                request.video_url,
+                request.auth_token,
+                request.account_sid,
+                scratch=scratch
+            )
+            return self._process_file(video_path, request.duration_hint)
+
+    def _process_file(self, video_path_to_process: str, duration_hint: Optional[float] = None) -> VideoProcessingResponse:
+        """Extract, analyze and summarize frames from a local video file."""
+        source = FileFrameSource(video_path_to_process, self.extractor, cpu_pool=self.cpu_pool)
+        return self.process_source(source, duration_hint)
+
+    def process_source(self, source: FrameSource, duration_hint: Optional[float] = None) -> VideoProcessingResponse:
+        """
+        Analyze and summarize frames from any frame source (file, storyboard).
+        
+        Args:
+            source: Where frames come from
+            duration_hint: Duration in seconds if already known
             
-            for i, frame in enumerate(frames):
-                # Convert frame to base64
-                frame_base64 = VideoFrameExtractor.frame_to_base64(frame)
-                
-                # Create vision request
-                vision_request = VisionRequest(
-                    image_input=frame_base64,
-                    prompt="Describe this video frame in detail. Focus on objects, actions, people, and setting. Be concise but informative.",
-                    model_provider="openai"  # Default to GPT-4o
-                )
-                
-                # Analyze frame
-                vision_response = self.vision_service.analyze(vision_request)
-                
-                # Extract description from analysis_data
-                # The structure depends on the prompt configuration
-                # For now, we'll try to get a 'description' field or convert to string
-                analysis_data = vision_response.analysis_data
-                
-                if isinstance(analysis_data, dict) and 'description' in analysis_data:
-                    description = analysis_data['description']
-                elif isinstance(analysis_data, dict) and 'content' in analysis_data:
-                    description = analysis_data['content']
-                else:
-                    # Fallback: convert to string
-                    description = str(analysis_data)
-                
-                frame_descriptions.append(description)
+        Returns:
+            Video processing response with summary
             
-            # Step 4: Aggregate descriptions
-            summary = self.aggregate_descriptions(frame_descriptions)
+        Raises:
+            VideoExtractionError: If the source can't produce frames
+        """
+        # Step 2: Stream frames (budget chosen from the duration first). Frames are
+        # decoded, downscaled and encoded one at a time, so memory per video stays flat
+        plan = self.plan(source, duration_hint)
+        duration = plan.duration or source.probe_duration() or 0.0
+        frames = source.iter_frames(plan.num_frames, max_height=plan.max_height)
+        
+        if self.analysis_mode == AnalysisMode.COLLAGE and plan.num_frames > 1:
+            return self._analyze_collage(frames, duration)
+        
+        # Step 3: Analyze each frame with Vision API
+        frame_descriptions = []
+        
+        for _, frame in frames:
+            # Convert frame to base64; only the encoded copy lives through the request
+            frame_base64 = VideoFrameExtractor.frame_to_base64(frame)
+            del frame
             
-            # Return response
+            frame_descriptions.append(self._describe_frame(frame_base64))
+        
+        # Step 4: Aggregate descriptions
+        summary = self.aggregate_descriptions(frame_descriptions)
+        
+        # Return response
+        return VideoProcessingResponse(
+            summary=summary,
+            frame_count=len(frame_descriptions),
+            duration=duration,
+            frame_descriptions=frame_descriptions
+        )
+
+    def _describe_frame(self, frame_base64: str) -> str:
+        """Describe one encoded frame with the Vision API."""
+        # Create vision request
+        vision_request = self.frame_profile.request(
+            image_input=frame_base64,
+            prompt="Describe this video frame in detail. Focus on objects, actions, people, and setting. Be concise but informative.",
+            model_provider="openai"  # Default to GPT-4o
+        )
+        
+        # Analyze frame
+        vision_response = self.vision_service.analyze(vision_request)
+        
+        # Extract description from analysis_data
+        # The structure depends on the prompt configuration
+        # For now, we'll try to get a 'description' field or convert to string
+        analysis_data = vision_response.analysis_data
+        
+        if isinstance(analysis_data, dict) and 'description' in analysis_data:
+            return analysis_data['description']
+        elif isinstance(analysis_data, dict) and 'content' in analysis_data:
+            return analysis_data['content']
+        # Fallback: convert to string
+        return str(analysis_data)
+
+    def _analyze_collage(self, frames: Iterator[Tuple[float, np.ndarray]], duration: float) -> VideoProcessingResponse:
+        """Describe all frames with a single vision call on a labeled grid."""
+        # Shrink each frame to cell size as it arrives; only the small cells are kept
+        cells, timestamps = [], []
+        for timestamp, frame in frames:
+            cells.append(VideoFrameExtractor.downscale(frame, COLLAGE_CELL_HEIGHT))
+            timestamps.append(timestamp)
+            del frame
+        
+        collage = build_collage(cells, timestamps)
+        frame_count = len(cells)
+        del cells
+        
+        vision_request = self.collage_profile.request(
+            image_input=VideoFrameExtractor.frame_to_base64(collage),
+            prompt=COLLAGE_PROMPT.format(count=frame_count),
+            model_provider="openai"
+        )
+        analysis_data = self.vision_service.analyze(vision_request).analysis_data
+        
+        timeline = analysis_data.get('timeline') if isinstance(analysis_data, dict) else None
+        if not isinstance(timeline, list) or not timeline:
+            # Model ignored the schema: keep whatever it said as a single description
+            frame_descriptions = [str(analysis_data)]
             return VideoProcessingResponse(
-                summary=summary,
-                frame_count=len(frames),
+                summary=self.aggregate_descriptions(frame_descriptions),
+                frame_count=frame_count,
                 duration=duration,
                 frame_descriptions=frame_descriptions
             )
-            
-        finally:
-            # Clean up temporary file
-            if temp_video_path and os.path.exists(temp_video_path):
-                try:
-                    os.unlink(temp_video_path)
-                except Exception:
-                    # Best effort cleanup
-                    pass
+        
+        frame_descriptions = []
+        for i, entry in enumerate(timeline):
+            if isinstance(entry, dict):
+                timestamp = entry.get('timestamp') or format_timestamp(timestamps[min(i, len(timestamps) - 1)])
+                frame_descriptions.append(f"{timestamp}: {entry.get('description', '')}")
+            else:
+                frame_descriptions.append(str(entry))
+        
+        summary_parts = ["Video content summary:"]
+        if analysis_data.get('summary'):
+            summary_parts.append(str(analysis_data['summary']))
+        summary_parts.extend(frame_descriptions)
+        
+        return VideoProcessingResponse(
+            summary=" | ".join(summary_parts),
+            frame_count=frame_count,
+            duration=duration,
+            frame_descriptions=frame_descriptions
+        )
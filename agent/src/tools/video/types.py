@@ -2,10 +2,29 @@
 Data contracts for video processing.
 """
 
+from enum import Enum
 from typing import Optional, List
 from pydantic import BaseModel, Field, model_validator
 
 
+# Key a yt-dlp info dict carries the proxy it was extracted with under. Format URLs
+# are often bound to the extracting IP, so the dict is only reused for a download
+# through the same proxy. yt-dlp drops "__" keys when sanitizing the dict.
+INFO_PROXY_KEY = '__extracted_with_proxy'
+
+
+class DownloadProfile(str, Enum):
+    """yt-dlp download profile for social video downloads."""
+    FULL = "full"  # Best quality video + audio, merged
+    FRAMES_ONLY = "frames_only"  # Smallest video-only stream for frame sampling
+
+
+class AnalysisMode(str, Enum):
+    """How sampled frames are sent to the Vision API."""
+    FRAMES = "frames"  # One request per frame
+    COLLAGE = "collage"  # One request for a labeled grid of all frames
+
+
 class VideoProcessingRequest(BaseModel):
     """
     Request model for video processing.
@@ -15,6 +34,7 @@ class VideoProcessingRequest(BaseModel):
     message_id: str = Field(..., description="WhatsApp message ID for tracking")
     auth_token: Optional[str] = Field(None, description="Authentication token for video download (e.g., Twilio auth)")
     account_sid: Optional[str] = Field(None, description="Twilio Account SID for Basic Auth")
+    duration_hint: Optional[float] = Field(None, description="Duration in seconds if already known (e.g. from yt-dlp), skips the probe")
 
     @model_validator(mode='after')
     def check_url_or_path(self) -> 'VideoProcessingRequest':
@@ -23,6 +43,15 @@ class VideoProcessingRequest(BaseModel):
         return self
 
 
+class FramePlan(BaseModel):
+    """
+    Frame budget chosen from a video's duration before extraction.
+    """
+    num_frames: int = Field(..., ge=1, description="Number of frames to extract and analyze")
+    max_height: Optional[int] = Field(None, description="Downscale frames to at most this height (None = original)")
+    duration: Optional[float] = Field(None, description="Duration the plan was based on, if known")
+
+
 class VideoProcessingResponse(BaseModel):
     """
     Response model for video processing.
@@ -1,5 +1,6 @@
-from .types import VisionRequest, VisionResponse, VisionError, VisionProviderError, VisionRateLimitError
+from .types import VisionRequest, VisionResponse, VisionError, VisionProviderError, VisionRateLimitError, VisionImageFetchError, VisionTruncatedError
 from .service import VisionService
+from .profiles import VisionProfile, VisionProfileName, VISION_PROFILES, get_profile
 
 __all__ = [
     "VisionService", 
@@ -7,5 +8,11 @@ __all__ = [
     "VisionResponse", 
     "VisionError",
     "VisionProviderError",
-    "VisionRateLimitError"
+    "VisionRateLimitError",
+    "VisionImageFetchError",
+    "VisionTruncatedError",
+    "VisionProfile",
+    "VisionProfileName",
+    "VISION_PROFILES",
+    "get_profile",
 ]
@@ -0,0 +1,94 @@
+"""
+Vision profiles: per-use-case image detail, output caps and response schema.
+
+Every request used to go out at the provider's default (high) detail with
+an open-ended JSON response. That is wasteful for most inputs: a video frame
+at low detail costs a fixed ~85 image tokens instead of ~765+, and a one- or
+two-sentence description is all the summarizer uses. Screenshots are the
+exception: small text needs high detail to be read.
+
+Callers pick a profile by name; VisionProfile.request() builds the
+VisionRequest.
+"""
+
+from enum import Enum
+from typing import Dict, Literal, Optional, Union
+
+from pydantic import BaseModel, Field
+
+from .types import VisionRequest
+
+
+class VisionProfileName(str, Enum):
+    """Vision use cases with their own cost/quality trade-off."""
+    DEFAULT = "default"  # Provider defaults (no detail, cap or schema)
+    VIDEO_FRAME = "video_frame"
+    VIDEO_COLLAGE = "video_collage"
+    CAROUSEL_IMAGE = "carousel_image"
+    SCREENSHOT = "screenshot"
+
+
+class VisionProfile(BaseModel):
+    """Detail level, output cap and response schema for one use case."""
+    name: VisionProfileName
+    detail: Optional[Literal["low", "high", "auto"]] = Field(None, description="Image detail level (None = provider default)")
+    max_tokens: Optional[int] = Field(None, description="Cap on response tokens (None = uncapped)")
+    response_schema: Optional[Dict[str, str]] = Field(
+        None, description="Compact JSON response shape: field name -> what to put in it"
+    )
+
+    def request(self, image_input: str, prompt: str, model_provider: str = "openai") -> VisionRequest:
+        """Build a VisionRequest with this profile's settings."""
+        return VisionRequest(
+            image_input=image_input,
+            prompt=prompt,
+            model_provider=model_provider,
+            detail=self.detail,
+            max_tokens=self.max_tokens,
+            response_schema=self.response_schema,
+        )
+
+
+VISION_PROFILES: Dict[VisionProfileName, VisionProfile] = {
+    VisionProfileName.DEFAULT: VisionProfile(name=VisionProfileName.DEFAULT),
+    VisionProfileName.VIDEO_FRAME: VisionProfile(
+        name=VisionProfileName.VIDEO_FRAME,
+        detail="low",
+        max_tokens=150,
+        response_schema={"description": "One or two sentences: objects, actions, people, setting"},
+    ),
+    # The grid's cells are small, so it needs high detail; the schema is in the collage prompt
+    VisionProfileName.VIDEO_COLLAGE: VisionProfile(
+        name=VisionProfileName.VIDEO_COLLAGE,
+        detail="high",
+        max_tokens=800,
+    ),
+    VisionProfileName.CAROUSEL_IMAGE: VisionProfile(
+        name=VisionProfileName.CAROUSEL_IMAGE,
+        detail="low",
+        max_tokens=300,
+        response_schema={
+            "description": "Two or three sentences: subject, setting, notable details",
+            "text": "Prominent visible text, verbatim, or empty",
+        },
+    ),
+    VisionProfileName.SCREENSHOT: VisionProfile(
+        name=VisionProfileName.SCREENSHOT,
+        detail="high",
+        max_tokens=700,
+        response_schema={
+            "description": "One sentence: what the screenshot shows (app, document, conversation...)",
+            "text": "All legible text, verbatim, in reading order",
+        },
+    ),
+}
+
+
+def get_profile(profile: Union[VisionProfileName, str, None]) -> VisionProfile:
+    """
+    Look up a profile by name.
+
+    Raises:
+        ValueError: Unknown profile name
+    """
+    return VISION_PROFILES[VisionProfileName(profile or VisionProfileName.DEFAULT)]
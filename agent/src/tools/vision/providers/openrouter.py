@@ -1,10 +1,23 @@
 import os
 import json
+import logging
 from typing import Dict, Any, Optional
-from openai import OpenAI
-from ..types import VisionRequest, VisionResponse, VisionProviderError
+from openai import OpenAI, APIStatusError
+from ..types import (
+    VisionRequest,
+    VisionResponse,
+    VisionProviderError,
+    VisionImageFetchError,
+    VisionTruncatedError,
+)
 from prompts import PromptFactory, VisionAnalyzePrompt, VisionSystemPrompt
 
+logger = logging.getLogger(__name__)
+
+# A response cut off at max_tokens is retried once with this much larger a cap
+TRUNCATION_RETRY_FACTOR = 2
+
+
 class OpenRouterVisionAdapter:
     """
     Adapter for Vision tasks using OpenRouter API.
@@ -40,9 +53,15 @@ class OpenRouterVisionAdapter:
         
         # Construct User Prompt
         # Use Factory to ensure JSON formatting via VisionAnalyzePrompt
-        user_prompt = PromptFactory.create("vision_analyze", instruction=request.prompt)
+        user_prompt = PromptFactory.create(
+            "vision_analyze", instruction=request.prompt, response_schema=request.response_schema
+        )
         user_prompt_text = user_prompt.compile()
         
+        image_url = {"url": request.image_input}
+        if request.detail:
+            image_url["detail"] = request.detail
+        
         # Prepare messages
         messages = [
             {"role": "system", "content": system_prompt.compile()},
@@ -55,20 +74,22 @@ class OpenRouterVisionAdapter:
                     },
                     {
                         "type": "image_url",
-                        "image_url": {
-                            "url": request.image_input 
-                        }
+                        "image_url": image_url
                     }
                 ]
             }
         ]
 
         try:
-            response = self.client.chat.completions.create(
-                model=model_id,
-                messages=messages,
-                response_format={"type": "json_object"} # Enforce JSON mode
-            )
+            response = self._complete(model_id, messages, request.max_tokens)
+            if self._truncated(response) and request.max_tokens:
+                max_tokens = request.max_tokens * TRUNCATION_RETRY_FACTOR
+                logger.warning(
+                    f"Vision response hit max_tokens={request.max_tokens}, retrying with {max_tokens}"
+                )
+                response = self._complete(model_id, messages, max_tokens)
+            if self._truncated(response):
+                raise VisionTruncatedError("Vision response was cut off at the token cap")
             
             content = response.choices[0].message.content
             if not content:
@@ -86,5 +107,34 @@ class OpenRouterVisionAdapter:
                 raw_response=response.model_dump()
             )
 
+        except VisionTruncatedError:
+            raise
         except Exception as e:
+            if self._is_image_fetch_error(request, e):
+                # Not retryable with the same URL; callers fall back to inline base64
+                raise VisionImageFetchError(f"Provider could not fetch image URL: {str(e)}") from e
             raise VisionProviderError(f"OpenRouter API call failed: {str(e)}") from e
+
+    def _complete(self, model_id: str, messages: list, max_tokens: Optional[int]):
+        completion_args = {}
+        if max_tokens:
+            completion_args["max_tokens"] = max_tokens
+        return self.client.chat.completions.create(
+            model=model_id,
+            messages=messages,
+            response_format={"type": "json_object"}, # Enforce JSON mode
+            **completion_args
+        )
+
+    @staticmethod
+    def _truncated(response) -> bool:
+        """The model stopped because it ran out of tokens (the JSON is incomplete)."""
+        return response.choices[0].finish_reason == "length"
+
+    @staticmethod
+    def _is_image_fetch_error(request: VisionRequest, error: Exception) -> bool:
+        """A 4xx for a request whose image was passed by URL means the provider couldn't download it."""
+        if not request.image_input.startswith(("http://", "https://")):
+            return False
+        status = getattr(error, "status_code", None) if isinstance(error, APIStatusError) else None
+        return status is not None and 400 <= status < 500 and status != 429
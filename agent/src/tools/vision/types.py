@@ -13,6 +13,10 @@ class VisionRequest(BaseModel):
     )
     # Optional prompt configuration override
     prompt_config: Optional[Dict[str, Any]] = Field(None, description="Additional prompt configuration")
+    # Cost controls (see tools.vision.profiles)
+    detail: Optional[Literal["low", "high", "auto"]] = Field(None, description="Image detail level (None = provider default)")
+    max_tokens: Optional[int] = Field(None, description="Cap on response tokens (None = uncapped)")
+    response_schema: Optional[Dict[str, str]] = Field(None, description="Compact JSON response shape for the model")
 
 class VisionResponse(BaseModel):
     """
@@ -35,6 +39,14 @@ class VisionRateLimitError(VisionError):
     """Error raised when rate limit is exceeded."""
     pass
 
+class VisionImageFetchError(VisionError):
+    """Error raised when the provider could not download an image passed by URL."""
+    pass
+
+class VisionTruncatedError(VisionError):
+    """Error raised when the response hit its token cap (not retried: the same cap would truncate again)."""
+    pass
+
 class VisionValidationError(VisionError):
     """Error raised when validation fails."""
     pass
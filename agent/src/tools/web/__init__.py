@@ -0,0 +1,28 @@
+"""
+Shared web page fetching for the article and scraper workers.
+"""
+
+from .http_cache import HttpCache, CacheEntry, canonical_url, fetch_with_cache, get_http_cache
+from .fetcher import PageFetcher, HtmlResponse, detect_charset, get_page_fetcher
+from .head import HEAD_END, head_from_tree, parse_head
+from .types import CacheStatus, FetchedPage, PageHead, WebFetchError, UnsupportedContentError
+
+__all__ = [
+    "HttpCache",
+    "CacheEntry",
+    "canonical_url",
+    "fetch_with_cache",
+    "get_http_cache",
+    "PageFetcher",
+    "HtmlResponse",
+    "detect_charset",
+    "get_page_fetcher",
+    "HEAD_END",
+    "parse_head",
+    "head_from_tree",
+    "CacheStatus",
+    "FetchedPage",
+    "PageHead",
+    "WebFetchError",
+    "UnsupportedContentError",
+]
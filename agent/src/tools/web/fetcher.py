@@ -0,0 +1,272 @@
+"""
+Bounded, streaming HTML fetcher.
+
+Reading response.text on an article URL buffers whatever the server sends
+(a 40 MB page, a PDF behind a "read more" link) and then runs
+charset_normalizer over the whole body to guess its encoding. PageFetcher
+instead:
+
+- streams the body over a pooled keep-alive session and stops at
+  WEB_FETCH_MAX_KB (the page is kept, marked truncated),
+- rejects non-HTML responses from the Content-Type header or the first
+  bytes, before downloading the rest,
+- decodes with the charset from the header, a BOM or the page's <meta>
+  tag, trying strict UTF-8 and then a detector on a small sample only when
+  none is declared,
+- can stop as soon as a pattern appears (e.g. the end of <head>, see
+  tools.web.head), for callers that only need the start of the page,
+- records bytes read and timings per response and in stats().
+
+Responses look enough like requests.Response (status_code, headers, text,
+raise_for_status) to be used with fetch_with_cache.
+"""
+
+import codecs
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional, Pattern, Tuple
+
+import charset_normalizer
+import requests
+from requests.adapters import HTTPAdapter
+
+from .types import UnsupportedContentError
+
+logger = logging.getLogger(__name__)
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain', 'application/xml', 'text/xml')
+
+# Bodies that are clearly not HTML, whatever the server claims
+_BINARY_SIGNATURES = (b'%PDF', b'PK\x03\x04', b'\x89PNG', b'GIF8', b'\xff\xd8\xff', b'\x1f\x8b')
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+_HEADER_CHARSET = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+# <meta charset> must appear within the first 1024 bytes per the HTML spec; allow some slack
+META_SNIFF_BYTES = 4096
+# Sample handed to the detector when nothing is declared and the body isn't UTF-8
+DETECT_SAMPLE_BYTES = 32 * 1024
+CHUNK_SIZE = 64 * 1024
+# Smaller reads when stopping early, so a 3 KB head doesn't pull 64 KB
+UNTIL_CHUNK_SIZE = 8 * 1024
+
+
+def _normalize_charset(name: Optional[str]) -> Optional[str]:
+    """Python codec name for a declared charset, or None if unknown."""
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip().lower()).name
+    except LookupError:
+        return None
+
+
+def detect_charset(body: bytes, content_type: str = '') -> Tuple[str, str]:
+    """
+    Work out a page's encoding.
+
+    Returns:
+        (codec name, source) where source is header, bom, meta, utf-8 or detected
+    """
+    for bom, charset in _BOMS:
+        if body.startswith(bom):
+            return charset, 'bom'
+
+    declared = _HEADER_CHARSET.search(content_type or '')
+    charset = _normalize_charset(declared.group(1) if declared else None)
+    if charset:
+        return charset, 'header'
+
+    meta = _META_CHARSET.search(body[:META_SNIFF_BYTES])
+    charset = _normalize_charset(meta.group(1).decode('ascii', 'ignore') if meta else None)
+    if charset:
+        # Pages served as UTF-16 can't declare it in ASCII <meta>; it's always wrong there
+        return ('utf-8' if charset.startswith('utf-16') else charset), 'meta'
+
+    try:
+        body.decode('utf-8')
+        return 'utf-8', 'utf-8'
+    except UnicodeDecodeError as e:
+        # A multi-byte sequence cut off by the byte cap is still UTF-8
+        if e.start >= len(body) - 3 and e.reason == 'unexpected end of data':
+            return 'utf-8', 'utf-8'
+
+    best = charset_normalizer.from_bytes(body[:DETECT_SAMPLE_BYTES]).best()
+    return (best.encoding if best else 'windows-1252'), 'detected'
+
+
+class HtmlResponse:
+    """A fetched page: decoded text plus transfer metrics."""
+
+    def __init__(
+        self,
+        response: requests.Response,
+        body: bytes = b'',
+        truncated: bool = False,
+        stopped: bool = False,
+        elapsed: float = 0.0,
+        first_byte: float = 0.0,
+    ):
+        self.url = response.url
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.content = body
+        self.bytes_read = len(body)
+        self.truncated = truncated
+        self.stopped = stopped
+        self.elapsed = elapsed
+        self.first_byte = first_byte
+        self._response = response
+
+        if body:
+            self.encoding, self.charset_source = detect_charset(body, self.headers.get('Content-Type', ''))
+            self.text = body.decode(self.encoding, errors='replace')
+        else:
+            self.encoding, self.charset_source = None, None
+            self.text = ''
+
+    @property
+    def complete(self) -> bool:
+        """Whether the whole body was read (as opposed to stopping early on purpose)."""
+        return not self.stopped
+
+    def raise_for_status(self) -> None:
+        self._response.raise_for_status()
+
+
+class PageFetcher:
+    """Streams HTML pages with a size cap over a pooled session."""
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ):
+        """
+        Args:
+            max_bytes: Body bytes read per page before truncating (default: WEB_FETCH_MAX_KB env var, 5120)
+            connect_timeout: Seconds to establish a connection
+                (default: WEB_FETCH_CONNECT_TIMEOUT env var, 5)
+            read_timeout: Seconds to wait between bytes (default: WEB_FETCH_READ_TIMEOUT env var, 30)
+        """
+        self.max_bytes = max_bytes or int(os.getenv('WEB_FETCH_MAX_KB', '5120')) * 1024
+        self.timeout = (
+            connect_timeout or float(os.getenv('WEB_FETCH_CONNECT_TIMEOUT', '5')),
+            read_timeout or float(os.getenv('WEB_FETCH_READ_TIMEOUT', '30')),
+        )
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=8)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'bytes_read': 0, 'truncated': 0, 'rejected': 0, 'seconds': 0.0}
+
+    def _record(self, **counts) -> None:
+        with self._lock:
+            for key, value in counts.items():
+                self._stats[key] += value
+
+    def stats(self) -> Dict[str, float]:
+        """Totals since start, for logs and health endpoints."""
+        with self._lock:
+            return dict(self._stats)
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        proxies: Optional[Dict[str, str]] = None,
+        verify: bool = True,
+        timeout=None,
+        until: Optional[Pattern[bytes]] = None,
+    ) -> HtmlResponse:
+        """
+        Fetch a page, reading at most max_bytes of its body.
+
+        Error statuses (and 304) are returned without reading the body; call
+        raise_for_status() as with requests.
+
+        Args:
+            until: Stop reading once this matches the body read so far
+                (the response is then marked stopped, not complete)
+
+        Raises:
+            requests.RequestException: On connection errors and timeouts
+            UnsupportedContentError: If the response isn't HTML
+        """
+        started = time.monotonic()
+        response = self.session.get(
+            url, headers=headers, proxies=proxies, verify=verify,
+            timeout=timeout or self.timeout, stream=True, allow_redirects=True,
+        )
+        first_byte = time.monotonic() - started
+
+        try:
+            if response.status_code >= 300:
+                self._record(requests=1, seconds=first_byte)
+                return HtmlResponse(response, elapsed=first_byte, first_byte=first_byte)
+
+            content_type = response.headers.get('Content-Type', '')
+            mime = content_type.split(';', 1)[0].strip().lower()
+            if mime and mime not in HTML_CONTENT_TYPES:
+                self._record(requests=1, rejected=1)
+                raise UnsupportedContentError(f"Not an HTML page ({mime}): {url}")
+
+            chunks, size, truncated, stopped = [], 0, False, False
+            chunk_size = UNTIL_CHUNK_SIZE if until is not None else CHUNK_SIZE
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if not chunks and chunk.startswith(_BINARY_SIGNATURES):
+                    self._record(requests=1, rejected=1)
+                    raise UnsupportedContentError(f"Not an HTML page (binary body): {url}")
+                # Search the new chunk plus a little overlap, in case the match straddles chunks
+                window = (chunks[-1][-64:] if chunks else b'') + chunk
+                chunks.append(chunk)
+                size += len(chunk)
+                if until is not None and until.search(window):
+                    stopped = True
+                    break
+                if size >= self.max_bytes:
+                    truncated = True
+                    break
+        finally:
+            response.close()
+
+        body = b''.join(chunks)[:self.max_bytes]
+        elapsed = time.monotonic() - started
+        self._record(requests=1, bytes_read=len(body), truncated=int(truncated), seconds=elapsed)
+        if truncated:
+            logger.warning(f"Page truncated at {self.max_bytes // 1024} KB: {url}")
+        logger.debug(f"Fetched {url}: {len(body)} bytes in {elapsed * 1000:.0f} ms "
+                     f"(first byte {first_byte * 1000:.0f} ms)")
+
+        return HtmlResponse(
+            response, body, truncated=truncated, stopped=stopped, elapsed=elapsed, first_byte=first_byte
+        )
+
+    def close(self) -> None:
+        """Release pooled connections."""
+        self.session.close()
+
+
+_default_fetcher: Optional[PageFetcher] = None
+_default_lock = threading.Lock()
+
+
+def get_page_fetcher() -> PageFetcher:
+    """Return the process-wide PageFetcher."""
+    global _default_fetcher
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = PageFetcher()
+        return _default_fetcher
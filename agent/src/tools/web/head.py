@@ -0,0 +1,78 @@
+"""
+Head-only HTML metadata parsing.
+
+OpenGraph, Twitter card and standard meta tags all live in <head>, which is
+usually the first few KB of a page. Building a BeautifulSoup tree of the
+whole document to read them wastes most of the parse (and, for generic
+links, most of the download). parse_head() feeds the page to lxml's
+incremental HTML parser and stops at the first sign the head is over
+(</head> or the start of <body>). HEAD_END lets PageFetcher stop the
+download at the same point. Callers that already hold a parsed document
+use head_from_tree() instead.
+"""
+
+import logging
+import re
+
+from lxml import etree
+
+from .types import PageHead
+
+logger = logging.getLogger(__name__)
+
+# End of the head in raw bytes, for stopping a download (see PageFetcher.get)
+HEAD_END = re.compile(rb'</head\s*>|<body[\s>]', re.IGNORECASE)
+
+# Text fed to the parser per step; the head is normally within the first one
+FEED_CHARS = 16 * 1024
+
+
+def _collect(head: PageHead, element) -> None:
+    """Record a <meta> or <title> element."""
+    if element.tag == 'meta':
+        key = element.get('property') or element.get('name')
+        content = element.get('content')
+        if key and content is not None:
+            head.meta.setdefault(key.strip(), content.strip())
+    elif element.tag == 'title' and head.title is None:
+        head.title = (element.text or '').strip() or None
+
+
+def parse_head(html: str) -> PageHead:
+    """
+    Read <title> and meta tags from a page without parsing its body.
+
+    Meta tags are keyed by their property (og:*, article:*) or name
+    (description, twitter:*, ...); the first occurrence wins.
+    """
+    head = PageHead()
+    if not html:
+        return head
+
+    parser = etree.HTMLPullParser(events=('start', 'end'))
+    try:
+        for start in range(0, len(html), FEED_CHARS):
+            parser.feed(html[start:start + FEED_CHARS])
+            for event, element in parser.read_events():
+                if event == 'start':
+                    if element.tag == 'body':
+                        head.complete = True
+                        return head
+                    continue
+                if element.tag == 'head':
+                    head.complete = True
+                    return head
+                _collect(head, element)
+    except etree.LxmlError as e:
+        logger.warning(f"Failed to parse page head: {e}")
+    return head
+
+
+def head_from_tree(tree) -> PageHead:
+    """parse_head() for a document lxml has already parsed (e.g. trafilatura's tree)."""
+    head = PageHead(complete=True)
+    element = tree.find('head') if tree is not None else None
+    if element is not None:
+        for child in element.iter('meta', 'title'):
+            _collect(head, child)
+    return head
@@ -0,0 +1,263 @@
+"""
+HTTP conditional-request cache for page fetches.
+
+Popular articles get saved over and over, and each save used to download
+the full page again. HttpCache keeps each page's body with its ETag /
+Last-Modified, keyed by canonical URL (no fragment, no tracking params):
+
+- Fresh entries (Cache-Control max-age / Expires, else HTTP_CACHE_DEFAULT_TTL)
+  are served without a request.
+- Stale entries are revalidated with If-None-Match / If-Modified-Since; a
+  304 reuses the stored body.
+- Callers can attach results derived from a body (e.g. the extracted
+  article) with remember(). They are dropped whenever the body changes,
+  so on a fresh hit or 304 the extraction itself can be skipped.
+- Bodies cut short on purpose (e.g. head only, for OpenGraph) are stored as
+  partial entries. They are only served to callers that asked for a partial
+  body (partial_ok), never in place of the full page.
+
+Entries live in an in-process LRU bounded by HTTP_CACHE_MAX_MB.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Mapping, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .types import CacheStatus, FetchedPage
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that never change the page
+_TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|dclid|msclkid|mc_cid|mc_eid|igshid|ref_src)$', re.IGNORECASE)
+_MAX_AGE = re.compile(r'(?:^|,)\s*(?:s-)?max-age\s*=\s*"?(\d+)', re.IGNORECASE)
+
+# Entries larger than this share of the budget aren't cached
+_MAX_ENTRY_SHARE = 0.25
+
+
+def canonical_url(url: str) -> str:
+    """Cache key for a URL: lowercase scheme/host, no fragment, no tracking params."""
+    parts = urlsplit(url.strip())
+    query = urlencode([
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAMS.match(key)
+    ])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+
+
+class CacheEntry:
+    """A cached page body with its validators and freshness."""
+
+    def __init__(
+        self,
+        url: str,
+        body: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        expires_at: float,
+        partial: bool = False,
+    ):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+        self.partial = partial  # Body is only the start of the page
+        self.derived: Dict[str, Any] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional-request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """LRU of page bodies with HTTP freshness and revalidation."""
+
+    def __init__(self, max_bytes: Optional[int] = None, default_ttl: Optional[float] = None):
+        """
+        Args:
+            max_bytes: Total cached body size (default: HTTP_CACHE_MAX_MB env var, 64 MB; 0 disables)
+            default_ttl: Freshness for responses without caching headers
+                (default: HTTP_CACHE_DEFAULT_TTL env var, 300 seconds)
+        """
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv('HTTP_CACHE_MAX_MB', '64')) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl if default_ttl is not None else float(os.getenv('HTTP_CACHE_DEFAULT_TTL', '300'))
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'fresh': 0, 'revalidated': 0, 'fetched': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Cached entry for a URL (fresh or stale), or None."""
+        key = canonical_url(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _expires_at(self, headers: Mapping[str, str], now: float) -> Optional[float]:
+        """Freshness deadline from response headers; None means don't store."""
+        cache_control = headers.get('Cache-Control', '') or ''
+        directives = cache_control.lower()
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            return now  # Store, but always revalidate
+        max_age = _MAX_AGE.search(cache_control)
+        if max_age:
+            return now + int(max_age.group(1))
+        expires = headers.get('Expires')
+        if expires:
+            try:
+                return parsedate_to_datetime(expires).timestamp()
+            except (TypeError, ValueError):
+                return now  # Invalid Expires means already expired
+        return now + self.default_ttl
+
+    def store(self, url: str, headers: Mapping[str, str], body: str, partial: bool = False) -> Optional[CacheEntry]:
+        """
+        Cache a 200 response.
+
+        Args:
+            url: Page URL
+            headers: Response headers
+            body: Response body
+            partial: The body was cut short on purpose (only partial_ok fetches may use it)
+
+        Returns:
+            The new entry, or None if the response may not be cached or is too large
+        """
+        if not self.enabled or not body:
+            return None
+        now = time.time()
+        expires_at = self._expires_at(headers, now)
+        if expires_at is None or len(body) > self.max_bytes * _MAX_ENTRY_SHARE:
+            return None
+
+        key = canonical_url(url)
+        entry = CacheEntry(key, body, headers.get('ETag'), headers.get('Last-Modified'), expires_at, partial)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+        return entry
+
+    def revalidated(self, entry: CacheEntry, headers: Mapping[str, str]) -> None:
+        """Refresh an entry's freshness after a 304 Not Modified."""
+        expires_at = self._expires_at(headers, time.time())
+        with self._lock:
+            entry.expires_at = expires_at if expires_at is not None else time.time()
+            entry.etag = headers.get('ETag') or entry.etag
+            entry.last_modified = headers.get('Last-Modified') or entry.last_modified
+
+    def remember(self, url: str, key: str, value: Any) -> None:
+        """Attach a result derived from the cached body (dropped when the body changes)."""
+        entry = self.get(url)
+        if entry is not None:
+            with self._lock:
+                entry.derived[key] = value
+
+    def recall(self, url: str, key: str) -> Optional[Any]:
+        """Result previously attached with remember(), if the body hasn't changed since."""
+        entry = self.get(url)
+        if entry is None:
+            return None
+        with self._lock:
+            return entry.derived.get(key)
+
+    def record(self, status: CacheStatus) -> None:
+        with self._lock:
+            self._stats[status.value] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counts and current size, for health endpoints and logs."""
+        with self._lock:
+            return {**self._stats, 'entries': len(self._entries), 'bytes': self._bytes}
+
+
+def fetch_with_cache(
+    cache: HttpCache,
+    url: str,
+    get: Callable[[Dict[str, str]], Any],
+    partial_ok: bool = False,
+) -> FetchedPage:
+    """
+    Fetch a page through the cache.
+
+    Args:
+        cache: The cache to use
+        url: Page URL
+        get: Performs the request with extra headers and returns a
+            requests-style response (status_code, headers, text, raise_for_status;
+            responses with complete=False are stored as partial entries)
+        partial_ok: The caller only needs the start of the page (e.g. the head),
+            so partial entries may be served and revalidated
+
+    Raises:
+        Whatever get() or raise_for_status() raises
+    """
+    entry = cache.get(url) if cache.enabled else None
+    if entry is not None and entry.partial and not partial_ok:
+        entry = None  # A partial body can't stand in for the page
+    if entry is not None and entry.is_fresh():
+        cache.record(CacheStatus.FRESH)
+        return FetchedPage(url=url, html=entry.body, cache_status=CacheStatus.FRESH)
+
+    response = get(entry.validators() if entry is not None else {})
+    headers = response.headers if isinstance(response.headers, Mapping) else {}
+
+    if entry is not None and response.status_code == 304:
+        cache.revalidated(entry, headers)
+        cache.record(CacheStatus.REVALIDATED)
+        logger.info(f"Page not modified, reusing cached copy: {url}")
+        return FetchedPage(url=url, html=entry.body, cache_status=CacheStatus.REVALIDATED)
+
+    response.raise_for_status()
+    body = response.text
+    cache.store(url, headers, body, partial=not getattr(response, 'complete', True))
+    cache.record(CacheStatus.FETCHED)
+    return FetchedPage(url=url, html=body, cache_status=CacheStatus.FETCHED)
+
+
+_default_cache: Optional[HttpCache] = None
+_default_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """Return the process-wide HttpCache."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = HttpCache()
+        return _default_cache
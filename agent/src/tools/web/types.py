@@ -0,0 +1,45 @@
+"""
+Types for shared web page fetching.
+"""
+
+from enum import Enum
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class CacheStatus(str, Enum):
+    """Where a fetched page's body came from."""
+    FETCHED = "fetched"  # Downloaded (no usable cache entry)
+    FRESH = "fresh"  # Served from cache without a request
+    REVALIDATED = "revalidated"  # Server answered 304 Not Modified
+
+
+class FetchedPage(BaseModel):
+    """A downloaded (or cached) HTML page."""
+    url: str
+    html: str
+    cache_status: CacheStatus = CacheStatus.FETCHED
+
+    @property
+    def unchanged(self) -> bool:
+        """Body is the cached one, so results derived from it can be reused."""
+        return self.cache_status != CacheStatus.FETCHED
+
+
+
+class PageHead(BaseModel):
+    """Title and meta tags read from a page's <head>."""
+    title: Optional[str] = None
+    meta: Dict[str, str] = Field(default_factory=dict, description="Meta content by property or name")
+    complete: bool = Field(False, description="The end of the head was reached")
+
+
+class WebFetchError(Exception):
+    """Base exception for page fetching errors."""
+    pass
+
+
+class UnsupportedContentError(WebFetchError):
+    """The URL doesn't serve an HTML page (PDF, image, archive...)."""
+    pass
@@ -10,7 +10,7 @@ import logging
 import signal
 import hashlib
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import List, Optional, Tuple
 from supabase import create_client, Client
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from messaging_factory import get_messaging_provider
@@ -21,6 +21,8 @@ from pydantic import BaseModel, Field
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from nodes.video_processor import create_video_processor_graph, VideoProcessorState
+from tools.media import MediaDedupIndex, video_frame_hashes, get_scratch_space, get_cpu_pool
+from tools.video.downloader import DirectVideoDownloader
 from tools.normalizer.service import NormalizerService
 from tools.normalizer.types import NormalizerRequest
 from tools.summarizer.service import SummarizerService
@@ -137,7 +139,11 @@ class VideoWorker:
             logger.error(f"Failed to initialize messaging provider: {e}")
             raise
         
-        self.video_processor_graph = create_video_processor_graph(num_frames=5)
+        # Frame budget is chosen per video from its duration (container probe)
+        self.video_processor_graph = create_video_processor_graph(num_frames=None)
+        self.dedup_index = MediaDedupIndex(self.supabase)
+        # Sweeps scratch files left behind by a crashed previous instance
+        self.scratch = get_scratch_space()
         self.normalizer_service = NormalizerService()
         self.summarizer_service = SummarizerService()
 
@@ -247,110 +253,39 @@ class VideoWorker:
             
             # Get Twilio auth token for video download
             auth_token = os.environ.get('TWILIO_AUTH_TOKEN')
-            
-            # Create state for video processor node
-            state: VideoProcessorState = {
-                'job_id': job_id,
-                'video_url': video_url,
-                'message_id': payload.get('MessageSid', job_id),
-                'auth_token': auth_token,
-                'account_sid': os.environ.get('TWILIO_ACCOUNT_SID'),
-                'video_summary': None,
-                'error': None
-            }
-            
-            # Process video
-            logger.info(f"Processing video for job {job_id}")
-            result_state = self.video_processor_graph.invoke(state)
-            
-            # Check for errors
-            if result_state.get('error'):
-                raise Exception(result_state['error'])
-            
-            video_summary = result_state.get('video_summary')
-            if not video_summary:
-                raise Exception("No video summary generated")
-            
-            logger.info(f"Video job {job_id} processed successfully")
-
-            # --- Normalize Data ---
-            video_title = result_state.get('metadata', {}).get('title') or "Video Analysis"
-            normalized_data = None
-            try:
-                norm_req = NormalizerRequest(
-                    title=video_title,
-                    description=video_summary,
-                    raw_content=None,
-                    source_url=video_url
-                )
-                normalized_data = self.normalizer_service.normalize(norm_req)
-            except Exception as e:
-                logger.warning(f"Normalization failed for video {video_url}: {e}")
-            
-            # --- Generate AI Summary ---
-            ai_summary = None
-            try:
-                sum_req = SummarizerRequest(
-                    title=video_title,
-                    description=video_summary
+            account_sid = os.environ.get('TWILIO_ACCOUNT_SID')
+            
+            # Download once, hashing the bytes as they stream. Every forward of the
+            # same video gets a new MediaUrl, so dedup has to be based on content.
+            hasher = hashlib.sha256()
+            with self.scratch.job(job_id) as scratch:
+                video_path = DirectVideoDownloader().download(
+                    video_url, auth_token, account_sid, hasher=hasher, scratch=scratch
                 )
-                ai_summary = self.summarizer_service.generate_summary(sum_req)
-            except Exception as e:
-                logger.warning(f"Summarization failed for video {video_url}: {e}")
-            
-            # --- Data Persistence Start ---
-            
-            # Generate a consistent hash for the video URL to handle deduplication
-            # In a real-world scenario, we might use a hash of the file content, 
-            # but for now, the URL (or MediaSid) is the best proxy.
-            url_hash = hashlib.sha256(video_url.encode()).hexdigest()
-            
-            # Check for existing metadata
-            existing = self.supabase.table('link_metadata').select('id, scrape_count').eq('url_hash', url_hash).limit(1).execute()
-            
-            link_id = None
-            if existing and existing.data and len(existing.data) > 0:
-                link_id = existing.data[0]['id']
-                # Increment count
-                # Prepare update data
-                update_data = {
-                    'scrape_count': (existing.data[0].get('scrape_count') or 1) + 1,
-                    'last_updated_at': 'now()'
-                }
                 
-                # Update normalized fields
-                if normalized_data:
-                    update_data.update({
-                        'normalized_category': normalized_data.category.value,
-                        'normalized_price_range': normalized_data.price_range.value if normalized_data.price_range else None,
-                        'normalized_tags': normalized_data.tags,
-                        'ai_summary': ai_summary
-                    })
-                    
-                self.supabase.table('link_metadata').update(update_data).eq('id', link_id).execute()
-                logger.info(f"Re-used existing video metadata {link_id}")
-            else:
-                # Insert new metadata
-                # We store the video summary in the 'description' field or a structured content field
-                insert_result = self.supabase.table('link_metadata').insert({
-                    'url': video_url,
-                    'url_hash': url_hash,
-                    'platform': 'whatsapp_video', # specialized platform type
-                    'content_type': 'video',
-                    'extraction_strategy': 'vision',
-                    'title': 'Video Analysis', # Placeholder title
-                    'description': video_summary, # The generated summary goes here
-                    'thumbnail_url': None, # We could upload a frame here in the future
-                    'scrape_status': 'scraped',
-                    'normalized_category': normalized_data.category.value if normalized_data else None,
-                    'normalized_price_range': normalized_data.price_range.value if normalized_data and normalized_data.price_range else None,
-                    'normalized_tags': normalized_data.tags if normalized_data else None,
-                    'ai_summary': ai_summary
-                }).execute()
+                content_hash = hasher.hexdigest()
+                frame_hashes = None
+                if self.dedup_index.use_perceptual:
+                    frame_hashes = video_frame_hashes(video_path)
+                # The middle frame's hash finds candidates; every frame must match
+                perceptual_hash = frame_hashes[len(frame_hashes) // 2] if frame_hashes else None
                 
-                if insert_result.data:
-                    link_id = insert_result.data[0]['id']
-                    logger.info(f"Created new video metadata {link_id}")
+                duplicate = self.dedup_index.find(
+                    content_hash, perceptual_hash, content_type='video', frame_hashes=frame_hashes
+                )
+                if duplicate:
+                    # Known media: link the existing row instead of re-analyzing
+                    link_id = duplicate['id']
+                    video_summary = duplicate.get('description') or duplicate.get('ai_summary')
+                    self.supabase.table('link_metadata').update({
+                        'scrape_count': (duplicate.get('scrape_count') or 1) + 1,
+                        'last_updated_at': 'now()'
+                    }).eq('id', link_id).execute()
+                    logger.info(f"Video job {job_id} matched existing media {link_id}, skipping analysis")
+                else:
+                    link_id, video_summary = self._analyze_and_persist(
+                        job_id, payload, video_url, video_path, content_hash, perceptual_hash, frame_hashes
+                    )
 
             # Create User Saved Link entry
             user_phone = payload.get('From', '').replace('whatsapp:', '')
@@ -379,7 +314,8 @@ class VideoWorker:
                 'status': 'complete'
             }).eq('id', job_id).execute()
             
-            logger.info(f"Job {job_id} successfully completed and updated")
+            # Pool load alongside each job so a growing queue depth shows up in the worker logs
+            logger.info(f"Job {job_id} successfully completed and updated (cpu pool: {get_cpu_pool().stats()})")
             
             # 5. Notify User
             user_phone_notify = payload.get('From', '')
@@ -406,6 +342,136 @@ class VideoWorker:
             self._mark_job_failed(job, error_category)
             return False
 
+    def _analyze_and_persist(
+        self,
+        job_id: str,
+        payload: dict,
+        video_url: str,
+        video_path: str,
+        content_hash: str,
+        perceptual_hash: Optional[int],
+        frame_hashes: Optional[List[int]] = None,
+    ) -> Tuple[Optional[str], str]:
+        """
+        Analyze a downloaded video and persist it to link_metadata.
+        
+        Returns:
+            Tuple of (link_id, video_summary)
+        """
+        # Create state for video processor node
+        state: VideoProcessorState = {
+            'job_id': job_id,
+            'video_url': video_url,
+            'video_path': video_path,
+            'message_id': payload.get('MessageSid', job_id),
+            'auth_token': None,
+            'account_sid': None,
+            'video_summary': None,
+            'error': None
+        }
+        
+        # Process video
+        logger.info(f"Processing video for job {job_id}")
+        result_state = self.video_processor_graph.invoke(state)
+        
+        # Check for errors
+        if result_state.get('error'):
+            raise Exception(result_state['error'])
+        
+        video_summary = result_state.get('video_summary')
+        if not video_summary:
+            raise Exception("No video summary generated")
+        
+        logger.info(f"Video job {job_id} processed successfully")
+
+        # --- Normalize Data ---
+        video_title = result_state.get('metadata', {}).get('title') or "Video Analysis"
+        normalized_data = None
+        try:
+            norm_req = NormalizerRequest(
+                title=video_title,
+                description=video_summary,
+                raw_content=None,
+                source_url=video_url
+            )
+            normalized_data = self.normalizer_service.normalize(norm_req)
+        except Exception as e:
+            logger.warning(f"Normalization failed for video {video_url}: {e}")
+        
+        # --- Generate AI Summary ---
+        ai_summary = None
+        try:
+            sum_req = SummarizerRequest(
+                title=video_title,
+                description=video_summary
+            )
+            ai_summary = self.summarizer_service.generate_summary(sum_req)
+        except Exception as e:
+            logger.warning(f"Summarization failed for video {video_url}: {e}")
+        
+        # --- Data Persistence Start ---
+        
+        # url_hash is still required (unique) for the row; content dedup happens
+        # before analysis via content_hash/perceptual_hash/frame_hashes
+        url_hash = hashlib.sha256(video_url.encode()).hexdigest()
+        
+        # Check for existing metadata
+        existing = self.supabase.table('link_metadata').select('id, scrape_count').eq('url_hash', url_hash).limit(1).execute()
+        
+        link_id = None
+        if existing and existing.data and len(existing.data) > 0:
+            link_id = existing.data[0]['id']
+            # Increment count
+            # Prepare update data
+            update_data = {
+                'scrape_count': (existing.data[0].get('scrape_count') or 1) + 1,
+                'last_updated_at': 'now()'
+            }
+            
+            # Update normalized fields
+            if normalized_data:
+                update_data.update({
+                    'normalized_category': normalized_data.category.value,
+                    'normalized_price_range': normalized_data.price_range.value if normalized_data.price_range else None,
+                    'normalized_tags': normalized_data.tags,
+                    'ai_summary': ai_summary
+                })
+            update_data.update({
+                'content_hash': content_hash,
+                'perceptual_hash': perceptual_hash,
+                'frame_hashes': frame_hashes
+            })
+                
+            self.supabase.table('link_metadata').update(update_data).eq('id', link_id).execute()
+            logger.info(f"Re-used existing video metadata {link_id}")
+        else:
+            # Insert new metadata
+            # We store the video summary in the 'description' field or a structured content field
+            insert_result = self.supabase.table('link_metadata').insert({
+                'url': video_url,
+                'url_hash': url_hash,
+                'platform': 'whatsapp_video', # specialized platform type
+                'content_type': 'video',
+                'extraction_strategy': 'vision',
+                'title': 'Video Analysis', # Placeholder title
+                'description': video_summary, # The generated summary goes here
+                'thumbnail_url': None, # We could upload a frame here in the future
+                'scrape_status': 'scraped',
+                'normalized_category': normalized_data.category.value if normalized_data else None,
+                'normalized_price_range': normalized_data.price_range.value if normalized_data and normalized_data.price_range else None,
+                'normalized_tags': normalized_data.tags if normalized_data else None,
+                'ai_summary': ai_summary,
+                'content_hash': content_hash,
+                'perceptual_hash': perceptual_hash,
+                'frame_hashes': frame_hashes
+            }).execute()
+            
+            if insert_result.data:
+                link_id = insert_result.data[0]['id']
+                logger.info(f"Created new video metadata {link_id}")
+
+        return link_id, video_summary
+
     def notify_user_success(self, to: str, title: str):
         """Send a success message via WhatsApp."""
         try:
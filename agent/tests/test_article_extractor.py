@@ -2,21 +2,26 @@ import unittest
 from unittest.mock import MagicMock, patch
 from agent.src.tools.article.extractors.trafilatura_extractor import TrafilaturaExtractor
 from agent.src.tools.article.extractors.newspaper_extractor import NewspaperExtractor
+from agent.src.tools.article.fetcher import HtmlFetcher
 from agent.src.tools.article.types import ArticleExtractionError
+from agent.src.tools.web import HttpCache
 
 class TestTrafilaturaExtractor(unittest.TestCase):
     
     def setUp(self):
-        self.extractor = TrafilaturaExtractor()
+        # Uncached, so tests don't see each other's pages
+        self.page_fetcher = MagicMock()
+        self.extractor = TrafilaturaExtractor(
+            fetcher=HtmlFetcher(cache=HttpCache(max_bytes=0), page_fetcher=self.page_fetcher)
+        )
         
     @patch('trafilatura.extract')
-    @patch('requests.get')
-    def test_extract_success(self, mock_get, mock_extract):
-        # Mock requests
+    def test_extract_success(self, mock_extract):
+        # Mock the page download
         mock_response = MagicMock()
         mock_response.text = '<html><body><p>Test content</p></body></html>'
         mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        self.page_fetcher.get.return_value = mock_response
         
         # Mock trafilatura
         mock_extract.return_value = "Test content"
@@ -27,10 +32,9 @@ class TestTrafilaturaExtractor(unittest.TestCase):
         self.assertEqual(response.url, "https://example.com")
         
     @patch('trafilatura.extract')
-    @patch('requests.get')
-    def test_extract_failure(self, mock_get, mock_extract):
-        # Mock requests failure
-        mock_get.side_effect = Exception("Network error")
+    def test_extract_failure(self, mock_extract):
+        # Mock download failure
+        self.page_fetcher.get.side_effect = Exception("Network error")
         
         with self.assertRaises(Exception): # The extractor re-raises as ProxyError or ArticleExtractionError
             self.extractor.extract("https://example.com")
@@ -0,0 +1,90 @@
+import random
+import unittest
+from unittest.mock import MagicMock
+
+from agent.src.tools.article.extractor_stats import ExtractorStatsStore, extractor_domain
+
+EXTRACTORS = ['trafilatura', 'newspaper']
+URL = "https://www.example.com/news/story"
+
+
+class TestExtractorStatsStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = ExtractorStatsStore(exploration=0, min_samples=3, max_timeout=30)
+
+    def test_domain_key(self):
+        self.assertEqual(extractor_domain("https://WWW.Example.com/a?b=1"), "example.com")
+        self.assertEqual(extractor_domain("http://blog.example.com"), "blog.example.com")
+
+    def test_default_order_without_stats(self):
+        plan = self.store.plan(URL, EXTRACTORS)
+
+        self.assertEqual(plan.domain, "example.com")
+        self.assertEqual(plan.order, EXTRACTORS)
+        self.assertEqual(plan.timeouts, {'trafilatura': 30, 'newspaper': 30})
+
+    def test_failing_extractor_demoted(self):
+        for _ in range(3):
+            self.store.record("example.com", "trafilatura", False, 800)
+            self.store.record("example.com", "newspaper", True, 2000, 4000)
+
+        plan = self.store.plan(URL, EXTRACTORS)
+
+        self.assertEqual(plan.order, ['newspaper', 'trafilatura'])
+        # Timeout follows newspaper's latency on the domain; the last extractor gets the full timeout
+        self.assertEqual(plan.timeouts['newspaper'], 8.0)
+        self.assertEqual(plan.timeouts['trafilatura'], 30)
+
+    def test_few_samples_keep_default_order(self):
+        self.store.record("example.com", "trafilatura", False, 800)
+
+        self.assertEqual(self.store.plan(URL, EXTRACTORS).order, EXTRACTORS)
+
+    def test_short_texts_lower_score(self):
+        for _ in range(3):
+            self.store.record("example.com", "trafilatura", True, 100, 80)
+            self.store.record("example.com", "newspaper", True, 100, 3000)
+
+        self.assertEqual(self.store.plan(URL, EXTRACTORS).order, ['newspaper', 'trafilatura'])
+
+    def test_exploration_retries_demoted_extractor(self):
+        store = ExtractorStatsStore(exploration=1.0, min_samples=3, rng=random.Random(0))
+        for _ in range(3):
+            store.record("example.com", "trafilatura", False, 800)
+            store.record("example.com", "newspaper", True, 2000, 4000)
+
+        plan = store.plan(URL, EXTRACTORS)
+
+        self.assertTrue(plan.explored)
+        self.assertEqual(plan.order, ['trafilatura', 'newspaper'])
+
+    def test_recovering_extractor_promoted_again(self):
+        for _ in range(3):
+            self.store.record("example.com", "trafilatura", False, 800)
+            self.store.record("example.com", "newspaper", True, 2000, 4000)
+        for _ in range(8):
+            self.store.record("example.com", "trafilatura", True, 500, 4000)
+
+        self.assertEqual(self.store.plan(URL, EXTRACTORS).order, EXTRACTORS)
+
+    def test_stats_loaded_and_recorded_in_supabase(self):
+        supabase = MagicMock()
+        supabase.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [
+            {'extractor': 'trafilatura', 'attempts': 20, 'successes': 1, 'success_rate': 0.05,
+             'avg_latency_ms': 900, 'avg_text_length': 2000},
+        ]
+        store = ExtractorStatsStore(supabase, exploration=0, min_samples=3)
+
+        plan = store.plan(URL, EXTRACTORS)
+        store.record(plan.domain, 'newspaper', True, 1500, 3000)
+
+        self.assertEqual(plan.order, ['newspaper', 'trafilatura'])
+        supabase.table.return_value.select.return_value.eq.assert_called_with('domain', 'example.com')
+        args = supabase.rpc.call_args.args
+        self.assertEqual(args[0], 'record_article_extractor_result')
+        self.assertEqual(args[1]['p_domain'], 'example.com')
+        self.assertTrue(args[1]['p_success'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,21 @@
+import threading
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 from agent.src.tools.article.service import ArticleService
-from agent.src.tools.article.types import ArticleExtractionRequest, ArticleExtractionResponse
+from agent.src.tools.article.extractor_stats import ExtractorStatsStore
+from agent.src.tools.article.types import ArticleExtractionRequest, ArticleExtractionResponse, ArticleExtractionError
+from agent.src.tools.web import CacheStatus, FetchedPage, HttpCache
 
 class TestArticleService(unittest.TestCase):
     
     def setUp(self):
         self.service = ArticleService()
+        self.service.fetcher = MagicMock()
+        self.service.fetcher.cache = HttpCache()
+        self.service.fetcher.fetch_page.return_value = FetchedPage(
+            url="http://test.com", html="<html><body><p>Page</p></body></html>"
+        )
         
     def test_extract_primary_success(self):
         # Mock primary extractor
@@ -36,6 +45,121 @@ class TestArticleService(unittest.TestCase):
         
         self.assertEqual(response.text, "Fallback content")
         self.service.newspaper.extract.assert_called_once()
+        
+    def test_page_downloaded_once_for_both_extractors(self):
+        """The fallback extractor reuses the HTML instead of downloading it again."""
+        html = "<html><body><p>Page</p></body></html>"
+        self.service.trafilatura.extract = MagicMock(side_effect=Exception("Primary failed"))
+        self.service.newspaper.extract = MagicMock(return_value=ArticleExtractionResponse(
+            text="Fallback content", 
+            url="http://test.com"
+        ))
+        
+        self.service.extract(ArticleExtractionRequest(url="http://test.com"))
+        
+        self.service.fetcher.fetch_page.assert_called_once_with("http://test.com")
+        self.assertEqual(self.service.trafilatura.extract.call_args.kwargs['html_content'], html)
+        self.assertEqual(self.service.newspaper.extract.call_args.kwargs['html_content'], html)
+        
+    def test_download_failure_lets_newspaper_fetch(self):
+        self.service.fetcher.fetch_page.side_effect = Exception("Connection reset")
+        self.service.trafilatura.extract = MagicMock()
+        self.service.newspaper.extract = MagicMock(return_value=ArticleExtractionResponse(
+            text="Fallback content", 
+            url="http://test.com"
+        ))
+        
+        response = self.service.extract(ArticleExtractionRequest(url="http://test.com"))
+        
+        self.assertEqual(response.text, "Fallback content")
+        self.service.trafilatura.extract.assert_not_called()
+        self.assertIsNone(self.service.newspaper.extract.call_args.kwargs['html_content'])
+        
+    def test_unchanged_page_reuses_extraction(self):
+        """A fresh or 304-revalidated page skips extraction entirely."""
+        url = "http://test.com"
+        self.service.fetcher.cache.store(url, {}, "<html><body><p>Page</p></body></html>")
+        self.service.fetcher.cache.remember(url, ArticleService.CACHE_KEY, ArticleExtractionResponse(
+            text="Cached content", 
+            url=url
+        ).model_dump())
+        self.service.fetcher.fetch_page.return_value = FetchedPage(
+            url=url, html="<html><body><p>Page</p></body></html>", cache_status=CacheStatus.REVALIDATED
+        )
+        self.service.trafilatura.extract = MagicMock()
+        
+        response = self.service.extract(ArticleExtractionRequest(url=url))
+        
+        self.assertEqual(response.text, "Cached content")
+        self.service.trafilatura.extract.assert_not_called()
+        
+    def test_domain_where_trafilatura_fails_starts_with_newspaper(self):
+        self.service.extractor_stats = ExtractorStatsStore(exploration=0, min_samples=3)
+        for _ in range(3):
+            self.service.extractor_stats.record("test.com", "trafilatura", False, 500)
+        self.service.trafilatura.extract = MagicMock()
+        self.service.newspaper.extract = MagicMock(return_value=ArticleExtractionResponse(
+            text="Newspaper content", 
+            url="http://test.com/a"
+        ))
+        
+        response = self.service.extract(ArticleExtractionRequest(url="http://test.com/a"))
+        
+        self.assertEqual(response.text, "Newspaper content")
+        self.service.trafilatura.extract.assert_not_called()
+        self.assertEqual(self.service.extractor_stats.get("test.com")["newspaper"].successes, 1)
+
+    def test_slow_extractor_times_out_and_gets_budget(self):
+        self.service.extractor_stats = ExtractorStatsStore(exploration=0, max_timeout=0.2)
+        self.service.trafilatura.extract = MagicMock(side_effect=lambda *args, **kwargs: time.sleep(1))
+        self.service.newspaper.extract = MagicMock(return_value=ArticleExtractionResponse(
+            text="Newspaper content", 
+            url="http://test.com/a"
+        ))
+        
+        response = self.service.extract(ArticleExtractionRequest(url="http://test.com/a"))
+        
+        self.assertEqual(response.text, "Newspaper content")
+        self.assertEqual(self.service.trafilatura.extract.call_args.kwargs['timeout'], 0.2)
+        stats = self.service.extractor_stats.get("test.com")
+        self.assertEqual(stats["trafilatura"].attempts, 1)
+        self.assertEqual(stats["trafilatura"].successes, 0)
+        
+    def test_queued_extractor_not_recorded_as_timeout(self):
+        """Time spent waiting for a thread doesn't count against the extractor."""
+        service = ArticleService(ExtractorStatsStore(exploration=0, max_timeout=0.2), max_threads=1)
+        service.fetcher = self.service.fetcher
+        service.trafilatura.extract = MagicMock()
+        service.newspaper.extract = MagicMock()
+        release = threading.Event()
+        service._executor.submit(release.wait)
+        
+        try:
+            with self.assertRaises(ArticleExtractionError):
+                service.extract(ArticleExtractionRequest(url="http://test.com/a"))
+        finally:
+            release.set()
+        
+        service.trafilatura.extract.assert_not_called()
+        service.newspaper.extract.assert_not_called()
+        self.assertEqual(service.extractor_stats.get("test.com"), {})
+        
+    def test_queue_wait_not_counted_toward_timeout(self):
+        service = ArticleService(ExtractorStatsStore(exploration=0, max_timeout=0.4), max_threads=1)
+        service.fetcher = self.service.fetcher
+        service.trafilatura.extract = MagicMock(side_effect=lambda *args, **kwargs: (
+            time.sleep(0.15), ArticleExtractionResponse(text="Primary content", url="http://test.com/a")
+        )[1])
+        # Holds the only thread for most of the timeout
+        service._executor.submit(time.sleep, 0.3)
+        
+        response = service.extract(ArticleExtractionRequest(url="http://test.com/a"))
+        
+        self.assertEqual(response.text, "Primary content")
+        stats = service.extractor_stats.get("test.com")["trafilatura"]
+        self.assertEqual(stats.successes, 1)
+        self.assertLess(stats.avg_latency_ms, 300)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+import cv2
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from tools.image.ocr import measure_text_density, extract_text
+
+
+def _encode(img) -> bytes:
+    return cv2.imencode('.png', img)[1].tobytes()
+
+
+def _screenshot() -> bytes:
+    """Phone-sized white image with lines of black text."""
+    img = np.full((1600, 900, 3), 255, np.uint8)
+    words = "the quick brown fox jumps over lazy dog receipt total amount".split()
+    rng = np.random.default_rng(0)
+    for y in range(40, 1580, 40):
+        cv2.putText(img, " ".join(rng.choice(words, 5)), (20, y), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+    return _encode(img)
+
+
+def _photo() -> bytes:
+    """Smooth gradient with noise and large shapes, no text."""
+    rng = np.random.default_rng(1)
+    y, x = np.mgrid[0:1200, 0:1600]
+    img = np.stack([x / 1600 * 255, y / 1200 * 255, (x + y) / 2800 * 255], -1).astype(np.float32)
+    img = np.clip(img + rng.normal(0, 12, img.shape), 0, 255).astype(np.uint8)
+    for _ in range(15):
+        center = (int(rng.integers(0, 1600)), int(rng.integers(0, 1200)))
+        color = tuple(int(c) for c in rng.integers(0, 255, 3))
+        cv2.circle(img, center, int(rng.integers(20, 200)), color, -1)
+    return _encode(img)
+
+
+def _tesseract_data(words, confidence):
+    return {
+        'text': list(words),
+        'conf': [confidence] * len(words),
+        'block_num': [1] * len(words),
+        'par_num': [1] * len(words),
+        'line_num': [i // 5 for i in range(len(words))],
+    }
+
+
+class TestTextDensity(unittest.TestCase):
+
+    def test_screenshot_is_text_heavy(self):
+        density = measure_text_density(_screenshot())
+        self.assertTrue(density.is_text_heavy)
+        self.assertGreater(density.background, 0.5)
+
+    def test_photo_is_not_text_heavy(self):
+        density = measure_text_density(_photo())
+        self.assertFalse(density.is_text_heavy)
+
+    def test_undecodable_bytes(self):
+        self.assertFalse(measure_text_density(b"not an image").is_text_heavy)
+
+
+@patch('tools.image.ocr.ocr_available', return_value=True)
+@patch('tools.image.ocr.pytesseract')
+class TestExtractText(unittest.TestCase):
+
+    def test_text_heavy_image_is_ocrd(self, mock_tesseract, _):
+        words = [f"word{i}" for i in range(20)]
+        mock_tesseract.image_to_data.return_value = _tesseract_data(words, 91)
+
+        result = extract_text(_screenshot())
+
+        self.assertIsNotNone(result)
+        self.assertEqual(result.word_count, 20)
+        self.assertEqual(result.confidence, 91)
+        self.assertEqual(result.text.count("\n"), 3)  # 4 lines of 5 words
+
+    def test_photo_skips_ocr(self, mock_tesseract, _):
+        self.assertIsNone(extract_text(_photo()))
+        mock_tesseract.image_to_data.assert_not_called()
+
+    def test_low_confidence_falls_back(self, mock_tesseract, _):
+        words = [f"word{i}" for i in range(20)]
+        mock_tesseract.image_to_data.return_value = _tesseract_data(words, 30)
+
+        self.assertIsNone(extract_text(_screenshot()))
+
+    def test_too_few_words_falls_back(self, mock_tesseract, _):
+        mock_tesseract.image_to_data.return_value = _tesseract_data(["a", "b"], 95)
+
+        self.assertIsNone(extract_text(_screenshot()))
+
+    def test_tesseract_error_falls_back(self, mock_tesseract, _):
+        mock_tesseract.image_to_data.side_effect = RuntimeError("tesseract crashed")
+
+        self.assertIsNone(extract_text(_screenshot()))
+
+
+class TestOcrUnavailable(unittest.TestCase):
+
+    @patch('tools.image.ocr.ocr_available', return_value=False)
+    def test_disabled_without_tesseract(self, _):
+        self.assertIsNone(extract_text(_screenshot()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import io
+import os
+import sys
+
+import pytest
+from PIL import Image
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from tools.image.preprocess import prepare_for_vision, ResampleFilter
+
+
+def _encode(img, fmt, **kwargs):
+    buffer = io.BytesIO()
+    img.save(buffer, format=fmt, **kwargs)
+    return buffer.getvalue()
+
+
+def _decode(data):
+    img = Image.open(io.BytesIO(data))
+    img.load()
+    return img
+
+
+def test_large_jpeg_is_bounded():
+    data = _encode(Image.new('RGB', (4032, 3024), (200, 100, 50)), 'JPEG')
+
+    out = _decode(prepare_for_vision(data))
+
+    assert out.format == 'JPEG'
+    assert out.mode == 'RGB'
+    assert out.size == (1024, 768)
+
+
+def test_exif_orientation_is_applied():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotated 90° clockwise
+    data = _encode(Image.new('RGB', (4000, 3000)), 'JPEG', exif=exif.tobytes())
+
+    out = _decode(prepare_for_vision(data))
+
+    assert out.size == (768, 1024)
+
+
+def test_png_screenshot_with_alpha():
+    data = _encode(Image.new('RGBA', (1170, 2532), (10, 20, 30, 255)), 'PNG')
+
+    out = _decode(prepare_for_vision(data))
+
+    assert out.mode == 'RGB'
+    assert max(out.size) == 1024
+
+
+def test_palette_and_small_images_are_not_upscaled():
+    data = _encode(Image.new('P', (300, 200)), 'GIF')
+
+    out = _decode(prepare_for_vision(data))
+
+    assert out.size == (300, 200)
+    assert out.mode == 'RGB'
+
+
+@pytest.mark.parametrize('resample', list(ResampleFilter))
+def test_resample_filters(resample):
+    data = _encode(Image.new('RGB', (2048, 2048), (0, 128, 255)), 'JPEG')
+
+    out = _decode(prepare_for_vision(data, resample=resample))
+
+    assert out.size == (1024, 1024)
@@ -60,6 +60,215 @@ class TestImageProcessorNode(unittest.TestCase):
         self.assertIn("Test Caption", result["image_summary"])
         self.assertIn("test_user", result["image_summary"])
         self.assertIn("A test image description", result["image_summary"])
+
+    def test_near_duplicate_image_reuses_cached_analysis(self):
+        import io
+        import numpy as np
+        from PIL import Image
+        from tools.media import VisionResultCache
+
+        # A "meme" and a smaller, re-compressed forward of it
+        pixels = np.random.default_rng(0).integers(0, 255, size=(8, 8, 3), dtype=np.uint8)
+        original = Image.fromarray(pixels, 'RGB').resize((800, 800), Image.Resampling.NEAREST)
+        copies = []
+        for size, quality in [((800, 800), 95), ((500, 500), 60)]:
+            buffer = io.BytesIO()
+            original.resize(size).save(buffer, format='JPEG', quality=quality)
+            copies.append(buffer.getvalue())
+
+        self.node.vision_cache = VisionResultCache(enabled=True, max_distance=6)
+        self.node.extractor_service.extract.side_effect = [
+            ImageExtractionResponse(images=[data], metadata={}, platform="instagram", image_urls=[])
+            for data in copies
+        ]
+        mock_vision_response = MagicMock()
+        mock_vision_response.analysis_data = {"description": "A forwarded meme."}
+        self.node.vision_service.analyze.return_value = mock_vision_response
+
+        state: ImageProcessorState = {
+            "job_id": "job_123",
+            "url": "https://instagram.com/p/123",
+            "message_id": "msg_123",
+            "platform_hint": None,
+            "image_summary": None,
+            "metadata": None,
+            "error": None
+        }
+        first = self.node(state)
+        second = self.node(state)
+
+        self.node.vision_service.analyze.assert_called_once()
+        self.assertIn("A forwarded meme.", second["image_summary"])
+        self.assertEqual(first["image_summary"], second["image_summary"])
+
+    @patch('nodes.image_processor.measure_text_density')
+    @patch('nodes.image_processor.extract_text')
+    def test_text_heavy_image_uses_ocr(self, mock_extract_text, mock_density):
+        import io
+        from PIL import Image
+        from tools.image.types import OcrResult, TextDensity
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (400, 800), color='white').save(buffer, format='JPEG')
+        self.node.ocr_enabled = True
+        self.node.extractor_service.extract.return_value = ImageExtractionResponse(
+            images=[buffer.getvalue()], metadata={}, platform="twilio", image_urls=[]
+        )
+        density = TextDensity(text_boxes=30, coverage=0.3, background=0.8, is_text_heavy=True)
+        mock_density.return_value = density
+        mock_extract_text.return_value = OcrResult(
+            text="TOTAL $12.50\nThank you", word_count=4, confidence=93.0, density=density,
+        )
+
+        result = self.node({
+            "job_id": "job_123",
+            "url": "https://api.twilio.com/media/1",
+            "message_id": "msg_123",
+            "platform_hint": None,
+            "image_summary": None,
+            "metadata": None,
+            "error": None
+        })
+
+        self.node.vision_service.analyze.assert_not_called()
+        self.assertIn("TOTAL $12.50", result["image_summary"])
+
+    def _state(self, url="https://instagram.com/p/123"):
+        return {
+            "job_id": "job_123",
+            "url": url,
+            "message_id": "msg_123",
+            "platform_hint": None,
+            "image_summary": None,
+            "metadata": None,
+            "error": None
+        }
+
+    def test_public_images_sent_by_url(self):
+        """Public CDN images go to the vision API by URL, without being downloaded."""
+        from tools.image.types import ImageHandle
+
+        self.node.ocr_enabled = False
+        loader = MagicMock(return_value=b"never downloaded")
+        self.node.extractor_service.extract.return_value = ImageExtractionResponse(
+            images=[ImageHandle.lazy("https://cdn.example.com/a.jpg", loader, public=True)],
+            metadata={}, platform="instagram", image_urls=["https://cdn.example.com/a.jpg"]
+        )
+        mock_vision_response = MagicMock()
+        mock_vision_response.analysis_data = {"description": "A beach."}
+        self.node.vision_service.analyze.return_value = mock_vision_response
+
+        result = self.node(self._state())
+
+        loader.assert_not_called()
+        request = self.node.vision_service.analyze.call_args[0][0]
+        self.assertEqual(request.image_input, "https://cdn.example.com/a.jpg")
+        self.assertIn("A beach.", result["image_summary"])
+
+    @patch('nodes.image_processor.measure_text_density')
+    def test_public_images_downloaded_when_ocr_enabled(self, mock_density):
+        """OCR needs the bytes, so public images aren't sent by URL while it's on."""
+        import io
+        from PIL import Image
+        from tools.image.types import ImageHandle, TextDensity
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (10, 10), color='white').save(buffer, format='JPEG')
+        loader = MagicMock(return_value=buffer.getvalue())
+        self.node.ocr_enabled = True
+        mock_density.return_value = TextDensity(is_text_heavy=False)
+        self.node.extractor_service.extract.return_value = ImageExtractionResponse(
+            images=[ImageHandle.lazy("https://cdn.example.com/a.jpg", loader, public=True)],
+            metadata={}, platform="instagram", image_urls=["https://cdn.example.com/a.jpg"]
+        )
+        mock_vision_response = MagicMock()
+        mock_vision_response.analysis_data = {"description": "A beach."}
+        self.node.vision_service.analyze.return_value = mock_vision_response
+
+        self.node(self._state())
+
+        loader.assert_called_once()
+        mock_density.assert_called_once()
+        request = self.node.vision_service.analyze.call_args[0][0]
+        self.assertTrue(request.image_input.startswith("data:image/jpeg;base64,"))
+
+    def test_url_fetch_error_falls_back_to_base64(self):
+        import io
+        from PIL import Image
+        from tools.image.types import ImageHandle
+        from tools.vision.types import VisionImageFetchError
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (10, 10), color='blue').save(buffer, format='JPEG')
+        self.node.ocr_enabled = False
+        loader = MagicMock(return_value=buffer.getvalue())
+        self.node.extractor_service.extract.return_value = ImageExtractionResponse(
+            images=[ImageHandle.lazy("https://cdn.example.com/expired.jpg", loader, public=True)],
+            metadata={}, platform="instagram", image_urls=[]
+        )
+        mock_vision_response = MagicMock()
+        mock_vision_response.analysis_data = {"description": "A blue square."}
+        self.node.vision_service.analyze.side_effect = [
+            VisionImageFetchError("403 Forbidden"),
+            mock_vision_response,
+        ]
+
+        result = self.node(self._state())
+
+        loader.assert_called_once()
+        retry = self.node.vision_service.analyze.call_args_list[1][0][0]
+        self.assertTrue(retry.image_input.startswith("data:image/jpeg;base64,"))
+        self.assertIn("A blue square.", result["image_summary"])
+
+    def test_twilio_media_never_sent_by_url(self):
+        import io
+        from PIL import Image
+        from tools.image.types import ImageHandle
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (10, 10), color='green').save(buffer, format='JPEG')
+        image = ImageHandle.lazy("https://api.twilio.com/media/1", MagicMock(return_value=buffer.getvalue()), public=True)
+        self.node.extractor_service.extract.return_value = ImageExtractionResponse(
+            images=[image], metadata={}, platform="twilio", image_urls=[]
+        )
+        mock_vision_response = MagicMock()
+        mock_vision_response.analysis_data = {"description": "A green square."}
+        self.node.vision_service.analyze.return_value = mock_vision_response
+
+        self.node(self._state("https://api.twilio.com/media/1"))
+
+        request = self.node.vision_service.analyze.call_args[0][0]
+        self.assertTrue(request.image_input.startswith("data:image/jpeg;base64,"))
+
+    @patch('nodes.image_processor.measure_text_density')
+    def test_vision_profile_follows_text_density(self, mock_density):
+        """Screenshots go out at high detail; photos at the cheaper image profile."""
+        import io
+        from PIL import Image
+        from tools.image.types import TextDensity
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (10, 10), color='white').save(buffer, format='JPEG')
+        self.node.ocr_enabled = False
+        self.node.extractor_service.extract.side_effect = lambda request: ImageExtractionResponse(
+            images=[buffer.getvalue()], metadata={}, platform="twilio", image_urls=[]
+        )
+        mock_vision_response = MagicMock()
+        mock_vision_response.analysis_data = {"description": "A chat.", "text": "see you at 8"}
+        self.node.vision_service.analyze.return_value = mock_vision_response
+
+        mock_density.return_value = TextDensity(text_boxes=40, coverage=0.3, background=0.8, is_text_heavy=True)
+        result = self.node(self._state())
+        screenshot_request = self.node.vision_service.analyze.call_args[0][0]
+
+        mock_density.return_value = TextDensity()
+        self.node(self._state())
+        photo_request = self.node.vision_service.analyze.call_args[0][0]
+
+        self.assertEqual(screenshot_request.detail, "high")
+        self.assertEqual(photo_request.detail, "low")
+        self.assertIn("see you at 8", result["image_summary"])
+
     def test_graph_execution(self):
         # Import the graph factory
         from nodes.image_processor import create_image_processor_graph
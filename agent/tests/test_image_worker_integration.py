@@ -1,3 +1,4 @@
+import hashlib
 import unittest
 from unittest.mock import Mock, MagicMock, patch
 import sys
@@ -8,6 +9,11 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../s
 
 from image_worker import ImageWorker
 
+
+def _url_hash(url):
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
 class TestImageWorkerIntegration(unittest.TestCase):
     """Integration tests for ImageWorker."""
     
@@ -72,7 +78,7 @@ class TestImageWorkerIntegration(unittest.TestCase):
         # link_metadata select (simulate existing link not found)
         mock_existing = Mock()
         mock_existing.data = []
-        mock_client.table.return_value.select.return_value.eq.return_value.limit.return_value.execute.return_value = mock_existing
+        mock_client.table.return_value.select.return_value.in_.return_value.execute.return_value = mock_existing
         
         # link_metadata insert
         mock_insert = Mock()
@@ -93,9 +99,12 @@ class TestImageWorkerIntegration(unittest.TestCase):
         }
         
         # Test
-        result = worker.process_and_update(job)
+        with self.assertLogs('image_worker', level='INFO') as logs:
+            result = worker.process_and_update(job)
         
         self.assertTrue(result)
+        # CPU pool load is reported with the completed job
+        self.assertTrue(any("'queue_depth'" in line for line in logs.output))
         
         # Verify job was updated with success
         mock_client.table.assert_any_call('jobs')
@@ -146,5 +155,151 @@ class TestImageWorkerIntegration(unittest.TestCase):
         self.assertTrue(result)
         self.assertEqual(mock_graph_instance.invoke.call_count, 3)
 
+    @patch('image_worker.get_messaging_provider')
+    @patch('image_worker.create_client')
+    @patch('image_worker.NormalizerService')
+    @patch('image_worker.SummarizerService')
+    def test_album_llm_and_db_work_is_batched(self, mock_summarizer, mock_normalizer, mock_supabase, mock_messaging):
+        """An album makes one normalizer call, one summarizer call and one insert per table."""
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+        urls = [f'https://api.twilio.com/media/a{i}' for i in range(3)]
+        mock_client.table.return_value.select.return_value.in_.return_value.execute.side_effect = [
+            Mock(data=[]),  # No existing rows
+            Mock(data=[{'id': f'link-{i}', 'url_hash': _url_hash(url)} for i, url in enumerate(urls)]),
+        ]
+        mock_client.table.return_value.upsert.return_value.execute.return_value = Mock(
+            data=[{'id': f'link-{i}'} for i in range(3)]
+        )
+        mock_normalizer.return_value.normalize_batch.return_value = [None, None, None]
+        mock_summarizer.return_value.generate_summaries.return_value = ['s0', 's1', 's2']
+        
+        worker = ImageWorker()
+        worker.image_processor = MagicMock()
+        worker.image_processor.invoke.side_effect = lambda state: {
+            **state, 'image_summary': f"Summary of {state['url']}", 'metadata': {'platform': 'twilio'}
+        }
+        
+        job = {
+            'id': 'job-album',
+            'payload': {
+                'From': 'whatsapp:+1234567890',
+                'MessageSid': 'msg-album',
+                'MediaUrl0': 'https://api.twilio.com/media/a0',
+                'MediaUrl1': 'https://api.twilio.com/media/a1',
+                'MediaUrl2': 'https://api.twilio.com/media/a2'
+            }
+        }
+        
+        result = worker.process_and_update(job)
+        
+        self.assertTrue(result)
+        mock_normalizer.return_value.normalize_batch.assert_called_once()
+        self.assertEqual(len(mock_normalizer.return_value.normalize_batch.call_args[0][0]), 3)
+        mock_summarizer.return_value.generate_summaries.assert_called_once()
+        
+        upserts = mock_client.table.return_value.upsert.call_args_list
+        self.assertEqual(len(upserts), 2)  # link_metadata rows, then user_saved_links rows
+        self.assertEqual([row['ai_summary'] for row in upserts[0][0][0]], ['s0', 's1', 's2'])
+        self.assertEqual(upserts[0][1], {'on_conflict': 'url_hash', 'ignore_duplicates': True})
+        self.assertEqual([row['link_id'] for row in upserts[1][0][0]], ['link-0', 'link-1', 'link-2'])
+        mock_client.table.return_value.insert.assert_not_called()
+        
+        job_result = mock_client.table.return_value.update.call_args[0][0]['result']
+        self.assertEqual(
+            [image['url'] for image in job_result['images']],
+            ['https://api.twilio.com/media/a0', 'https://api.twilio.com/media/a1', 'https://api.twilio.com/media/a2']
+        )
+
+    @patch('image_worker.get_messaging_provider')
+    @patch('image_worker.create_client')
+    @patch('image_worker.NormalizerService')
+    @patch('image_worker.SummarizerService')
+    def test_process_and_update_duplicate_media_skips_persist(self, mock_summarizer, mock_normalizer, mock_supabase, mock_messaging):
+        """Test that content-hash duplicates reuse the existing link_metadata row."""
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+        
+        worker = ImageWorker()
+        worker.image_processor = MagicMock()
+        worker.image_processor.invoke.return_value = {
+            'image_summary': 'A receipt.',
+            'metadata': {'platform': 'twilio'},
+            'content_hash': 'abc',
+            'perceptual_hash': 42,
+            'duplicate_of': {'id': 'link-existing', 'scrape_count': 3, 'description': 'A receipt.'},
+            'error': None
+        }
+        worker._persist_results = MagicMock()
+        
+        job = {
+            'id': 'job-789',
+            'payload': {
+                'From': 'whatsapp:+1234567890',
+                'MessageSid': 'msg-789',
+                'MediaUrl0': 'https://api.twilio.com/media/dup'
+            }
+        }
+        
+        result = worker.process_and_update(job)
+        
+        self.assertTrue(result)
+        worker._persist_results.assert_not_called()
+        mock_normalizer.return_value.normalize_batch.assert_not_called()
+        mock_client.table.return_value.update.assert_any_call({
+            'scrape_count': 4,
+            'last_updated_at': 'now()'
+        })
+        insert_data = mock_client.table.return_value.upsert.call_args[0][0]
+        self.assertEqual(insert_data[0]['link_id'], 'link-existing')
+
+    @patch('image_worker.get_messaging_provider')
+    @patch('image_worker.create_client')
+    def test_already_linked_image_does_not_drop_album_links(self, mock_supabase, mock_messaging):
+        """An image the user already saved is skipped, not a failure for the whole album."""
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+        worker = ImageWorker()
+        
+        # link-1 is saved already and appears twice (content dedup)
+        worker._save_user_links(['link-0', 'link-1', None, 'link-1'], {'From': 'whatsapp:+1234567890'}, {'id': 'job'})
+        
+        upsert = mock_client.table.return_value.upsert
+        upsert.assert_called_once()
+        self.assertEqual([row['link_id'] for row in upsert.call_args[0][0]], ['link-0', 'link-1'])
+        self.assertEqual(upsert.call_args[1], {
+            'on_conflict': 'user_id,link_id,source_channel_id', 'ignore_duplicates': True
+        })
+        mock_client.table.assert_called_with('user_saved_links')
+
+    @patch('image_worker.get_messaging_provider')
+    @patch('image_worker.create_client')
+    @patch('image_worker.NormalizerService')
+    @patch('image_worker.SummarizerService')
+    def test_url_hash_conflict_keeps_other_rows(self, mock_summarizer, mock_normalizer, mock_supabase, mock_messaging):
+        """A row inserted concurrently by another worker is linked, and the rest still persist."""
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+        urls = ['https://api.twilio.com/media/b0', 'https://api.twilio.com/media/b1']
+        mock_client.table.return_value.select.return_value.in_.return_value.execute.side_effect = [
+            Mock(data=[]),
+            Mock(data=[
+                {'id': 'link-new', 'url_hash': _url_hash(urls[0])},
+                {'id': 'link-other-worker', 'url_hash': _url_hash(urls[1])},
+            ]),
+        ]
+        # Only the first row is inserted; the second conflicted on url_hash
+        mock_client.table.return_value.upsert.return_value.execute.return_value = Mock(data=[{'id': 'link-new'}])
+        mock_normalizer.return_value.normalize_batch.return_value = [None, None]
+        mock_summarizer.return_value.generate_summaries.return_value = ['s0', 's1']
+        worker = ImageWorker()
+        
+        link_ids = worker._persist_results([
+            {'url': url, 'image_summary': 'An image', 'metadata': {}, 'content_hash': None, 'perceptual_hash': None}
+            for url in urls
+        ])
+        
+        self.assertEqual(link_ids, ['link-new', 'link-other-worker'])
+
 if __name__ == '__main__':
     unittest.main()
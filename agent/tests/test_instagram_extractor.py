@@ -7,7 +7,9 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
 from tools.image.extractors.instagram import InstagramExtractor
-from tools.image.types import ImageExtractionResponse, ImageExtractionError, ProxyError
+import instaloader
+
+from tools.image.types import ImageExtractionResponse, ImageExtractionError, ProxyError, RateLimitError
 
 
 class TestInstagramExtractor(unittest.TestCase):
@@ -36,7 +38,7 @@ class TestInstagramExtractor(unittest.TestCase):
         self.assertIsNone(shortcode)
     
     @patch('tools.image.extractors.instagram.instaloader.Post')
-    @patch('tools.image.extractors.instagram.requests.get')
+    @patch('tools.media.fetcher.requests.Session.get')
     def test_single_image_extraction(self, mock_requests_get, mock_post_class):
         """Test extraction of a single image post."""
         # Mock post
@@ -65,12 +67,12 @@ class TestInstagramExtractor(unittest.TestCase):
         self.assertIsInstance(result, ImageExtractionResponse)
         self.assertEqual(result.platform, 'instagram')
         self.assertEqual(len(result.images), 1)
-        self.assertEqual(result.images[0], b"fake_image_data")
+        self.assertEqual(result.images[0].fetch(), b"fake_image_data")
         self.assertEqual(result.metadata['caption'], "Test caption")
         self.assertEqual(result.metadata['author'], "testuser")
     
     @patch('tools.image.extractors.instagram.instaloader.Post')
-    @patch('tools.image.extractors.instagram.requests.get')
+    @patch('tools.media.fetcher.requests.Session.get')
     def test_carousel_extraction(self, mock_requests_get, mock_post_class):
         """Test extraction of a carousel post with multiple images."""
         # Mock carousel post
@@ -108,6 +110,36 @@ class TestInstagramExtractor(unittest.TestCase):
         self.assertEqual(len(result.images), 2)
         self.assertEqual(len(result.image_urls), 2)
     
+    @patch('tools.image.extractors.instagram.instaloader.Post')
+    @patch('tools.media.fetcher.requests.Session.get')
+    def test_carousel_images_download_on_demand(self, mock_requests_get, mock_post_class):
+        """Only the images that are loaded get downloaded."""
+        mock_post = MagicMock()
+        mock_post.typename = 'GraphSidecar'
+        mock_post.date_utc = None
+        nodes = []
+        for i in range(8):
+            node = MagicMock()
+            node.is_video = False
+            node.display_url = f"https://example.com/img{i}.jpg"
+            nodes.append(node)
+        mock_post.get_sidecar_nodes.return_value = nodes
+        mock_post_class.from_shortcode.return_value = mock_post
+        
+        mock_response = MagicMock()
+        mock_response.content = b"fake_image_data"
+        mock_requests_get.return_value = mock_response
+        
+        result = self.extractor.extract("https://www.instagram.com/p/CAROUSEL/")
+        self.assertEqual(len(result.images), 8)
+        mock_requests_get.assert_not_called()
+        
+        loaded = result.load(limit=5)
+        
+        self.assertEqual(len(loaded), 5)
+        self.assertEqual(mock_requests_get.call_count, 5)
+        self.assertFalse(result.images[5].is_loaded)
+    
     @patch('tools.image.extractors.instagram.instaloader.Post')
     def test_proxy_rotation_on_failure(self, mock_post_class):
         """Test that proxy rotation occurs on connection failures."""
@@ -122,5 +154,67 @@ class TestInstagramExtractor(unittest.TestCase):
         self.assertGreater(self.extractor.proxy_manager.rotate_proxy.call_count, 0)
 
 
+    @patch('tools.image.extractors.instagram.instaloader.Post')
+    def test_repeated_saves_reuse_cached_post(self, mock_post_class):
+        """A post is looked up on Instagram once, then served from the cache."""
+        mock_post = MagicMock()
+        mock_post.typename = 'GraphImage'
+        mock_post.is_video = False
+        mock_post.url = "https://example.com/image.jpg"
+        mock_post.date_utc = None
+        mock_post_class.from_shortcode.return_value = mock_post
+        
+        first = self.extractor.extract("https://www.instagram.com/p/ABC123/")
+        second = self.extractor.extract("https://www.instagram.com/reel/ABC123/")
+        
+        self.assertEqual(mock_post_class.from_shortcode.call_count, 1)
+        self.assertEqual(first.image_urls, second.image_urls)
+        self.assertEqual(len(second.images), 1)
+    
+    @patch('tools.image.extractors.instagram.instaloader.Post')
+    def test_throttled_session_cools_down(self, mock_post_class):
+        """A 429 parks that session and the lookup moves to another one."""
+        mock_post = MagicMock()
+        mock_post.typename = 'GraphImage'
+        mock_post.is_video = False
+        mock_post.url = "https://example.com/image.jpg"
+        mock_post.date_utc = None
+        mock_post_class.from_shortcode.side_effect = [
+            instaloader.TooManyRequestsException("429 Too Many Requests"),
+            mock_post,
+        ]
+        
+        result = self.extractor.extract("https://www.instagram.com/p/ABC123/")
+        
+        self.assertEqual(len(result.images), 1)
+        self.assertEqual(self.extractor.pool.available(), len(self.extractor.pool.sessions) - 1)
+        first_context = mock_post_class.from_shortcode.call_args_list[0][0][0]
+        second_context = mock_post_class.from_shortcode.call_args_list[1][0][0]
+        self.assertIsNot(first_context, second_context)
+        self.extractor.proxy_manager.rotate_proxy.assert_not_called()
+    
+    @patch('tools.image.extractors.instagram.instaloader.Post')
+    def test_all_sessions_throttled_fails_fast(self, mock_post_class):
+        """When every session is blocked, extraction stops instead of burning retries."""
+        mock_post_class.from_shortcode.side_effect = instaloader.ConnectionException(
+            "JSON Query to graphql/query: 401 Unauthorized")
+        
+        with self.assertRaises(RateLimitError):
+            self.extractor.extract("https://www.instagram.com/p/BLOCKED/")
+        
+        self.assertEqual(mock_post_class.from_shortcode.call_count, len(self.extractor.pool.sessions))
+        self.assertEqual(self.extractor.pool.available(), 0)
+    
+    @patch('tools.image.extractors.instagram.instaloader.Post')
+    def test_post_not_found(self, mock_post_class):
+        """A missing post is not retried."""
+        mock_post_class.from_shortcode.side_effect = instaloader.QueryReturnedNotFoundException("404")
+        
+        with self.assertRaises(ImageExtractionError):
+            self.extractor.extract("https://www.instagram.com/p/GONE/")
+        
+        self.assertEqual(mock_post_class.from_shortcode.call_count, 1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,187 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import threading
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import instaloader
+
+from tools.image.extractors.instagram_session import (
+    InstagramPostCache,
+    InstaloaderPool,
+    is_throttled,
+    throttle_wait,
+    ContextThrottled,
+)
+from tools.image.types import RateLimitError
+
+
+class TestInstaloaderPool(unittest.TestCase):
+
+    def make_pool(self, **kwargs):
+        kwargs.setdefault('size', 2)
+        kwargs.setdefault('min_interval', 0)
+        kwargs.setdefault('cooldown', 60)
+        return InstaloaderPool(loader_factory=MagicMock, **kwargs)
+
+    def test_paces_requests_per_session(self):
+        """A session is not reused before its minimum interval has passed."""
+        pool = self.make_pool(size=1, min_interval=0.2)
+
+        with pool.acquire():
+            pass
+        start = time.monotonic()
+        with pool.acquire():
+            elapsed = time.monotonic() - start
+
+        self.assertGreaterEqual(elapsed, 0.15)
+
+    def test_prefers_rested_session(self):
+        """The session that can make a request soonest is handed out."""
+        pool = self.make_pool(min_interval=10)
+
+        with pool.acquire() as first:
+            pass
+        with pool.acquire() as second:
+            pass
+
+        self.assertIsNot(first, second)
+
+    def test_cooling_session_skipped(self):
+        pool = self.make_pool()
+        with pool.acquire() as session:
+            pool.cool_down(session)
+
+        for _ in range(3):
+            with pool.acquire() as other:
+                self.assertIsNot(other, session)
+        self.assertEqual(pool.available(), 1)
+
+    def test_all_cooling_raises(self):
+        pool = self.make_pool()
+        for session in pool.sessions:
+            pool.cool_down(session)
+
+        with self.assertRaises(RateLimitError):
+            with pool.acquire():
+                pass
+
+    def test_cool_down_expires(self):
+        pool = self.make_pool(size=1)
+        with pool.acquire() as session:
+            pool.cool_down(session, 0.05)
+        time.sleep(0.1)
+
+        with pool.acquire() as again:
+            self.assertIs(again, session)
+
+    def test_waits_for_busy_session(self):
+        """With every session in use, callers wait for one to be released."""
+        pool = self.make_pool(size=1)
+        acquired = threading.Event()
+
+        def hold():
+            with pool.acquire():
+                acquired.set()
+                time.sleep(0.1)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        acquired.wait()
+        with pool.acquire() as session:
+            self.assertTrue(session.in_use)
+        holder.join()
+
+
+class TestThrottleDetection(unittest.TestCase):
+
+    def test_rate_limit_errors(self):
+        self.assertTrue(is_throttled(instaloader.TooManyRequestsException("429")))
+        self.assertTrue(is_throttled(instaloader.LoginRequiredException("login")))
+        self.assertTrue(is_throttled(instaloader.ConnectionException("JSON Query: 401 Unauthorized")))
+
+    def test_wrapped_rate_limit(self):
+        """Instaloader re-raises a 429 as a plain ConnectionException on the last attempt."""
+        try:
+            try:
+                raise ContextThrottled(120)
+            except ContextThrottled as err:
+                raise instaloader.ConnectionException("JSON Query failed") from err
+        except instaloader.ConnectionException as wrapped:
+            self.assertTrue(is_throttled(wrapped))
+            self.assertEqual(throttle_wait(wrapped), 120)
+
+    def test_other_errors(self):
+        self.assertFalse(is_throttled(instaloader.ConnectionException("Connection reset")))
+        self.assertFalse(is_throttled(ValueError("bad")))
+        self.assertIsNone(throttle_wait(instaloader.TooManyRequestsException("429")))
+
+
+class TestInstagramPostCache(unittest.TestCase):
+
+    def test_caches_post(self):
+        cache = InstagramPostCache(ttl=60)
+        load = MagicMock(return_value={'image_urls': ['u']})
+
+        cache.get_or_load('ABC', load)
+        result = cache.get_or_load('ABC', load)
+
+        self.assertEqual(result, {'image_urls': ['u']})
+        load.assert_called_once()
+
+    def test_expired_entry_reloaded(self):
+        cache = InstagramPostCache(ttl=0.05)
+        load = MagicMock(return_value={'image_urls': ['u']})
+
+        cache.get_or_load('ABC', load)
+        time.sleep(0.1)
+        cache.get_or_load('ABC', load)
+
+        self.assertEqual(load.call_count, 2)
+
+    def test_errors_not_cached(self):
+        cache = InstagramPostCache(ttl=60)
+        load = MagicMock(side_effect=[RuntimeError("blocked"), {'image_urls': ['u']}])
+
+        with self.assertRaises(RuntimeError):
+            cache.get_or_load('ABC', load)
+        self.assertEqual(cache.get_or_load('ABC', load), {'image_urls': ['u']})
+
+    def test_evicts_oldest(self):
+        cache = InstagramPostCache(ttl=60, max_entries=2)
+        for shortcode in ('A', 'B', 'C'):
+            cache.put(shortcode, {'shortcode': shortcode})
+
+        self.assertIsNone(cache.get('A'))
+        self.assertIsNotNone(cache.get('C'))
+
+    def test_concurrent_lookups_coalesce(self):
+        """Concurrent saves of one post make a single Instagram lookup."""
+        cache = InstagramPostCache(ttl=60)
+        calls = []
+
+        def load():
+            calls.append(1)
+            time.sleep(0.1)
+            return {'image_urls': ['u']}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_load('ABC', load)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
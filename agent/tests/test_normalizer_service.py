@@ -59,5 +59,41 @@ class TestNormalizerService(unittest.TestCase):
 
         self.assertIsNone(result)
 
+    def test_normalize_batch_single_call(self):
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = '''
+        {"items": [
+            {"category": "Food", "price_range": "$$", "tags": ["Sushi"]},
+            {"category": "Travel", "price_range": null, "tags": ["Kyoto"]}
+        ]}
+        '''
+        self.service.client.chat.completions.create.return_value = mock_response
+
+        requests = [
+            NormalizerRequest(title="Sushi Place", source_url="http://example.com/1"),
+            NormalizerRequest(title="Kyoto Trip", source_url="http://example.com/2"),
+        ]
+        results = self.service.normalize_batch(requests)
+
+        self.service.client.chat.completions.create.assert_called_once()
+        self.assertEqual([r.category for r in results], [CategoryEnum.FOOD, CategoryEnum.TRAVEL])
+
+    def test_normalize_batch_falls_back_on_count_mismatch(self):
+        batch_response = MagicMock()
+        batch_response.choices[0].message.content = '{"items": [{"category": "Food", "tags": ["Sushi"]}]}'
+        single_response = MagicMock()
+        single_response.choices[0].message.content = '{"category": "Food", "tags": ["Sushi"]}'
+        self.service.client.chat.completions.create.side_effect = [batch_response, single_response, single_response]
+
+        requests = [
+            NormalizerRequest(title="A", source_url="http://example.com/1"),
+            NormalizerRequest(title="B", source_url="http://example.com/2"),
+        ]
+        results = self.service.normalize_batch(requests)
+
+        self.assertEqual(self.service.client.chat.completions.create.call_count, 3)
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(r.category == CategoryEnum.FOOD for r in results))
+
 if __name__ == '__main__':
     unittest.main()
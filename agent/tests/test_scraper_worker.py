@@ -3,7 +3,7 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, ANY
 from tools.scraper.types import ScraperResponse, ContentType, ExtractionStrategy
 
 # We mock env vars before importing ScraperWorker
@@ -34,19 +34,23 @@ def test_process_and_update_video_success(mock_downloader_cls, mock_video_svc_cl
     mock_hash.return_value.hexdigest.return_value = 'test_hash'
     mock_worker.supabase.table().select().eq().limit().execute.return_value.data = []  # No existing link
     
-    mock_worker.scraper_service.scrape.return_value = MagicMock(
+    info = {'id': 'vid', 'duration': 60.0, 'formats': []}
+    mock_worker.scraper_service.scrape.return_value = ScraperResponse(
         title="Test Video",
         description="desc",
         content_type=ContentType.VIDEO,
         platform="youtube",
         extraction_strategy=ExtractionStrategy.YTDLP,
-        raw_url="http://test.com/vid"
+        raw_url="http://test.com/vid",
+        transcript="hello and welcome to the channel",
+        duration=60,
+        extractor_info=info
     )
     
     mock_worker.normalizer_service.normalize.return_value = MagicMock(
-        category=Category.ENTERTAINMENT,
+        category=MagicMock(value="entertainment"),
         tags=["fun"],
-        price_range=PriceRange.UNKNOWN
+        price_range=MagicMock(value="unknown")
     )
     
     mock_worker.summarizer_service.generate_summary.return_value = "Text summary"
@@ -58,16 +62,23 @@ def test_process_and_update_video_success(mock_downloader_cls, mock_video_svc_cl
     mock_vs = mock_video_svc_cls.return_value
     mock_vs.process_video.return_value.summary = "Visual summary"
     
-    # Mock OS unlinking
-    with patch('os.path.exists', return_value=True), patch('os.unlink') as mock_unlink:
-        
-        job = {'id': 'job1', 'payload': {'Body': 'http://test.com/vid', 'From': '123'}}
-        
-        mock_worker.process_and_update(job)
-        
-        mock_dl.download.assert_called_once_with('http://test.com/vid')
-        mock_vs.process_video.assert_called_once()
-        mock_unlink.assert_called_once_with('/tmp/fake_video.mp4')
+    job = {'id': 'job1', 'payload': {'Body': 'http://test.com/vid', 'From': '123'}}
+    
+    # A 60s video plans 5 frames; the transcript clamps that to 2
+    with patch.dict('os.environ', {'TRANSCRIPT_VISION_FRAMES': '2', 'VIDEO_FRAMES_MAX': '8'}):
+        result = mock_worker.process_and_update(job)
+    
+    assert result is True
+    # The scrape's yt-dlp info is reused and the download lands in the job's scratch directory
+    mock_dl.download.assert_called_once_with('http://test.com/vid', info=info, scratch=ANY)
+    assert mock_video_svc_cls.call_args.kwargs['num_frames'] == 2
+    vid_req = mock_vs.process_video.call_args[0][0]
+    assert vid_req.video_path == '/tmp/fake_video.mp4'
+    assert vid_req.duration_hint == 60
+    link_insert = next(
+        c[0][0] for c in mock_worker.supabase.table().insert.call_args_list if 'ai_summary' in c[0][0]
+    )
+    assert link_insert['ai_summary'] == "Text summary\n\nVisual Analysis: Visual summary"
 
 
 @patch('scraper_worker.hashlib.sha256')
@@ -88,6 +99,9 @@ def test_process_and_update_video_fallback(mock_downloader_cls, mock_hash, mock_
         extraction_strategy = ExtractionStrategy.YTDLP
         raw_url = "http://test.com/vid"
         visual_summary = None
+        transcript = None
+        duration = 30
+        extractor_info = None
 
     mock_worker.scraper_service.scrape.return_value = MockMetadata()
     mock_worker.normalizer_service.normalize.return_value = MagicMock(
@@ -107,8 +121,126 @@ def test_process_and_update_video_fallback(mock_downloader_cls, mock_hash, mock_
     assert result is True  # Should succeed, just with warning added
     
     # Verify the fallback warning was added to AI summary
-    mock_worker.supabase.table().insert.assert_called()
-    insert_call = mock_worker.supabase.table().insert.call_args[0][0]
+    insert_call = next(
+        c[0][0] for c in mock_worker.supabase.table().insert.call_args_list if 'ai_summary' in c[0][0]
+    )
     
     assert "Text summary" in insert_call['ai_summary']
     assert "⚠️ Visual extraction failed or was blocked by the platform." in insert_call['ai_summary']
+
+
+@patch('scraper_worker.hashlib.sha256')
+@patch('tools.video.downloader.SocialVideoDownloader')
+def test_process_and_update_bad_frame_config_keeps_text(mock_downloader_cls, mock_hash, mock_worker):
+    """Test that an unparseable frame budget only drops the visual analysis, not the job."""
+    mock_hash.return_value.hexdigest.return_value = 'test_hash'
+    mock_worker.supabase.table().select().eq().limit().execute.return_value.data = []
+
+    mock_worker.scraper_service.scrape.return_value = ScraperResponse(
+        title="Test Video",
+        content_type=ContentType.VIDEO,
+        platform="youtube",
+        extraction_strategy=ExtractionStrategy.YTDLP,
+        raw_url="http://test.com/vid",
+        transcript="hello and welcome to the channel",
+        duration=60
+    )
+    mock_worker.normalizer_service.normalize.return_value = None
+    mock_worker.summarizer_service.generate_summary.return_value = "Text summary"
+
+    job = {'id': 'job5', 'payload': {'Body': 'http://test.com/vid', 'From': '123'}}
+
+    with patch.dict('os.environ', {'TRANSCRIPT_VISION_FRAMES': 'two'}):
+        result = mock_worker.process_and_update(job)
+
+    assert result is True
+    mock_downloader_cls.return_value.download.assert_not_called()
+    link_insert = next(
+        c[0][0] for c in mock_worker.supabase.table().insert.call_args_list if 'ai_summary' in c[0][0]
+    )
+    assert link_insert['ai_summary'].startswith("Text summary")
+
+
+@patch('scraper_worker.hashlib.sha256')
+@patch('tools.video.downloader.SocialVideoDownloader')
+def test_process_and_update_transcript_skips_visual(mock_downloader_cls, mock_hash, mock_worker):
+    """Test that a caption transcript replaces the video download and frame analysis."""
+    mock_hash.return_value.hexdigest.return_value = 'test_hash'
+    mock_worker.supabase.table().select().eq().limit().execute.return_value.data = []
+
+    mock_worker.scraper_service.scrape.return_value = ScraperResponse(
+        title="Test Video",
+        description="desc",
+        content_type=ContentType.VIDEO,
+        platform="youtube",
+        extraction_strategy=ExtractionStrategy.YTDLP,
+        raw_url="http://test.com/vid",
+        transcript="hello and welcome to the channel"
+    )
+    mock_worker.normalizer_service.normalize.return_value = None
+    mock_worker.summarizer_service.generate_summary.return_value = "Text summary"
+
+    job = {'id': 'job3', 'payload': {'Body': 'http://test.com/vid', 'From': '123'}}
+
+    with patch.dict('os.environ', {'TRANSCRIPT_VISION_FRAMES': '0'}):
+        result = mock_worker.process_and_update(job)
+
+    assert result is True
+    mock_downloader_cls.return_value.download.assert_not_called()
+
+    sum_req = mock_worker.summarizer_service.generate_summary.call_args[0][0]
+    assert sum_req.transcript == "hello and welcome to the channel"
+    norm_req = mock_worker.normalizer_service.normalize.call_args[0][0]
+    assert norm_req.raw_content == "hello and welcome to the channel"
+
+
+@patch('scraper_worker.hashlib.sha256')
+@patch('tools.video.service.VideoProcessingService')
+@patch('tools.video.downloader.SocialVideoDownloader')
+def test_process_and_update_youtube_api_uses_storyboards(mock_downloader_cls, mock_video_svc_cls, mock_hash, mock_worker):
+    """Test that the yt-dlp info from the YouTube Data API path reaches the storyboard fast path."""
+    from tools.scraper.service import ScraperService
+    from tools.video.frame_sources import StoryboardFrameSource
+
+    mock_hash.return_value.hexdigest.return_value = 'test_hash'
+    mock_worker.supabase.table().select().eq().limit().execute.return_value.data = []
+
+    with patch('tools.scraper.service.ProxyManager'):
+        scraper_service = ScraperService()
+    scraper_service.fetch_captions = True
+    scraper_service.youtube_api_extractor.extract = MagicMock(return_value=ScraperResponse(
+        title="Test Video",
+        content_type=ContentType.VIDEO,
+        platform="youtube",
+        extraction_strategy=ExtractionStrategy.YTDLP,
+        raw_url="https://www.youtube.com/watch?v=abc",
+        duration=8,
+    ))
+    info = {
+        'duration': 8.0,
+        'formats': [{
+            'format_id': 'sb0', 'format_note': 'storyboard', 'rows': 2, 'columns': 2,
+            'width': 16, 'height': 8, 'fps': 1.0,
+            'fragments': [{'url': 'https://i.ytimg.com/sb/0', 'duration': 8.0}],
+        }],
+    }
+    scraper_service.ytdlp_extractor.fetch_transcript = MagicMock(return_value=(None, info))
+    mock_worker.scraper_service = scraper_service
+    mock_worker.normalizer_service.normalize.return_value = None
+    mock_worker.summarizer_service.generate_summary.return_value = "Text summary"
+    mock_video_svc_cls.return_value.process_source.return_value.summary = "Storyboard summary"
+
+    job = {'id': 'job4', 'payload': {'Body': 'https://www.youtube.com/watch?v=abc', 'From': '123'}}
+
+    with patch.dict('os.environ', {'YOUTUBE_API_KEY': 'key', 'VIDEO_USE_STORYBOARDS': 'true'}):
+        result = mock_worker.process_and_update(job)
+
+    assert result is True
+    source = mock_video_svc_cls.return_value.process_source.call_args[0][0]
+    assert isinstance(source, StoryboardFrameSource)
+    assert source.storyboard['format_id'] == 'sb0'
+    mock_downloader_cls.return_value.download.assert_not_called()
+    link_insert = next(
+        c[0][0] for c in mock_worker.supabase.table().insert.call_args_list if 'ai_summary' in c[0][0]
+    )
+    assert "Storyboard summary" in link_insert['ai_summary']
@@ -71,5 +71,20 @@ class TestSummarizerService(unittest.TestCase):
         # Should be truncated to 2 sentences
         self.assertEqual(result, "Sentence one. Sentence two.")
 
+    def test_generate_summaries_single_call(self):
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = '{"items": [{"summary": "First."}, {"summary": "Second."}]}'
+        self.service.client.chat.completions.create.return_value = mock_response
+
+        requests = [
+            SummarizerRequest(title="One"),
+            SummarizerRequest(),  # nothing to summarize: skipped
+            SummarizerRequest(title="Two"),
+        ]
+        results = self.service.generate_summaries(requests)
+
+        self.service.client.chat.completions.create.assert_called_once()
+        self.assertEqual(results, ["First.", None, "Second."])
+
 if __name__ == '__main__':
     unittest.main()
@@ -18,7 +18,7 @@ class TestTikTokExtractor(unittest.TestCase):
         self.extractor.proxy_manager.get_proxy_url.return_value = "http://proxy:8080"
     
     @patch('tools.image.extractors.tiktok.yt_dlp.YoutubeDL')
-    @patch('tools.image.extractors.tiktok.requests.get')
+    @patch('tools.media.fetcher.requests.Session.get')
     def test_slideshow_extraction(self, mock_requests_get, mock_ytdl_class):
         """Test extraction of TikTok slideshow."""
         # Mock yt-dlp response
@@ -53,7 +53,7 @@ class TestTikTokExtractor(unittest.TestCase):
         self.assertEqual(result.metadata['author'], 'testuser')
     
     @patch('tools.image.extractors.tiktok.yt_dlp.YoutubeDL')
-    @patch('tools.image.extractors.tiktok.requests.get')
+    @patch('tools.media.fetcher.requests.Session.get')
     def test_entries_extraction(self, mock_requests_get, mock_ytdl_class):
         """Test extraction when yt-dlp returns entries."""
         # Mock yt-dlp response with entries
@@ -1,6 +1,5 @@
 import unittest
 from unittest.mock import MagicMock, patch
-import httpx
 import sys
 import os
 
@@ -16,7 +15,7 @@ class TestImageDownloader(unittest.TestCase):
     def setUp(self):
         self.downloader = ImageDownloader()
 
-    @patch('httpx.Client.get')
+    @patch('tools.media.fetcher.requests.Session.get')
     def test_download_no_auth(self, mock_get):
         # Mock response
         mock_response = MagicMock()
@@ -32,7 +31,7 @@ class TestImageDownloader(unittest.TestCase):
         args, kwargs = mock_get.call_args
         self.assertIsNone(kwargs.get('auth'))
 
-    @patch('httpx.Client.get')
+    @patch('tools.media.fetcher.requests.Session.get')
     def test_download_with_twilio_auth(self, mock_get):
         # Set env vars for testing
         with patch.dict(os.environ, {'TWILIO_ACCOUNT_SID': 'AC123', 'TWILIO_AUTH_TOKEN': 'secret'}):
@@ -64,7 +63,7 @@ class TestTwilioExtractor(unittest.TestCase):
         response = self.extractor.extract(url)
         
         self.assertIsInstance(response, ImageExtractionResponse)
-        self.assertEqual(response.images[0], b"image_bytes")
+        self.assertEqual(response.images[0].fetch(), b"image_bytes")
         self.assertEqual(response.platform, "twilio")
         self.assertEqual(response.metadata["platform"], "twilio")
 
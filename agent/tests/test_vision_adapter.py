@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+import httpx
+import openai
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from tools.vision.providers.openrouter import OpenRouterVisionAdapter
+from tools.vision.types import VisionRequest, VisionProviderError, VisionImageFetchError, VisionTruncatedError
+from tools.vision.profiles import VisionProfileName, get_profile
+
+
+def _status_error(status: int) -> openai.APIStatusError:
+    response = httpx.Response(status, request=httpx.Request("POST", "https://openrouter.ai/api/v1/chat/completions"))
+    return openai.APIStatusError("Failed to download image", response=response, body=None)
+
+
+class TestOpenRouterImageInput(unittest.TestCase):
+
+    def setUp(self):
+        self.adapter = OpenRouterVisionAdapter(api_key="test")
+        self.adapter.client = MagicMock()
+
+    def test_url_rejected_by_provider(self):
+        """A 4xx for an image passed by URL is reported as a fetch error."""
+        self.adapter.client.chat.completions.create.side_effect = _status_error(400)
+
+        with self.assertRaises(VisionImageFetchError):
+            self.adapter.analyze(VisionRequest(image_input="https://cdn.example.com/a.jpg", prompt="Describe"))
+
+    def test_rate_limit_is_not_a_fetch_error(self):
+        self.adapter.client.chat.completions.create.side_effect = _status_error(429)
+
+        with self.assertRaises(VisionProviderError):
+            self.adapter.analyze(VisionRequest(image_input="https://cdn.example.com/a.jpg", prompt="Describe"))
+
+    def test_inline_image_errors_unchanged(self):
+        self.adapter.client.chat.completions.create.side_effect = _status_error(400)
+
+        with self.assertRaises(VisionProviderError):
+            self.adapter.analyze(VisionRequest(image_input="data:image/jpeg;base64,AAAA", prompt="Describe"))
+
+
+class TestVisionProfiles(unittest.TestCase):
+
+    def setUp(self):
+        self.adapter = OpenRouterVisionAdapter(api_key="test")
+        self.adapter.client = MagicMock()
+        response = self.adapter.client.chat.completions.create.return_value
+        response.choices[0].message.content = '{"description": "A frame."}'
+        response.usage = None
+        response.model_dump.return_value = {}
+
+    def _sent(self):
+        kwargs = self.adapter.client.chat.completions.create.call_args.kwargs
+        user_content = kwargs["messages"][1]["content"]
+        return kwargs, user_content[0]["text"], user_content[1]["image_url"]
+
+    def test_profile_sets_detail_tokens_and_schema(self):
+        request = get_profile(VisionProfileName.VIDEO_FRAME).request("data:image/jpeg;base64,AAAA", "Describe")
+
+        self.adapter.analyze(request)
+
+        kwargs, prompt_text, image_url = self._sent()
+        self.assertEqual(image_url["detail"], "low")
+        self.assertEqual(kwargs["max_tokens"], 150)
+        self.assertIn("response_schema", prompt_text)
+
+    def test_default_profile_leaves_provider_defaults(self):
+        request = get_profile(VisionProfileName.DEFAULT).request("data:image/jpeg;base64,AAAA", "Describe")
+
+        self.adapter.analyze(request)
+
+        kwargs, prompt_text, image_url = self._sent()
+        self.assertNotIn("detail", image_url)
+        self.assertNotIn("max_tokens", kwargs)
+        self.assertNotIn("response_schema", prompt_text)
+
+    def _truncated_response(self):
+        response = MagicMock()
+        response.choices[0].message.content = '{"description": "A chat", "text": "Hello, how are'
+        response.choices[0].finish_reason = "length"
+        return response
+
+    def test_truncated_response_retried_with_larger_cap(self):
+        complete = self.adapter.client.chat.completions.create.return_value
+        complete.choices[0].finish_reason = "stop"
+        self.adapter.client.chat.completions.create.side_effect = [self._truncated_response(), complete]
+        request = get_profile(VisionProfileName.SCREENSHOT).request("data:image/jpeg;base64,AAAA", "Read")
+
+        response = self.adapter.analyze(request)
+
+        self.assertEqual(response.analysis_data, {"description": "A frame."})
+        calls = self.adapter.client.chat.completions.create.call_args_list
+        self.assertEqual([c.kwargs["max_tokens"] for c in calls], [700, 1400])
+
+    def test_truncated_twice_is_not_retryable(self):
+        self.adapter.client.chat.completions.create.side_effect = [
+            self._truncated_response(), self._truncated_response()
+        ]
+        request = get_profile(VisionProfileName.SCREENSHOT).request("data:image/jpeg;base64,AAAA", "Read")
+
+        with self.assertRaises(VisionTruncatedError):
+            self.adapter.analyze(request)
+        # Not a VisionProviderError, so VisionService doesn't retry it with the same cap
+        self.assertFalse(issubclass(VisionTruncatedError, VisionProviderError))
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            get_profile("poster")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,8 +17,9 @@ class TestYouTubeCommunityExtractor(unittest.TestCase):
         self.extractor.proxy_manager = MagicMock()
         self.extractor.proxy_manager.get_proxy_url.return_value = "http://proxy:8080"
     
+    @patch('tools.media.fetcher.requests.Session.get')
     @patch('tools.image.extractors.youtube.requests.get')
-    def test_og_image_extraction(self, mock_requests_get):
+    def test_og_image_extraction(self, mock_requests_get, mock_fetch_get):
         """Test extraction using Open Graph meta tags."""
         # Mock HTML response
         html_content = """
@@ -36,6 +37,7 @@ class TestYouTubeCommunityExtractor(unittest.TestCase):
         mock_response.raise_for_status = MagicMock()
         mock_response.content = b"fake_image_data"
         mock_requests_get.return_value = mock_response
+        mock_fetch_get.return_value = mock_response
         
         # Extract
         result = self.extractor.extract("https://www.youtube.com/post/Ugkx123")
@@ -46,8 +48,9 @@ class TestYouTubeCommunityExtractor(unittest.TestCase):
         self.assertGreater(len(result.images), 0)
         self.assertIn('https://example.com/community-image.jpg', result.image_urls)
     
+    @patch('tools.media.fetcher.requests.Session.get')
     @patch('tools.image.extractors.youtube.requests.get')
-    def test_json_ld_extraction(self, mock_requests_get):
+    def test_json_ld_extraction(self, mock_requests_get, mock_fetch_get):
         """Test extraction using JSON-LD structured data."""
         # Mock HTML with JSON-LD
         html_content = """
@@ -69,6 +72,7 @@ class TestYouTubeCommunityExtractor(unittest.TestCase):
         mock_response.raise_for_status = MagicMock()
         mock_response.content = b"fake_image_data"
         mock_requests_get.return_value = mock_response
+        mock_fetch_get.return_value = mock_response
         
         # Extract
         result = self.extractor.extract("https://www.youtube.com/post/Ugkx456")
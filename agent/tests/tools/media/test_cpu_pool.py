@@ -0,0 +1,56 @@
+import operator
+import os
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pytest
+
+from tools.media.cpu_pool import CpuPool
+
+
+def _pid():
+    return os.getpid()
+
+
+def test_disabled_pool_runs_inline():
+    pool = CpuPool(max_workers=0)
+    
+    assert not pool.enabled
+    assert pool.run(_pid) == os.getpid()
+
+
+def test_small_payload_runs_inline():
+    pool = CpuPool(max_workers=2, min_offload_bytes=1024)
+    
+    assert pool.run(_pid, payload_bytes=10) == os.getpid()
+    # No worker processes were started
+    assert pool._executor is None
+
+
+def test_runs_in_worker_process():
+    pool = CpuPool(max_workers=1, min_offload_bytes=0)
+    try:
+        assert pool.run(operator.mul, 6, 7, payload_bytes=1) == 42
+        assert pool.run(os.getpid) != os.getpid()
+        assert pool.stats()['workers'] == 1
+        assert pool.queue_depth == 0
+    finally:
+        pool.shutdown()
+
+
+def test_worker_exception_is_reraised():
+    pool = CpuPool(max_workers=1, min_offload_bytes=0)
+    try:
+        with pytest.raises(ValueError):
+            pool.run(int, 'not a number')
+    finally:
+        pool.shutdown()
+
+
+def test_timeout_stops_waiting():
+    pool = CpuPool(max_workers=1, min_offload_bytes=0)
+    try:
+        with pytest.raises(FutureTimeoutError):
+            pool.run(time.sleep, 2, timeout=0.5)
+    finally:
+        pool.shutdown()
@@ -0,0 +1,128 @@
+import io
+import pytest
+from unittest.mock import MagicMock, patch
+from PIL import Image
+
+from tools.media import (
+    sha256_bytes,
+    dhash_image,
+    hamming_distance,
+    video_frame_hashes,
+    MediaDedupIndex,
+)
+
+
+def _png_bytes(size=(64, 64)):
+    """Diagonal gradient image that looks the same at any size."""
+    w, h = size
+    img = Image.new('L', size)
+    img.putdata([int(255 * ((x / w) * 0.7 + (y / h) * 0.3) * (1 if (x * 4 // w) % 2 else 0.6)) for y in range(h) for x in range(w)])
+    buf = io.BytesIO()
+    img.convert('RGB').save(buf, format='PNG')
+    return buf.getvalue()
+
+
+def test_sha256_bytes_is_stable():
+    assert sha256_bytes(b'abc') == sha256_bytes(b'abc')
+    assert sha256_bytes(b'abc') != sha256_bytes(b'abd')
+
+
+def test_dhash_matches_resized_copy():
+    original = dhash_image(_png_bytes())
+    resized = dhash_image(_png_bytes(size=(128, 128)))
+    
+    assert original is not None
+    assert hamming_distance(original, resized) <= 6
+
+
+def test_dhash_fits_signed_bigint():
+    value = dhash_image(_png_bytes())
+    assert -(2 ** 63) <= value < 2 ** 63
+
+
+def test_dhash_invalid_bytes_returns_none():
+    assert dhash_image(b'not an image') is None
+
+
+def test_find_exact_content_hash_match():
+    supabase = MagicMock()
+    row = {'id': 'link-1', 'scrape_count': 2, 'description': 'desc', 'ai_summary': None}
+    supabase.table.return_value.select.return_value.eq.return_value.limit.return_value.execute.return_value.data = [row]
+    
+    index = MediaDedupIndex(supabase, use_perceptual=True, max_distance=6)
+    
+    assert index.find('abc', 123, content_type='image') == row
+    supabase.rpc.assert_not_called()
+
+
+def test_find_falls_back_to_perceptual_match():
+    supabase = MagicMock()
+    supabase.table.return_value.select.return_value.eq.return_value.limit.return_value.execute.return_value.data = []
+    supabase.rpc.return_value.execute.return_value.data = [{'id': 'link-2', 'distance': 3}]
+    
+    index = MediaDedupIndex(supabase, use_perceptual=True, max_distance=4)
+    
+    assert index.find('abc', 123, content_type='video')['id'] == 'link-2'
+    supabase.rpc.assert_called_once_with('match_link_metadata_by_phash', {
+        'p_hash': 123,
+        'p_max_distance': 4,
+        'p_content_type': 'video',
+    })
+
+
+def test_video_match_requires_every_frame():
+    supabase = MagicMock()
+    supabase.table.return_value.select.return_value.eq.return_value.limit.return_value.execute.return_value.data = []
+    supabase.rpc.return_value.execute.return_value.data = []
+    
+    index = MediaDedupIndex(supabase, use_perceptual=True, max_distance=6)
+    
+    assert index.find('abc', 2, content_type='video', frame_hashes=[1, 2, 3]) is None
+    assert supabase.rpc.call_args.args[1]['p_frame_hashes'] == [1, 2, 3]
+
+
+def test_perceptual_off_by_default_and_distance_capped():
+    with patch.dict('os.environ', {'MEDIA_PHASH_MAX_DISTANCE': '12'}, clear=False):
+        index = MediaDedupIndex(MagicMock())
+    
+    assert not index.use_perceptual
+    assert index.max_distance == 7
+
+
+def test_video_frame_hashes_sample_several_frames(tmp_path):
+    import cv2
+    import numpy as np
+    
+    path = str(tmp_path / 'clip.mp4')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 10, (64, 48))
+    for i in range(30):
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        # A bright bar that moves across the clip, so each frame hashes differently
+        frame[:, (i * 2):(i * 2) + 8] = 255
+        writer.write(frame)
+    writer.release()
+    
+    hashes = video_frame_hashes(path, num_frames=3)
+    
+    assert len(hashes) == 3
+    assert len(set(hashes)) == 3
+    assert video_frame_hashes(str(tmp_path / 'missing.mp4')) is None
+
+
+def test_find_perceptual_disabled():
+    supabase = MagicMock()
+    supabase.table.return_value.select.return_value.eq.return_value.limit.return_value.execute.return_value.data = []
+    
+    index = MediaDedupIndex(supabase, use_perceptual=False)
+    
+    assert index.find('abc', 123) is None
+    supabase.rpc.assert_not_called()
+
+
+def test_find_swallows_lookup_errors():
+    supabase = MagicMock()
+    supabase.table.side_effect = Exception("db down")
+    
+    index = MediaDedupIndex(supabase, use_perceptual=False)
+    
+    assert index.find('abc') is None
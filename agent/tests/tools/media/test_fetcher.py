@@ -0,0 +1,60 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import requests
+
+from tools.media.fetcher import MediaFetcher
+
+
+def _fake_get(delay=0.0, failing=()):
+    """Session.get replacement that records peak concurrency per host."""
+    state = {'active': 0, 'peak': 0}
+    lock = threading.Lock()
+
+    def get(url, **kwargs):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+        try:
+            time.sleep(delay)
+            response = MagicMock()
+            response.content = url.encode()
+            if url in failing:
+                response.raise_for_status.side_effect = requests.HTTPError("404")
+            return response
+        finally:
+            with lock:
+                state['active'] -= 1
+
+    return get, state
+
+
+def test_fetch_all_keeps_order_and_skips_failures():
+    fetcher = MediaFetcher(max_workers=4, per_host_limit=4)
+    urls = [f"https://cdn.example.com/{i}.jpg" for i in range(5)]
+    fetcher.session.get, _ = _fake_get(failing={urls[2]})
+    try:
+        results = fetcher.fetch_all(urls)
+    finally:
+        fetcher.close()
+
+    assert results[2] is None
+    assert [r for i, r in enumerate(results) if i != 2] == [u.encode() for i, u in enumerate(urls) if i != 2]
+
+
+def test_downloads_run_concurrently_within_host_limit():
+    fetcher = MediaFetcher(max_workers=8, per_host_limit=3)
+    fetcher.session.get, state = _fake_get(delay=0.05)
+    urls = [f"https://cdn.example.com/{i}.jpg" for i in range(9)]
+    try:
+        started = time.monotonic()
+        results = fetcher.fetch_all(urls)
+        elapsed = time.monotonic() - started
+    finally:
+        fetcher.close()
+
+    assert all(results)
+    assert state['peak'] == 3
+    # Three waves of three, not nine sequential downloads
+    assert elapsed < 9 * 0.05
@@ -0,0 +1,86 @@
+import os
+import threading
+import pytest
+
+from tools.media.scratch import ScratchSpace, PROCESS_DIR_PREFIX, MB
+from tools.media.types import ScratchSpaceError
+
+
+def _scratch(tmp_path, **kwargs):
+    kwargs.setdefault('budget_bytes', 10 * MB)
+    kwargs.setdefault('job_quota_bytes', 4 * MB)
+    kwargs.setdefault('wait_timeout', 1)
+    return ScratchSpace(root=str(tmp_path), **kwargs)
+
+
+def test_job_directory_removed_on_exit(tmp_path):
+    scratch = _scratch(tmp_path)
+    
+    with scratch.job('job-1') as job:
+        path = job.file_path('.mp4')
+        with open(path, 'wb') as f:
+            f.write(b'x' * 100)
+        assert job.used_bytes() == 100
+        assert scratch.reserved_bytes == 4 * MB
+    
+    assert not os.path.exists(job.path)
+    assert scratch.reserved_bytes == 0
+
+
+def test_job_directory_removed_on_error(tmp_path):
+    scratch = _scratch(tmp_path)
+    
+    with pytest.raises(RuntimeError):
+        with scratch.job('job-1') as job:
+            open(job.file_path(), 'wb').close()
+            raise RuntimeError("download failed")
+    
+    assert not os.path.exists(job.path)
+    assert scratch.reserved_bytes == 0
+
+
+def test_sweep_removes_dead_process_dirs(tmp_path):
+    stale = tmp_path / f"{PROCESS_DIR_PREFIX}999999999"
+    stale.mkdir()
+    (stale / 'leftover.mp4').write_bytes(b'x')
+    unrelated = tmp_path / 'keep-me'
+    unrelated.mkdir()
+    
+    _scratch(tmp_path)
+    
+    assert not stale.exists()
+    assert unrelated.exists()
+
+
+def test_quota_larger_than_budget_rejected(tmp_path):
+    scratch = _scratch(tmp_path)
+    
+    with pytest.raises(ScratchSpaceError):
+        with scratch.job('huge', quota_bytes=20 * MB):
+            pass
+
+
+def test_budget_wait_times_out(tmp_path):
+    scratch = _scratch(tmp_path, budget_bytes=4 * MB, wait_timeout=0.1)
+    
+    with scratch.job('first'):
+        with pytest.raises(ScratchSpaceError, match="Timed out"):
+            with scratch.job('second'):
+                pass
+
+
+def test_waiting_job_proceeds_after_release(tmp_path):
+    scratch = _scratch(tmp_path, budget_bytes=4 * MB, wait_timeout=5)
+    entered = threading.Event()
+    
+    def second_job():
+        with scratch.job('second'):
+            entered.set()
+    
+    with scratch.job('first'):
+        thread = threading.Thread(target=second_job)
+        thread.start()
+        assert not entered.wait(0.2)
+    
+    thread.join(timeout=5)
+    assert entered.is_set()
@@ -0,0 +1,67 @@
+from unittest.mock import MagicMock
+
+from tools.media.vision_cache import VisionResultCache, prompt_key
+
+PROMPT = "Describe this image"
+
+
+def test_memory_hit_within_distance():
+    cache = VisionResultCache(enabled=True, max_distance=4)
+    cache.store(0b1011, PROMPT, "a cat meme")
+
+    hit = cache.lookup(0b1011 ^ 0b0110, PROMPT)
+
+    assert hit['description'] == "a cat meme"
+    assert hit['distance'] == 2
+
+
+def test_miss_beyond_distance_or_other_prompt():
+    cache = VisionResultCache(enabled=True, max_distance=4)
+    cache.store(0, PROMPT, "a cat meme")
+
+    assert cache.lookup(0b11111, PROMPT) is None
+    assert cache.lookup(0, "Another prompt") is None
+
+
+def test_memory_is_bounded_lru():
+    cache = VisionResultCache(enabled=True, max_distance=0, memory_size=2)
+    for value in (1, 2, 3):
+        cache.store(value, PROMPT, f"image {value}")
+
+    assert cache.lookup(1, PROMPT) is None
+    assert cache.lookup(3, PROMPT)['description'] == "image 3"
+
+
+def test_database_lookup_and_store():
+    supabase = MagicMock()
+    supabase.rpc.return_value.execute.return_value.data = [
+        {'id': 'c1', 'description': 'stored', 'link_metadata_id': 'l1', 'distance': 1}
+    ]
+    cache = VisionResultCache(supabase, enabled=True, max_distance=9)
+
+    hit = cache.lookup(42, PROMPT)
+
+    assert hit['link_metadata_id'] == 'l1'
+    supabase.rpc.assert_called_once_with('match_vision_cache_by_phash', {
+        'p_hash': 42, 'p_prompt_key': prompt_key(PROMPT), 'p_max_distance': 7,
+    })
+    # Second lookup is served from memory
+    assert cache.lookup(42, PROMPT)['description'] == 'stored'
+    assert supabase.rpc.call_count == 1
+
+
+def test_database_errors_are_misses():
+    supabase = MagicMock()
+    supabase.rpc.side_effect = Exception("connection reset")
+    supabase.table.side_effect = Exception("connection reset")
+    cache = VisionResultCache(supabase, enabled=True)
+
+    assert cache.lookup(42, PROMPT) is None
+    assert cache.store(42, PROMPT, "description") is None
+
+
+def test_disabled_cache():
+    cache = VisionResultCache(enabled=False)
+    cache.store(1, PROMPT, "x")
+
+    assert cache.lookup(1, PROMPT) is None
@@ -0,0 +1,138 @@
+"""
+Tests for caption track selection and transcript flattening.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+from agent.src.tools.scraper.extractors.captions import (
+    select_caption_track,
+    parse_caption_text,
+)
+from agent.src.tools.scraper.extractors.ytdlp import YtDlpExtractor
+from agent.src.tools.video.types import INFO_PROXY_KEY
+
+
+AUTO_VTT = """WEBVTT
+Kind: captions
+Language: en
+
+00:00:00.000 --> 00:00:02.000 align:start position:0%
+hello<00:00:00.500><c> and</c><c> welcome</c>
+
+00:00:02.000 --> 00:00:02.010 align:start position:0%
+hello and welcome
+
+00:00:02.010 --> 00:00:04.000 align:start position:0%
+hello and welcome
+to the channel
+"""
+
+SRT = """1
+00:00:00,000 --> 00:00:02,000
+First line
+
+2
+00:00:02,000 --> 00:00:04,000
+Second line
+"""
+
+
+class TestSelectCaptionTrack:
+    """Test caption track selection from yt-dlp info dicts."""
+
+    def test_prefers_manual_subtitles(self):
+        info = {
+            'subtitles': {'en': [{'ext': 'json3', 'url': 'j'}, {'ext': 'vtt', 'url': 'manual'}]},
+            'automatic_captions': {'en': [{'ext': 'vtt', 'url': 'auto'}]},
+        }
+        lang, track, is_automatic = select_caption_track(info, ['en'])
+        assert lang == 'en'
+        assert track['url'] == 'manual'
+        assert is_automatic is False
+
+    def test_falls_back_to_automatic_original(self):
+        info = {
+            'subtitles': {},
+            'automatic_captions': {
+                'en-orig': [{'ext': 'vtt', 'url': 'orig'}],
+                'en-US': [{'ext': 'vtt', 'url': 'us'}],
+            },
+        }
+        lang, track, is_automatic = select_caption_track(info, ['en'])
+        assert track['url'] == 'orig'
+        assert is_automatic is True
+
+    def test_regional_variant_and_srt(self):
+        info = {'subtitles': {'eng-US': [{'ext': 'srt', 'url': 'tt'}]}}
+        assert select_caption_track(info, ['en']) is None
+        lang, track, _ = select_caption_track(info, ['eng'])
+        assert lang == 'eng-US'
+        assert track['ext'] == 'srt'
+
+    def test_no_supported_track(self):
+        info = {'subtitles': {'en': [{'ext': 'json3', 'url': 'j'}]}}
+        assert select_caption_track(info, ['en']) is None
+        assert select_caption_track({}, ['en']) is None
+
+
+class TestParseCaptionText:
+    """Test flattening caption payloads to plain text."""
+
+    def test_vtt_strips_tags_and_rolling_duplicates(self):
+        assert parse_caption_text(AUTO_VTT) == "hello and welcome to the channel"
+
+    def test_srt(self):
+        assert parse_caption_text(SRT) == "First line Second line"
+
+    def test_empty(self):
+        assert parse_caption_text("WEBVTT\n\n") == ""
+
+
+class TestYtDlpCaptions:
+    """Test that the extractor fetches captions without downloading media."""
+
+    @patch('agent.src.tools.scraper.extractors.ytdlp.yt_dlp.YoutubeDL')
+    def test_extract_includes_transcript(self, mock_ytdl):
+        ydl = mock_ytdl.return_value.__enter__.return_value
+        ydl.extract_info.return_value = {
+            'title': 'Video',
+            'subtitles': {'en': [{'ext': 'srt', 'url': 'https://example.com/subs.srt'}]},
+        }
+        ydl.urlopen.return_value.read.return_value = SRT.encode()
+
+        extractor = YtDlpExtractor(fetch_captions=True)
+        response = extractor.extract('https://youtube.com/watch?v=1', 'youtube')
+
+        assert response.transcript == "First line Second line"
+        ydl.extract_info.assert_called_once_with('https://youtube.com/watch?v=1', download=False)
+        # Extracted without a proxy (YouTube skips it), which the downloader checks before reusing it
+        assert response.extractor_info[INFO_PROXY_KEY] is None
+        ydl.urlopen.assert_called_once_with('https://example.com/subs.srt')
+
+    @patch('agent.src.tools.scraper.extractors.ytdlp.yt_dlp.YoutubeDL')
+    def test_caption_fetch_failure_is_not_fatal(self, mock_ytdl):
+        ydl = mock_ytdl.return_value.__enter__.return_value
+        ydl.extract_info.return_value = {
+            'title': 'Video',
+            'automatic_captions': {'en': [{'ext': 'vtt', 'url': 'https://example.com/a.vtt'}]},
+        }
+        ydl.urlopen.side_effect = Exception("403")
+
+        extractor = YtDlpExtractor(fetch_captions=True)
+        response = extractor.extract('https://youtube.com/watch?v=1', 'youtube')
+
+        assert response.title == 'Video'
+        assert response.transcript is None
+
+    @patch('agent.src.tools.scraper.extractors.ytdlp.yt_dlp.YoutubeDL')
+    def test_captions_disabled_by_default(self, mock_ytdl):
+        ydl = mock_ytdl.return_value.__enter__.return_value
+        ydl.extract_info.return_value = {
+            'title': 'Video',
+            'subtitles': {'en': [{'ext': 'vtt', 'url': 'https://example.com/s.vtt'}]},
+        }
+
+        response = YtDlpExtractor().extract('https://youtube.com/watch?v=1', 'youtube')
+
+        assert response.transcript is None
+        ydl.urlopen.assert_not_called()
@@ -144,6 +144,29 @@ class TestScraperService:
         assert response.title == "Partial Video"
         assert response.description is None
         assert response.author is None
+    
+    def test_youtube_api_keeps_ytdlp_info(self, service):
+        """Test the YouTube Data API path keeps the yt-dlp info looked up for captions."""
+        api_response = ScraperResponse(
+            title="API Video",
+            content_type=ContentType.VIDEO,
+            platform="youtube",
+            extraction_strategy=ExtractionStrategy.YTDLP,
+            raw_url="https://www.youtube.com/watch?v=test"
+        )
+        info = {'id': 'test', 'formats': []}
+        service.fetch_captions = True
+        service.youtube_api_extractor.extract = Mock(return_value=api_response)
+        service.ytdlp_extractor.fetch_transcript = Mock(return_value=("Hello there", info))
+        service.ytdlp_extractor.extract = Mock()
+        
+        with patch.dict('os.environ', {'YOUTUBE_API_KEY': 'key'}):
+            response = service.scrape(ScraperRequest(url="https://www.youtube.com/watch?v=test"))
+        
+        assert response.title == "API Video"
+        assert response.transcript == "Hello there"
+        assert response.extractor_info is info
+        service.ytdlp_extractor.extract.assert_not_called()
 
 
 class TestErrorHandling:
@@ -0,0 +1,91 @@
+"""
+Unit tests for collage mode (single vision call per video).
+"""
+
+import numpy as np
+from unittest.mock import patch, MagicMock
+from tools.video.collage import build_collage, format_timestamp
+from tools.video.service import VideoProcessingService
+from tools.video.types import AnalysisMode
+from tools.vision.types import VisionResponse
+
+
+def _frames(n, shape=(90, 160, 3)):
+    return [np.full(shape, i * 30, dtype=np.uint8) for i in range(n)]
+
+
+def test_format_timestamp():
+    assert format_timestamp(0) == "0:00"
+    assert format_timestamp(75.4) == "1:15"
+
+
+def test_build_collage_grid_shape():
+    collage = build_collage(_frames(5), [0, 10, 20, 30, 40], cell_height=90)
+    
+    # 5 frames -> 3x2 grid of 160x90 cells
+    assert collage.shape == (180, 480, 3)
+
+
+@patch('tools.video.service.VisionService')
+def test_collage_mode_makes_one_vision_call(mock_vision_cls):
+    mock_vision = mock_vision_cls.return_value
+    mock_vision.analyze.return_value = VisionResponse(
+        analysis_data={
+            'timeline': [
+                {'timestamp': '0:00', 'description': 'Chef slices onions'},
+                {'timestamp': '0:30', 'description': 'Onions fry in a pan'},
+                {'timestamp': '1:00', 'description': 'Plated curry'},
+            ],
+            'summary': 'A curry recipe from prep to plating.'
+        },
+        provider_used='openrouter/openai/gpt-4o'
+    )
+    source = MagicMock()
+    source.probe_duration.return_value = 60.0
+    source.iter_frames.return_value = iter(zip([0.0, 30.0, 60.0], _frames(3)))
+    
+    service = VideoProcessingService(num_frames=3, analysis_mode=AnalysisMode.COLLAGE)
+    response = service.process_source(source)
+    
+    assert mock_vision.analyze.call_count == 1
+    assert response.frame_count == 3
+    assert response.frame_descriptions[1] == '0:30: Onions fry in a pan'
+    assert 'A curry recipe' in response.summary
+
+
+@patch('tools.video.service.VisionService')
+def test_frames_mode_is_default(mock_vision_cls, monkeypatch):
+    monkeypatch.delenv('VIDEO_ANALYSIS_MODE', raising=False)
+    mock_vision_cls.return_value.analyze.return_value = VisionResponse(
+        analysis_data={'description': 'A frame'}, provider_used='test'
+    )
+    source = MagicMock()
+    source.probe_duration.return_value = 60.0
+    source.iter_frames.return_value = iter(zip([0.0, 30.0, 60.0], _frames(3)))
+    
+    service = VideoProcessingService(num_frames=3)
+    service.process_source(source)
+    
+    assert mock_vision_cls.return_value.analyze.call_count == 3
+
+
+@patch('tools.video.service.VisionService')
+def test_vision_profiles_per_mode(mock_vision_cls):
+    """Frames go out at low detail with a token cap; the collage grid at high detail."""
+    mock_vision_cls.return_value.analyze.return_value = VisionResponse(
+        analysis_data={'description': 'A frame'}, provider_used='test'
+    )
+    source = MagicMock()
+    source.probe_duration.return_value = 60.0
+    
+    source.iter_frames.return_value = iter(zip([0.0], _frames(1)))
+    VideoProcessingService(num_frames=1, analysis_mode=AnalysisMode.FRAMES).process_source(source)
+    frame_request = mock_vision_cls.return_value.analyze.call_args[0][0]
+    
+    source.iter_frames.return_value = iter(zip([0.0, 30.0], _frames(2)))
+    VideoProcessingService(num_frames=2, analysis_mode=AnalysisMode.COLLAGE).process_source(source)
+    collage_request = mock_vision_cls.return_value.analyze.call_args[0][0]
+    
+    assert frame_request.detail == 'low'
+    assert frame_request.max_tokens == 150
+    assert collage_request.detail == 'high'
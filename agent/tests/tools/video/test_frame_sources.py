@@ -0,0 +1,152 @@
+"""
+Unit tests for frame sources (storyboard slicing).
+"""
+
+import cv2
+import numpy as np
+import pytest
+from unittest.mock import patch, MagicMock
+from tools.video.frame_sources import StoryboardFrameSource
+from tools.video.types import VideoExtractionError
+
+
+def _sheet_bytes(rows=2, columns=2, tile=(16, 8), first_value=0):
+    """Encode a sprite sheet whose tiles are filled with increasing gray values."""
+    tile_w, tile_h = tile
+    sheet = np.zeros((rows * tile_h, columns * tile_w, 3), dtype=np.uint8)
+    for i in range(rows * columns):
+        r, c = divmod(i, columns)
+        sheet[r * tile_h:(r + 1) * tile_h, c * tile_w:(c + 1) * tile_w] = (first_value + i) * 20
+    ok, buf = cv2.imencode('.png', sheet)
+    return buf.tobytes()
+
+
+def _info(duration=8.0, sheets=2):
+    return {
+        'duration': duration,
+        'formats': [
+            {'format_id': '18', 'ext': 'mp4', 'width': 640, 'height': 360},
+            {
+                'format_id': 'sb1', 'format_note': 'storyboard', 'rows': 1, 'columns': 1,
+                'width': 8, 'height': 4, 'fps': 0.1, 'fragments': [{'url': 'https://i.ytimg.com/sb/low'}],
+            },
+            {
+                'format_id': 'sb0', 'format_note': 'storyboard', 'rows': 2, 'columns': 2,
+                'width': 16, 'height': 8, 'fps': 1.0,
+                'fragments': [{'url': f'https://i.ytimg.com/sb/{i}', 'duration': 4.0} for i in range(sheets)],
+            },
+        ]
+    }
+
+
+def test_from_info_picks_largest_storyboard():
+    source = StoryboardFrameSource.from_info(_info())
+    
+    assert source is not None
+    assert source.storyboard['format_id'] == 'sb0'
+    assert source.probe_duration() == 8.0
+
+
+def test_from_info_without_storyboards():
+    assert StoryboardFrameSource.from_info({'duration': 10, 'formats': [{'format_id': '18'}]}) is None
+    assert StoryboardFrameSource.from_info(None) is None
+
+
+@patch('tools.video.frame_sources.requests.get')
+def test_extract_frames_slices_tiles(mock_get):
+    sheets = {
+        'https://i.ytimg.com/sb/0': _sheet_bytes(first_value=0),
+        'https://i.ytimg.com/sb/1': _sheet_bytes(first_value=4),
+    }
+    mock_get.side_effect = lambda url, timeout: MagicMock(content=sheets[url], raise_for_status=MagicMock())
+    
+    source = StoryboardFrameSource.from_info(_info())
+    frames, duration = source.extract_frames(3)
+    
+    assert duration == 8.0
+    assert len(frames) == 3
+    assert frames[0].shape == (8, 16, 3)
+    # Tiles at t=0, 4 and 8s -> global tiles 0, 4 and 7 (last tile)
+    assert [int(f[0, 0, 0]) for f in frames] == [0, 80, 140]
+    assert mock_get.call_count == 2
+
+
+@patch('tools.video.frame_sources.requests.get')
+def test_extract_frames_fetch_failure(mock_get):
+    import requests
+    mock_get.side_effect = requests.ConnectionError("blocked")
+    
+    source = StoryboardFrameSource.from_info(_info())
+    
+    with pytest.raises(VideoExtractionError):
+        source.extract_frames(2)
+
+
+def _clip(tmp_path):
+    path = str(tmp_path / 'clip.mp4')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 10, (320, 240))
+    for i in range(40):
+        writer.write(np.full((240, 320, 3), i * 5, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def test_file_source_streams_downscaled_frames(tmp_path):
+    from tools.video.frame_sources import FileFrameSource
+    
+    frames = FileFrameSource(_clip(tmp_path)).iter_frames(3, max_height=120)
+    
+    first_ts, first_frame = next(frames)
+    assert first_ts == 0.0
+    assert first_frame.shape == (120, 160, 3)
+    rest = list(frames)
+    assert len(rest) == 2
+    assert rest[-1][0] == pytest.approx(3.9, abs=0.01)
+
+
+def test_file_source_pool_decodes_lazily(tmp_path):
+    from tools.video.frame_sources import FileFrameSource
+    from tools.video.processor import decode_frame
+    
+    pool = MagicMock(enabled=True)
+    pool.run.side_effect = lambda fn, *args: fn(*args)
+    
+    frames = FileFrameSource(_clip(tmp_path), cpu_pool=pool).iter_frames(3, max_height=120)
+    first_ts, first_frame = next(frames)
+    
+    # One pool task per frame, submitted only when the frame is consumed
+    assert pool.run.call_count == 1
+    assert pool.run.call_args.args[0] is decode_frame
+    assert first_ts == 0.0
+    assert first_frame.shape == (120, 160, 3)
+    rest = list(frames)
+    assert pool.run.call_count == 3
+    assert rest[-1][0] == pytest.approx(3.9, abs=0.01)
+
+
+def test_file_source_pool_round_trip(tmp_path):
+    from tools.media.cpu_pool import CpuPool
+    from tools.video.frame_sources import FileFrameSource
+    
+    pool = CpuPool(max_workers=1, min_offload_bytes=0)
+    try:
+        frames = list(FileFrameSource(_clip(tmp_path), cpu_pool=pool).iter_frames(2, max_height=120))
+    finally:
+        pool.shutdown()
+    
+    assert [frame.shape for _, frame in frames] == [(120, 160, 3)] * 2
+    assert pool.stats()['completed'] == 2
+
+
+@patch('tools.video.frame_sources.requests.get')
+def test_storyboard_iter_keeps_one_sheet(mock_get):
+    sheets = {
+        'https://i.ytimg.com/sb/0': _sheet_bytes(first_value=0),
+        'https://i.ytimg.com/sb/1': _sheet_bytes(first_value=4),
+    }
+    mock_get.side_effect = lambda url, timeout: MagicMock(content=sheets[url], raise_for_status=MagicMock())
+    
+    timestamps = [ts for ts, _ in StoryboardFrameSource.from_info(_info()).iter_frames(5)]
+    
+    assert timestamps == [0.0, 2.0, 4.0, 6.0, 8.0]
+    assert mock_get.call_count == 2
@@ -0,0 +1,78 @@
+"""
+Unit tests for the duration probe and frame budget planning.
+"""
+
+import cv2
+import numpy as np
+import pytest
+from unittest.mock import patch, MagicMock
+from tools.video.probe import probe_duration, plan_frames, DEFAULT_NUM_FRAMES
+from tools.video.service import VideoProcessingService
+from tools.video.frame_sources import FileFrameSource
+
+
+class TestPlanFrames:
+    """Frame budgets scale with duration and respect bounds."""
+
+    def _plan(self, duration):
+        return plan_frames(duration, min_frames=1, max_frames=8, seconds_per_frame=15, max_height=480)
+
+    def test_short_clip_gets_one_frame(self):
+        assert self._plan(3).num_frames == 1
+
+    def test_one_minute_matches_legacy_budget(self):
+        assert self._plan(60).num_frames == 5
+
+    def test_long_video_capped(self):
+        assert self._plan(600).num_frames == 8
+
+    def test_unknown_duration_uses_default(self):
+        assert self._plan(None).num_frames == DEFAULT_NUM_FRAMES
+
+    def test_min_frames_respected(self):
+        plan = plan_frames(2, min_frames=3, max_frames=8, seconds_per_frame=15, max_height=480)
+        assert plan.num_frames == 3
+
+    def test_env_configuration(self, monkeypatch):
+        monkeypatch.setenv('VIDEO_FRAMES_MAX', '12')
+        monkeypatch.setenv('VIDEO_SECONDS_PER_FRAME', '10')
+        monkeypatch.setenv('VIDEO_TARGET_HEIGHT', '360')
+
+        plan = plan_frames(120)
+
+        assert plan.num_frames == 12
+        assert plan.max_height == 360
+
+
+class TestProbeDuration:
+    """Duration comes from the container header."""
+
+    def test_probe_synthetic_video(self, tmp_path):
+        path = str(tmp_path / 'clip.mp4')
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 10, (32, 24))
+        for _ in range(30):
+            writer.write(np.zeros((24, 32, 3), dtype=np.uint8))
+        writer.release()
+
+        assert probe_duration(path) == pytest.approx(3.0, abs=0.2)
+
+    def test_probe_missing_file(self, tmp_path):
+        assert probe_duration(str(tmp_path / 'missing.mp4')) is None
+
+
+@patch('tools.video.service.VisionService')
+def test_adaptive_service_uses_duration_hint(mock_vision):
+    service = VideoProcessingService(num_frames=None)
+
+    with patch('tools.video.frame_sources.probe_duration') as mock_probe:
+        plan = service.plan(FileFrameSource('/tmp/video.mp4'), duration_hint=3)
+
+    mock_probe.assert_not_called()
+    assert plan.num_frames == 1
+
+
+@patch('tools.video.service.VisionService')
+def test_fixed_service_keeps_configured_frames(mock_vision):
+    service = VideoProcessingService(num_frames=5)
+
+    assert service.plan(FileFrameSource('/tmp/video.mp4'), duration_hint=3).num_frames == 5
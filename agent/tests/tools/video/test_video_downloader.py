@@ -3,7 +3,7 @@ from unittest.mock import patch, MagicMock
 import os
 from tempfile import NamedTemporaryFile
 from tools.video.downloader import SocialVideoDownloader
-from tools.video.types import VideoDownloadError
+from tools.video.types import VideoDownloadError, DownloadProfile
 
 @patch('yt_dlp.YoutubeDL')
 def test_social_video_downloader_success(mock_ytdl):
@@ -46,6 +46,118 @@ def test_social_video_downloader_init():
     dl2 = SocialVideoDownloader(proxy_url="http://proxy:8080")
     assert dl2.proxy_url == "http://proxy:8080"
 
+def test_social_video_downloader_default_profile_merges_audio():
+    """Default profile keeps the original best video + audio selection."""
+    opts = SocialVideoDownloader()._format_opts()
+    assert opts['format'].startswith('bestvideo[ext=mp4]+bestaudio')
+    assert 'download_ranges' not in opts
+
+def test_social_video_downloader_frames_only_profile():
+    """Frames-only profile picks a small video-only stream and limits the range."""
+    downloader = SocialVideoDownloader(
+        profile='frames_only',
+        target_height=480,
+        max_seconds=120
+    )
+    assert downloader.profile == DownloadProfile.FRAMES_ONLY
+    
+    opts = downloader._format_opts()
+    assert opts['format'].startswith('wv[height>=480]')
+    assert '+' not in opts['format']  # No audio merge
+    
+    ranges = list(opts['download_ranges']({'duration': 600}, None))
+    assert ranges[0]['start_time'] == 0
+    assert ranges[0]['end_time'] == 120
+
+@patch('yt_dlp.YoutubeDL')
+def test_social_video_downloader_frames_only_passes_opts(mock_ytdl):
+    mock_instance = mock_ytdl.return_value.__enter__.return_value
+    mock_instance.extract_info.return_value = {'id': 'test_video'}
+    
+    downloader = SocialVideoDownloader(profile=DownloadProfile.FRAMES_ONLY, target_height=360)
+    
+    with patch('tools.video.downloader.tempfile.NamedTemporaryFile') as mock_temp, \
+         patch('os.path.getsize', return_value=1000), \
+         patch('os.path.exists', return_value=True):
+        mock_temp.return_value.name = '/tmp/test_video.mp4'
+        downloader.download('https://youtube.com/watch?v=1234')
+    
+    ydl_opts = mock_ytdl.call_args[0][0]
+    assert ydl_opts['format'].startswith('wv[height>=360]')
+    assert ydl_opts['outtmpl'] == '/tmp/test_video.mp4'
+
+@patch('yt_dlp.YoutubeDL')
+def test_social_video_downloader_reuses_extractor_info(mock_ytdl):
+    """A pre-resolved info dict is downloaded without re-extracting."""
+    mock_instance = mock_ytdl.return_value.__enter__.return_value
+    mock_instance.sanitize_info.side_effect = lambda info, remove_private_keys: info
+    info = {'id': 'test_video', 'formats': [], 'webpage_url': 'https://youtube.com/watch?v=1234'}
+    
+    downloader = SocialVideoDownloader()
+    
+    with patch('tools.video.downloader.tempfile.NamedTemporaryFile') as mock_temp, \
+         patch('os.path.getsize', return_value=1000), \
+         patch('os.path.exists', return_value=True):
+        mock_temp.return_value.name = '/tmp/test_video.mp4'
+        downloader.download('https://youtube.com/watch?v=1234', info=info)
+    
+    mock_instance.process_ie_result.assert_called_once_with(info, download=True)
+    mock_instance.extract_info.assert_not_called()
+
+@patch('yt_dlp.YoutubeDL')
+def test_social_video_downloader_info_falls_back_to_extract(mock_ytdl):
+    """Stale cached format URLs fall back to a fresh extraction."""
+    import yt_dlp
+    mock_instance = mock_ytdl.return_value.__enter__.return_value
+    mock_instance.process_ie_result.side_effect = yt_dlp.utils.DownloadError("HTTP Error 403")
+    
+    downloader = SocialVideoDownloader()
+    
+    with patch('tools.video.downloader.tempfile.NamedTemporaryFile') as mock_temp, \
+         patch('os.path.getsize', return_value=1000), \
+         patch('os.path.exists', return_value=True):
+        mock_temp.return_value.name = '/tmp/test_video.mp4'
+        path = downloader.download('https://youtube.com/watch?v=1234', info={'id': 'test_video'})
+    
+    assert path == '/tmp/test_video.mp4'
+    mock_instance.extract_info.assert_called_once_with('https://youtube.com/watch?v=1234', download=True)
+
+@patch('yt_dlp.YoutubeDL')
+def test_social_video_downloader_skips_info_from_other_proxy(mock_ytdl):
+    """Format URLs resolved without the proxy aren't reused for a download through it."""
+    from tools.video.types import INFO_PROXY_KEY
+    mock_instance = mock_ytdl.return_value.__enter__.return_value
+    info = {'id': 'test_video', 'formats': [], INFO_PROXY_KEY: None}
+    
+    downloader = SocialVideoDownloader(proxy_url='http://proxy:8080')
+    
+    with patch('tools.video.downloader.tempfile.NamedTemporaryFile') as mock_temp, \
+         patch('os.path.getsize', return_value=1000), \
+         patch('os.path.exists', return_value=True):
+        mock_temp.return_value.name = '/tmp/test_video.mp4'
+        downloader.download('https://youtube.com/watch?v=1234', info=info)
+    
+    mock_instance.process_ie_result.assert_not_called()
+    mock_instance.extract_info.assert_called_once_with('https://youtube.com/watch?v=1234', download=True)
+
+@patch('yt_dlp.YoutubeDL')
+def test_social_video_downloader_reuses_info_from_same_proxy(mock_ytdl):
+    from tools.video.types import INFO_PROXY_KEY
+    mock_instance = mock_ytdl.return_value.__enter__.return_value
+    mock_instance.sanitize_info.side_effect = lambda info, remove_private_keys: info
+    info = {'id': 'test_video', 'formats': [], INFO_PROXY_KEY: 'http://proxy:8080'}
+    
+    downloader = SocialVideoDownloader(proxy_url='http://proxy:8080')
+    
+    with patch('tools.video.downloader.tempfile.NamedTemporaryFile') as mock_temp, \
+         patch('os.path.getsize', return_value=1000), \
+         patch('os.path.exists', return_value=True):
+        mock_temp.return_value.name = '/tmp/test_video.mp4'
+        downloader.download('https://youtube.com/watch?v=1234', info=info)
+    
+    mock_instance.process_ie_result.assert_called_once()
+    mock_instance.extract_info.assert_not_called()
+
 # Integration test (might be slow)
 @pytest.mark.integration
 def test_social_video_downloader_integration():
@@ -0,0 +1,126 @@
+from unittest.mock import MagicMock
+
+from lxml import html as lxml_html
+
+from tools.article.extractors.opengraph_parser import OpenGraphParser
+from tools.scraper.extractors.opengraph import OpenGraphExtractor
+from tools.web.head import HEAD_END, head_from_tree, parse_head
+from tools.web.http_cache import HttpCache, fetch_with_cache
+
+PAGE = """<!doctype html>
+<html><head>
+<title>Plain &amp; Simple</title>
+<meta property="og:title" content="OG Title">
+<meta property="og:image" content="https://example.com/1.jpg">
+<meta property="og:image" content="https://example.com/2.jpg">
+<meta name="description" content="A description">
+<meta name="twitter:card" content="summary">
+<meta name="viewport" content="width=device-width">
+</head>
+<body><p>Body</p><meta property="og:late" content="ignored"></body></html>"""
+
+
+def test_parse_head_reads_title_and_meta():
+    head = parse_head(PAGE)
+
+    assert head.complete
+    assert head.title == 'Plain & Simple'
+    assert head.meta['og:title'] == 'OG Title'
+    assert head.meta['og:image'] == 'https://example.com/1.jpg'
+    assert head.meta['description'] == 'A description'
+    assert 'og:late' not in head.meta
+
+
+def test_parse_head_without_head_element():
+    head = parse_head('<meta property="og:title" content="X"><p>Body</p>')
+
+    assert head.complete
+    assert head.meta == {'og:title': 'X'}
+
+
+def test_parse_head_of_truncated_page():
+    head = parse_head(PAGE[:PAGE.index('<meta name="description"')])
+
+    assert not head.complete
+    assert head.meta['og:title'] == 'OG Title'
+
+
+def test_head_from_tree_matches_parse_head():
+    tree = lxml_html.fromstring(PAGE)
+
+    assert head_from_tree(tree).meta == parse_head(PAGE).meta
+    assert OpenGraphParser.parse_tree(tree) == OpenGraphParser.parse(PAGE)
+
+
+def test_head_end_pattern():
+    assert HEAD_END.search(b'<title>x</title></HEAD >')
+    assert HEAD_END.search(b'<meta charset="utf-8"><body class="home">')
+    assert not HEAD_END.search(b'<head><meta name="bodyless">')
+
+
+def test_opengraph_parser_keeps_metadata_tags_only():
+    tags = OpenGraphParser.parse(PAGE)
+
+    assert tags == {
+        'og:title': 'OG Title',
+        'og:image': 'https://example.com/1.jpg',
+        'description': 'A description',
+        'twitter:card': 'summary',
+    }
+
+
+def _head_response(status_code=200, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.text = PAGE if status_code == 200 else ''
+    response.complete = False
+    return response
+
+
+def test_opengraph_extractor_fetches_head_only():
+    page_fetcher = MagicMock()
+    page_fetcher.get.return_value = _head_response()
+    cache = HttpCache(max_bytes=1024 * 1024)
+
+    result = OpenGraphExtractor(cache=cache, page_fetcher=page_fetcher).extract('https://example.com/a')
+
+    assert result.title == 'OG Title'
+    assert result.description == 'A description'
+    assert result.thumbnail_url == 'https://example.com/1.jpg'
+    assert page_fetcher.get.call_args.kwargs['until'] is HEAD_END
+    # The head-only body is kept as a partial entry, which full-page fetches ignore
+    assert cache.get('https://example.com/a').partial
+    full_get = MagicMock(return_value=MagicMock(status_code=200, headers={}, text='<html>full</html>'))
+    page = fetch_with_cache(cache, 'https://example.com/a', full_get)
+    assert page.html == '<html>full</html>'
+    assert full_get.call_args.args[0] == {}
+
+
+def test_opengraph_extractor_reuses_fresh_head():
+    page_fetcher = MagicMock()
+    page_fetcher.get.return_value = _head_response(headers={'Cache-Control': 'max-age=600'})
+    extractor = OpenGraphExtractor(cache=HttpCache(max_bytes=1024 * 1024), page_fetcher=page_fetcher)
+
+    extractor.extract('https://example.com/a')
+    result = extractor.extract('https://example.com/a')
+
+    assert result.title == 'OG Title'
+    assert page_fetcher.get.call_count == 1
+    assert extractor.cache.stats()['fresh'] == 1
+
+
+def test_opengraph_extractor_revalidates_stale_head():
+    page_fetcher = MagicMock()
+    page_fetcher.get.side_effect = [
+        _head_response(headers={'Cache-Control': 'max-age=0', 'ETag': '"v1"'}),
+        _head_response(status_code=304),
+    ]
+    extractor = OpenGraphExtractor(cache=HttpCache(max_bytes=1024 * 1024), page_fetcher=page_fetcher)
+
+    extractor.extract('https://example.com/a')
+    result = extractor.extract('https://example.com/a')
+
+    assert page_fetcher.get.call_args.kwargs['headers']['If-None-Match'] == '"v1"'
+    assert result.title == 'OG Title'
+    assert extractor.cache.stats()['revalidated'] == 1
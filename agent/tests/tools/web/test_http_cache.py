@@ -0,0 +1,99 @@
+from unittest.mock import MagicMock
+
+from tools.web.http_cache import HttpCache, canonical_url, fetch_with_cache
+from tools.web.types import CacheStatus
+
+
+def _response(status_code=200, text='<html>page</html>', headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    response.headers = headers or {}
+    return response
+
+
+def test_canonical_url_drops_fragment_and_tracking_params():
+    assert canonical_url('HTTPS://Example.com/a?id=1&utm_source=x&fbclid=y#top') == 'https://example.com/a?id=1'
+    assert canonical_url('https://example.com') == 'https://example.com/'
+
+
+def test_fresh_entry_served_without_request():
+    cache = HttpCache(max_bytes=1024 * 1024)
+    get = MagicMock(return_value=_response(headers={'Cache-Control': 'max-age=600'}))
+
+    first = fetch_with_cache(cache, 'https://example.com/a', get)
+    second = fetch_with_cache(cache, 'https://example.com/a?utm_campaign=z', get)
+
+    assert first.cache_status == CacheStatus.FETCHED
+    assert second.cache_status == CacheStatus.FRESH
+    assert second.html == '<html>page</html>'
+    assert get.call_count == 1
+
+
+def test_stale_entry_revalidated_with_304():
+    cache = HttpCache(max_bytes=1024 * 1024)
+    get = MagicMock(side_effect=[
+        _response(headers={'Cache-Control': 'no-cache', 'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}),
+        _response(status_code=304, text=''),
+    ])
+
+    fetch_with_cache(cache, 'https://example.com/a', get)
+    cache.remember('https://example.com/a', 'article', {'text': 'extracted'})
+    page = fetch_with_cache(cache, 'https://example.com/a', get)
+
+    assert get.call_args_list[1].args[0] == {
+        'If-None-Match': '"v1"',
+        'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+    }
+    assert page.cache_status == CacheStatus.REVALIDATED
+    assert page.unchanged
+    assert page.html == '<html>page</html>'
+    assert cache.recall('https://example.com/a', 'article') == {'text': 'extracted'}
+
+
+def test_changed_page_drops_derived_results():
+    cache = HttpCache(max_bytes=1024 * 1024, default_ttl=0)
+    get = MagicMock(side_effect=[_response(), _response(text='<html>new</html>')])
+
+    fetch_with_cache(cache, 'https://example.com/a', get)
+    cache.remember('https://example.com/a', 'article', {'text': 'old'})
+    page = fetch_with_cache(cache, 'https://example.com/a', get)
+
+    assert page.cache_status == CacheStatus.FETCHED
+    assert page.html == '<html>new</html>'
+    assert cache.recall('https://example.com/a', 'article') is None
+
+
+def test_no_store_not_cached():
+    cache = HttpCache(max_bytes=1024 * 1024)
+    get = MagicMock(return_value=_response(headers={'Cache-Control': 'private, no-store'}))
+
+    fetch_with_cache(cache, 'https://example.com/a', get)
+    fetch_with_cache(cache, 'https://example.com/a', get)
+
+    assert get.call_count == 2
+    assert cache.get('https://example.com/a') is None
+
+
+def test_evicts_least_recently_used_by_size():
+    cache = HttpCache(max_bytes=400)
+    cache.store('https://example.com/a', {}, 'a' * 100)
+    cache.store('https://example.com/b', {}, 'b' * 100)
+    cache.get('https://example.com/a')
+    cache.store('https://example.com/c', {}, 'c' * 100)
+    cache.store('https://example.com/d', {}, 'd' * 100)
+    cache.store('https://example.com/e', {}, 'e' * 100)
+
+    assert cache.get('https://example.com/b') is None
+    assert cache.get('https://example.com/a') is not None
+    assert cache.stats()['bytes'] == 400
+
+
+def test_disabled_cache_always_fetches():
+    cache = HttpCache(max_bytes=0)
+    get = MagicMock(return_value=_response())
+
+    fetch_with_cache(cache, 'https://example.com/a', get)
+    fetch_with_cache(cache, 'https://example.com/a', get)
+
+    assert get.call_count == 2
@@ -0,0 +1,94 @@
+import re
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from tools.web.fetcher import PageFetcher, detect_charset
+from tools.web.types import UnsupportedContentError
+
+
+def _streamed(body=b'', status_code=200, content_type='text/html'):
+    response = MagicMock()
+    response.url = 'https://example.com/a'
+    response.status_code = status_code
+    response.headers = {'Content-Type': content_type} if content_type else {}
+    response.iter_content.side_effect = lambda chunk_size: (
+        body[i:i + chunk_size] for i in range(0, len(body), chunk_size)
+    )
+    return response
+
+
+def test_charset_from_header_wins():
+    body = '<meta charset="utf-8"><p>café</p>'.encode('latin-1')
+    assert detect_charset(body, 'text/html; charset=ISO-8859-1') == ('iso8859-1', 'header')
+
+
+def test_charset_from_meta_tag():
+    body = b'<html><head><meta http-equiv="Content-Type" content="text/html; charset=windows-1251"></head>'
+    assert detect_charset(body, 'text/html') == ('cp1251', 'meta')
+
+
+def test_undeclared_utf8_skips_detector():
+    with patch('tools.web.fetcher.charset_normalizer.from_bytes') as detector:
+        assert detect_charset('<p>naïve café</p>'.encode('utf-8')) == ('utf-8', 'utf-8')
+        detector.assert_not_called()
+
+
+def test_utf8_cut_mid_character_still_utf8():
+    body = '<p>café</p>'.encode('utf-8')[:8]
+    assert detect_charset(body) == ('utf-8', 'utf-8')
+
+
+def test_body_capped_and_decoded():
+    fetcher = PageFetcher(max_bytes=100 * 1024)
+    body = ('<html><head><meta charset="utf-8"></head><body>' + 'é' * 200_000).encode('utf-8')
+    with patch.object(fetcher.session, 'get', return_value=_streamed(body)):
+        response = fetcher.get('https://example.com/a')
+
+    assert response.truncated
+    assert response.bytes_read == 100 * 1024
+    assert response.text.startswith('<html>')
+    assert response.charset_source == 'meta'
+    assert fetcher.stats()['truncated'] == 1
+
+
+def test_non_html_rejected_before_reading_body():
+    fetcher = PageFetcher()
+    streamed = _streamed(b'%PDF-1.7 ...', content_type='application/pdf')
+    with patch.object(fetcher.session, 'get', return_value=streamed):
+        with pytest.raises(UnsupportedContentError):
+            fetcher.get('https://example.com/report')
+
+    streamed.iter_content.assert_not_called()
+    streamed.close.assert_called_once()
+    assert fetcher.stats()['rejected'] == 1
+
+
+def test_binary_body_without_content_type_rejected():
+    fetcher = PageFetcher()
+    with patch.object(fetcher.session, 'get', return_value=_streamed(b'%PDF-1.7 ...', content_type=None)):
+        with pytest.raises(UnsupportedContentError):
+            fetcher.get('https://example.com/report')
+
+
+def test_error_status_returned_without_body():
+    fetcher = PageFetcher()
+    streamed = _streamed(b'<html>Not found</html>', status_code=404)
+    with patch.object(fetcher.session, 'get', return_value=streamed):
+        response = fetcher.get('https://example.com/missing')
+
+    assert response.status_code == 404
+    assert response.text == ''
+    streamed.iter_content.assert_not_called()
+
+
+def test_stops_reading_at_pattern():
+    fetcher = PageFetcher()
+    body = b'<html><head><title>T</title></head><body>' + b'x' * 200_000
+    with patch.object(fetcher.session, 'get', return_value=_streamed(body)):
+        response = fetcher.get('https://example.com/a', until=re.compile(rb'</head>'))
+
+    assert response.stopped
+    assert not response.complete
+    assert response.bytes_read < 10 * 1024
+    assert '</head>' in response.text
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark for article HTML parsing.
+
+Compares the original pipeline, where trafilatura.extract,
+trafilatura.extract_metadata and a BeautifulSoup OpenGraph pass each parse
+the page, against tools.article.extractors.trafilatura_extractor.parse_article,
+which parses it once into a shared lxml tree. Reports CPU time per article
+and checks that both produce the same text, metadata and OG tags.
+
+Usage:
+    python scripts/benchmark_article_parsing.py --corpus ~/saved_pages   # *.html files
+    python scripts/benchmark_article_parsing.py                          # synthetic corpus
+
+Save pages for the corpus with e.g. `curl -L -o page.html <url>`.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+import trafilatura
+from bs4 import BeautifulSoup
+
+# Add agent/src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'agent', 'src'))
+
+from tools.article.extractors.trafilatura_extractor import parse_article
+
+WORDS = (
+    "the council said on tuesday that new housing plans would be reviewed after residents raised "
+    "concerns about traffic schools and the cost of living while officials argued that the city "
+    "needs thousands of homes over the next decade to keep rents from rising further"
+).split()
+
+
+def baseline(html: str):
+    """The original parse_article: three separate parses of the same page."""
+    text = trafilatura.extract(html, include_comments=False, include_tables=False)
+    if not text:
+        return None, None, {}
+
+    metadata_json = trafilatura.extract_metadata(html)
+
+    soup = BeautifulSoup(html, 'lxml')
+    og_tags = {}
+    for tag in soup.find_all('meta'):
+        key = tag.get('property') or tag.get('name') or ''
+        if key.startswith(('og:', 'twitter:', 'article:')) or key in ('description', 'author', 'keywords', 'pubdate', 'lastmod'):
+            og_tags.setdefault(key, tag.get('content', '').strip())
+    return text, metadata_json.as_dict() if metadata_json else None, og_tags
+
+
+def load_corpus(path: str) -> List[Tuple[str, str]]:
+    corpus = []
+    for name in sorted(os.listdir(path)):
+        if os.path.splitext(name)[1].lower() in ('.html', '.htm'):
+            with open(os.path.join(path, name), 'rb') as f:
+                corpus.append((name, f.read().decode('utf-8', errors='replace')))
+    return corpus
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 90))).capitalize() + "."
+
+
+def synthetic_corpus(pages: int) -> List[Tuple[str, str]]:
+    """News/blog-shaped pages: a full head, navigation, an article body, comments and a footer."""
+    rng = random.Random(0)
+    corpus = []
+    for i in range(pages):
+        kind = 'news' if i % 2 == 0 else 'blog'
+        nav = "".join(f'<li><a href="/section/{n}">Section {n}</a></li>' for n in range(40))
+        body = "".join(f"<p>{_paragraph(rng)}</p>" for _ in range(rng.randint(15, 40)))
+        related = "".join(
+            f'<article class="card"><a href="/story/{n}"><img src="/img/{n}.jpg"><h3>Story {n}</h3></a></article>'
+            for n in range(30)
+        )
+        comments = "".join(f'<div class="comment"><p>{_paragraph(rng)}</p></div>' for _ in range(10))
+        scripts = "".join(f"<script>window.__data{n} = {{\"id\": {n}, \"items\": [{', '.join(str(x) for x in range(50))}]}};</script>" for n in range(10))
+        corpus.append((f"{kind}_{i}.html", f"""<!DOCTYPE html>
+<html lang="en"><head>
+<meta charset="utf-8">
+<title>Housing plan review {i} | The Daily Example</title>
+<meta name="description" content="The council will review new housing plans.">
+<meta name="author" content="Jane Reporter">
+<meta property="og:title" content="Housing plan review {i}">
+<meta property="og:site_name" content="The Daily Example">
+<meta property="og:image" content="https://example.com/img/lead-{i}.jpg">
+<meta property="article:published_time" content="2024-05-{(i % 28) + 1:02d}T08:00:00Z">
+<meta name="twitter:card" content="summary_large_image">
+<link rel="stylesheet" href="/static/site.css">{scripts}
+</head><body>
+<header><nav><ul>{nav}</ul></nav></header>
+<main><article><h1>Housing plan review {i}</h1><p class="byline">By Jane Reporter</p>{body}</article>
+<section class="comments">{comments}</section><aside>{related}</aside></main>
+<footer><p>&copy; The Daily Example</p></footer>
+</body></html>"""))
+    return corpus
+
+
+def comparable(output: tuple) -> tuple:
+    """Output with the metadata's lxml elements (body, commentsbody) left out, which never compare equal."""
+    text, metadata, og_tags = output
+    metadata = {k: v for k, v in (metadata or {}).items() if isinstance(v, (str, int, float, list, type(None)))}
+    return text, metadata, og_tags
+
+
+def bench(fn: Callable[[str], tuple], corpus: List[Tuple[str, str]], repeat: int) -> Tuple[List[float], Dict[str, tuple]]:
+    """Return per-page median CPU milliseconds and each page's output."""
+    timings, outputs = [], {}
+    for name, html in corpus:
+        runs = []
+        for _ in range(repeat):
+            started = time.process_time()
+            outputs[name] = fn(html)
+            runs.append((time.process_time() - started) * 1000)
+        timings.append(statistics.median(runs))
+    return timings, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark article HTML parsing")
+    parser.add_argument("--corpus", help="Directory of saved .html pages (default: synthetic corpus)")
+    parser.add_argument("--pages", type=int, default=20, help="Synthetic pages to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per page (median is reported)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.pages)
+    if not corpus:
+        print("❌ No pages found")
+        sys.exit(1)
+
+    input_kb = sum(len(html) for _, html in corpus) / 1024
+    print("=" * 60)
+    print("Article Parsing Benchmark")
+    print("=" * 60)
+    print(f"Corpus: {len(corpus)} pages, {input_kb:.0f} KB")
+
+    base_timings, base_outputs = bench(baseline, corpus, args.repeat)
+    once_timings, once_outputs = bench(parse_article, corpus, args.repeat)
+
+    print(f"\n{'variant':<30}{'total ms':>10}{'mean ms':>10}{'p95 ms':>10}")
+    for label, timings in (("separate parses (original)", base_timings), ("parse once (shared tree)", once_timings)):
+        p95 = sorted(timings)[max(0, int(len(timings) * 0.95) - 1)]
+        print(f"{label:<30}{sum(timings):>10.0f}{statistics.mean(timings):>10.1f}{p95:>10.1f}")
+
+    saved = statistics.mean(base_timings) - statistics.mean(once_timings)
+    print(f"\n⏱️  CPU saved per article: {saved:.1f} ms ({saved / statistics.mean(base_timings):.0%})")
+
+    mismatches = [name for name, _ in corpus if comparable(base_outputs[name]) != comparable(once_outputs[name])]
+    if mismatches:
+        print(f"⚠️  Output differs for {len(mismatches)} pages: {', '.join(mismatches[:5])}")
+    else:
+        print("✅ Identical text, metadata and OG tags on every page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for vision image preprocessing.
+
+Compares the original full-decode + LANCZOS thumbnail against
+tools.image.preprocess (draft-mode decode, reduce-then-resample, EXIF
+orientation) for each resampling filter.
+
+Usage:
+    python scripts/benchmark_image_preprocess.py --corpus ~/Pictures/samples
+    python scripts/benchmark_image_preprocess.py            # synthetic corpus
+
+Without --corpus, a synthetic corpus is generated: 12 MP phone-style JPEGs
+(noise + gradients, some with EXIF rotation) and PNG phone screenshots.
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+from PIL import Image
+
+# Add agent/src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'agent', 'src'))
+
+from tools.image.preprocess import prepare_for_vision, ResampleFilter
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.heic', '.gif', '.bmp'}
+
+
+def baseline(image_bytes: bytes) -> bytes:
+    """The original ImageProcessorNode preprocessing, for comparison."""
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        img.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=85)
+        return buffer.getvalue()
+
+
+def load_corpus(path: str) -> List[Tuple[str, bytes]]:
+    corpus = []
+    for name in sorted(os.listdir(path)):
+        if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+            with open(os.path.join(path, name), 'rb') as f:
+                corpus.append((name, f.read()))
+    return corpus
+
+
+def synthetic_corpus(photos: int, screenshots: int) -> List[Tuple[str, bytes]]:
+    rng = np.random.default_rng(0)
+    corpus = []
+
+    for i in range(photos):
+        # Smooth gradient plus sensor-like noise so JPEG sizes are realistic
+        y, x = np.mgrid[0:3024, 0:4032]
+        base = np.stack([x % 256, y % 256, (x + y) % 256], axis=-1).astype(np.int16)
+        noise = rng.integers(-20, 20, size=base.shape, dtype=np.int16)
+        img = Image.fromarray(np.clip(base + noise, 0, 255).astype(np.uint8), 'RGB')
+        exif = Image.Exif()
+        exif[0x0112] = 6 if i % 2 else 1
+        buffer = io.BytesIO()
+        img.save(buffer, format='JPEG', quality=92, exif=exif.tobytes())
+        corpus.append((f"photo_{i}.jpg", buffer.getvalue()))
+
+    for i in range(screenshots):
+        img = Image.new('RGBA', (1170, 2532), (245, 245, 245, 255))
+        pixels = np.asarray(img).copy()
+        # Text-like stripes
+        for row in range(100, 2400, 48):
+            pixels[row:row + 20, 60:60 + int(rng.integers(300, 1000))] = (30, 30, 30, 255)
+        buffer = io.BytesIO()
+        Image.fromarray(pixels, 'RGBA').save(buffer, format='PNG')
+        corpus.append((f"screenshot_{i}.png", buffer.getvalue()))
+
+    return corpus
+
+
+def bench(fn: Callable[[bytes], bytes], corpus: List[Tuple[str, bytes]], repeat: int) -> Tuple[List[float], int]:
+    """Return per-image median milliseconds and total output bytes."""
+    timings, output_bytes = [], 0
+    for _, data in corpus:
+        runs = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            out = fn(data)
+            runs.append((time.perf_counter() - started) * 1000)
+        timings.append(statistics.median(runs))
+        output_bytes += len(out)
+    return timings, output_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vision image preprocessing")
+    parser.add_argument("--corpus", help="Directory of sample images (default: synthetic corpus)")
+    parser.add_argument("--photos", type=int, default=6, help="Synthetic 12 MP photos to generate")
+    parser.add_argument("--screenshots", type=int, default=4, help="Synthetic PNG screenshots to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per image (median is reported)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.photos, args.screenshots)
+    if not corpus:
+        print("❌ No images found")
+        sys.exit(1)
+
+    input_mb = sum(len(data) for _, data in corpus) / 1e6
+    print("=" * 60)
+    print("Image Preprocessing Benchmark")
+    print("=" * 60)
+    print(f"Corpus: {len(corpus)} images, {input_mb:.1f} MB")
+
+    candidates = [("baseline (full decode, lanczos)", baseline)]
+    for resample in ResampleFilter:
+        candidates.append((f"draft + reduce, {resample.value}", lambda data, r=resample: prepare_for_vision(data, resample=r)))
+
+    base_total = None
+    print(f"\n{'variant':<34}{'total ms':>10}{'mean ms':>10}{'p95 ms':>10}{'speedup':>9}{'out KB':>9}")
+    for label, fn in candidates:
+        timings, output_bytes = bench(fn, corpus, args.repeat)
+        total = sum(timings)
+        base_total = base_total or total
+        p95 = sorted(timings)[max(0, int(len(timings) * 0.95) - 1)]
+        print(
+            f"{label:<34}{total:>10.0f}{statistics.mean(timings):>10.1f}{p95:>10.1f}"
+            f"{base_total / total:>8.1f}x{output_bytes / 1024:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+-- Migration: Content-hash deduplication for WhatsApp media
+-- Twilio MediaUrls change on every forward, so url_hash can't detect repeated media.
+-- Store the SHA-256 of the media bytes and a 64-bit perceptual hash (dHash) instead.
+
+ALTER TABLE link_metadata
+ADD COLUMN IF NOT EXISTS content_hash TEXT,
+ADD COLUMN IF NOT EXISTS perceptual_hash BIGINT;
+
+CREATE INDEX IF NOT EXISTS idx_link_metadata_content_hash
+ON link_metadata(content_hash) WHERE content_hash IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_link_metadata_perceptual_hash
+ON link_metadata(perceptual_hash) WHERE perceptual_hash IS NOT NULL;
+
+-- Find near-duplicate media by Hamming distance between perceptual hashes
+CREATE OR REPLACE FUNCTION match_link_metadata_by_phash(
+    p_hash BIGINT,
+    p_max_distance INTEGER DEFAULT 6,
+    p_content_type TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    id UUID,
+    scrape_count INTEGER,
+    description TEXT,
+    ai_summary TEXT,
+    distance INTEGER
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        lm.id,
+        lm.scrape_count,
+        lm.description,
+        lm.ai_summary,
+        bit_count((lm.perceptual_hash # p_hash)::bit(64))::INTEGER AS distance
+    FROM link_metadata lm
+    WHERE lm.perceptual_hash IS NOT NULL
+      AND (p_content_type IS NULL OR lm.content_type = p_content_type)
+      AND bit_count((lm.perceptual_hash # p_hash)::bit(64)) <= p_max_distance
+    ORDER BY distance ASC
+    LIMIT 1;
+$$;
+
+GRANT EXECUTE ON FUNCTION match_link_metadata_by_phash(BIGINT, INTEGER, TEXT) TO service_role;
+
+COMMENT ON COLUMN link_metadata.content_hash IS 'SHA-256 of the media bytes (WhatsApp media dedup)';
+COMMENT ON COLUMN link_metadata.perceptual_hash IS '64-bit dHash for near-duplicate media detection';
+COMMENT ON FUNCTION match_link_metadata_by_phash(BIGINT, INTEGER, TEXT) IS 'Returns the closest media row within p_max_distance bits of p_hash';
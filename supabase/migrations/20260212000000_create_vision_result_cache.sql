@@ -0,0 +1,88 @@
+-- Migration: Perceptual-hash cache for vision analyses
+-- The same meme or screenshot is forwarded across many chats. Cache each image's
+-- vision description under its 64-bit dHash so near-identical copies
+-- (re-compressed, resized) reuse the analysis instead of calling the vision API.
+
+-- Split a 64-bit hash into 8 tagged bytes (band * 256 + byte value).
+-- Two hashes within 7 bits of each other share at least one band (pigeonhole),
+-- so a GIN overlap search on the bands finds all candidates without a full scan.
+CREATE OR REPLACE FUNCTION phash_bands(p_hash BIGINT)
+RETURNS INTEGER[]
+LANGUAGE sql
+IMMUTABLE
+PARALLEL SAFE
+AS $$
+    SELECT array_agg(band * 256 + ((p_hash >> (band * 8)) & 255)::INTEGER ORDER BY band)
+    FROM generate_series(0, 7) AS band;
+$$;
+
+CREATE TABLE IF NOT EXISTS vision_result_cache (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  perceptual_hash BIGINT NOT NULL,
+  prompt_key TEXT NOT NULL,
+  description TEXT NOT NULL,
+  content_hash TEXT,
+  link_metadata_id UUID REFERENCES link_metadata(id) ON DELETE SET NULL,
+  hit_count INTEGER NOT NULL DEFAULT 0,
+  created_at TIMESTAMPTZ DEFAULT NOW(),
+  last_hit_at TIMESTAMPTZ
+);
+
+-- Enable Row Level Security
+ALTER TABLE vision_result_cache ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Service role can manage vision_result_cache" ON vision_result_cache;
+CREATE POLICY "Service role can manage vision_result_cache"
+  ON vision_result_cache
+  FOR ALL
+  TO service_role
+  USING (true)
+  WITH CHECK (true);
+
+CREATE INDEX IF NOT EXISTS idx_vision_result_cache_bands
+ON vision_result_cache USING GIN (phash_bands(perceptual_hash));
+
+CREATE INDEX IF NOT EXISTS idx_vision_result_cache_link
+ON vision_result_cache(link_metadata_id) WHERE link_metadata_id IS NOT NULL;
+
+-- Closest cached analysis within p_max_distance bits (must be < 8 for the band index)
+-- for the same prompt. Records the hit.
+CREATE OR REPLACE FUNCTION match_vision_cache_by_phash(
+    p_hash BIGINT,
+    p_prompt_key TEXT,
+    p_max_distance INTEGER DEFAULT 6
+)
+RETURNS TABLE (
+    id UUID,
+    description TEXT,
+    link_metadata_id UUID,
+    distance INTEGER
+)
+LANGUAGE sql
+VOLATILE
+AS $$
+    WITH best AS (
+        SELECT
+            c.id,
+            bit_count((c.perceptual_hash # p_hash)::bit(64))::INTEGER AS distance
+        FROM vision_result_cache c
+        WHERE phash_bands(c.perceptual_hash) && phash_bands(p_hash)
+          AND c.prompt_key = p_prompt_key
+          AND bit_count((c.perceptual_hash # p_hash)::bit(64)) <= p_max_distance
+        ORDER BY distance ASC, c.hit_count DESC
+        LIMIT 1
+    )
+    UPDATE vision_result_cache c
+    SET hit_count = c.hit_count + 1,
+        last_hit_at = NOW()
+    FROM best
+    WHERE c.id = best.id
+    RETURNING c.id, c.description, c.link_metadata_id, best.distance;
+$$;
+
+GRANT EXECUTE ON FUNCTION match_vision_cache_by_phash(BIGINT, TEXT, INTEGER) TO service_role;
+
+COMMENT ON TABLE vision_result_cache IS 'Vision API descriptions keyed by image perceptual hash, reused for near-identical images';
+COMMENT ON COLUMN vision_result_cache.prompt_key IS 'Hash of the vision prompt; a prompt change invalidates old entries';
+COMMENT ON COLUMN vision_result_cache.link_metadata_id IS 'link_metadata row the analysis was first saved under';
+COMMENT ON FUNCTION match_vision_cache_by_phash(BIGINT, TEXT, INTEGER) IS 'Returns the closest cached analysis within p_max_distance bits of p_hash and records the hit';
@@ -0,0 +1,86 @@
+-- Migration: Per-domain article extractor statistics
+-- ArticleService tries Trafilatura, then Newspaper4k. On domains where one of them
+-- reliably fails, every article pays for that failed attempt first. Track how each
+-- extractor does per domain so the service can try the better one first and size
+-- its timeouts, while still occasionally retrying the other one.
+
+CREATE TABLE IF NOT EXISTS article_extractor_stats (
+  domain TEXT NOT NULL,
+  extractor TEXT NOT NULL,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  successes INTEGER NOT NULL DEFAULT 0,
+  success_rate REAL NOT NULL DEFAULT 0,
+  avg_latency_ms REAL NOT NULL DEFAULT 0,
+  avg_text_length REAL NOT NULL DEFAULT 0,
+  last_success_at TIMESTAMPTZ,
+  last_failure_at TIMESTAMPTZ,
+  updated_at TIMESTAMPTZ DEFAULT NOW(),
+  PRIMARY KEY (domain, extractor)
+);
+
+-- Enable Row Level Security
+ALTER TABLE article_extractor_stats ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Service role can manage article_extractor_stats" ON article_extractor_stats;
+CREATE POLICY "Service role can manage article_extractor_stats"
+  ON article_extractor_stats
+  FOR ALL
+  TO service_role
+  USING (true)
+  WITH CHECK (true);
+
+-- Record one extraction attempt. Rates and averages are exponentially weighted
+-- (weight p_alpha for the new sample) so a recovering or degrading extractor shows
+-- up within a few attempts. Latency and text length only average successful runs.
+CREATE OR REPLACE FUNCTION record_article_extractor_result(
+    p_domain TEXT,
+    p_extractor TEXT,
+    p_success BOOLEAN,
+    p_latency_ms REAL,
+    p_text_length INTEGER,
+    p_alpha REAL DEFAULT 0.2
+)
+RETURNS VOID
+LANGUAGE sql
+VOLATILE
+AS $$
+    INSERT INTO article_extractor_stats AS s (
+        domain, extractor, attempts, successes, success_rate, avg_latency_ms, avg_text_length,
+        last_success_at, last_failure_at, updated_at
+    )
+    VALUES (
+        p_domain,
+        p_extractor,
+        1,
+        CASE WHEN p_success THEN 1 ELSE 0 END,
+        CASE WHEN p_success THEN 1 ELSE 0 END,
+        CASE WHEN p_success THEN p_latency_ms ELSE 0 END,
+        CASE WHEN p_success THEN p_text_length ELSE 0 END,
+        CASE WHEN p_success THEN NOW() END,
+        CASE WHEN p_success THEN NULL ELSE NOW() END,
+        NOW()
+    )
+    ON CONFLICT (domain, extractor) DO UPDATE SET
+        attempts = s.attempts + 1,
+        successes = s.successes + CASE WHEN p_success THEN 1 ELSE 0 END,
+        success_rate = (1 - p_alpha) * s.success_rate + p_alpha * CASE WHEN p_success THEN 1 ELSE 0 END,
+        avg_latency_ms = CASE
+            WHEN NOT p_success THEN s.avg_latency_ms
+            WHEN s.successes = 0 THEN p_latency_ms
+            ELSE (1 - p_alpha) * s.avg_latency_ms + p_alpha * p_latency_ms
+        END,
+        avg_text_length = CASE
+            WHEN NOT p_success THEN s.avg_text_length
+            WHEN s.successes = 0 THEN p_text_length
+            ELSE (1 - p_alpha) * s.avg_text_length + p_alpha * p_text_length
+        END,
+        last_success_at = CASE WHEN p_success THEN NOW() ELSE s.last_success_at END,
+        last_failure_at = CASE WHEN p_success THEN s.last_failure_at ELSE NOW() END,
+        updated_at = NOW();
+$$;
+
+GRANT EXECUTE ON FUNCTION record_article_extractor_result(TEXT, TEXT, BOOLEAN, REAL, INTEGER, REAL) TO service_role;
+
+COMMENT ON TABLE article_extractor_stats IS 'Per-domain success, latency and text length of each article extractor, used to order extractors and size timeouts';
+COMMENT ON COLUMN article_extractor_stats.success_rate IS 'Exponentially weighted success rate (recent attempts count most)';
+COMMENT ON FUNCTION record_article_extractor_result(TEXT, TEXT, BOOLEAN, REAL, INTEGER, REAL) IS 'Upserts one extraction attempt into the domain''s weighted stats';
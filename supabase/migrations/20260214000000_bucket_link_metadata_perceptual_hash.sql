@@ -0,0 +1,78 @@
+-- Migration: Bucketed perceptual-hash lookup and per-frame video hashes
+-- A btree index on perceptual_hash can't serve a Hamming-distance scan, so
+-- match_link_metadata_by_phash read every row with a hash. Split each hash into
+-- eight one-byte bands instead: two hashes at most 7 bits apart share at least one
+-- band exactly, so a GIN index on the bands narrows the scan to real candidates.
+-- Videos also store a dHash per sampled frame; a perceptual match must be close on
+-- every frame, not just the middle one.
+
+DROP INDEX IF EXISTS idx_link_metadata_perceptual_hash;
+
+-- Band i is tagged (i << 8) so equal bytes at different positions don't collide
+CREATE OR REPLACE FUNCTION phash_bands(p_hash BIGINT)
+RETURNS INTEGER[]
+LANGUAGE sql
+IMMUTABLE
+PARALLEL SAFE
+AS $$
+    SELECT CASE WHEN p_hash IS NULL THEN NULL ELSE ARRAY(
+        SELECT (band << 8) | ((p_hash >> (band * 8)) & 255)::INTEGER
+        FROM generate_series(0, 7) AS band
+    ) END;
+$$;
+
+ALTER TABLE link_metadata
+ADD COLUMN IF NOT EXISTS perceptual_hash_bands INTEGER[]
+    GENERATED ALWAYS AS (phash_bands(perceptual_hash)) STORED,
+ADD COLUMN IF NOT EXISTS frame_hashes BIGINT[];
+
+CREATE INDEX IF NOT EXISTS idx_link_metadata_perceptual_hash_bands
+ON link_metadata USING GIN (perceptual_hash_bands) WHERE perceptual_hash IS NOT NULL;
+
+-- Replaces the three-argument version (new optional p_frame_hashes)
+DROP FUNCTION IF EXISTS match_link_metadata_by_phash(BIGINT, INTEGER, TEXT);
+
+CREATE OR REPLACE FUNCTION match_link_metadata_by_phash(
+    p_hash BIGINT,
+    p_max_distance INTEGER DEFAULT 6,
+    p_content_type TEXT DEFAULT NULL,
+    p_frame_hashes BIGINT[] DEFAULT NULL
+)
+RETURNS TABLE (
+    id UUID,
+    scrape_count INTEGER,
+    description TEXT,
+    ai_summary TEXT,
+    distance INTEGER
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        lm.id,
+        lm.scrape_count,
+        lm.description,
+        lm.ai_summary,
+        bit_count((lm.perceptual_hash # p_hash)::bit(64))::INTEGER AS distance
+    FROM link_metadata lm
+    WHERE lm.perceptual_hash IS NOT NULL
+      AND lm.perceptual_hash_bands && phash_bands(p_hash)
+      AND (p_content_type IS NULL OR lm.content_type = p_content_type)
+      AND bit_count((lm.perceptual_hash # p_hash)::bit(64)) <= p_max_distance
+      AND (p_frame_hashes IS NULL OR (
+          cardinality(lm.frame_hashes) = cardinality(p_frame_hashes)
+          AND NOT EXISTS (
+              SELECT 1
+              FROM unnest(lm.frame_hashes, p_frame_hashes) AS f(stored, probe)
+              WHERE bit_count((f.stored # f.probe)::bit(64)) > p_max_distance
+          )
+      ))
+    ORDER BY distance ASC
+    LIMIT 1;
+$$;
+
+GRANT EXECUTE ON FUNCTION match_link_metadata_by_phash(BIGINT, INTEGER, TEXT, BIGINT[]) TO service_role;
+
+COMMENT ON COLUMN link_metadata.perceptual_hash_bands IS 'perceptual_hash split into eight tagged bytes (GIN-indexed candidate lookup)';
+COMMENT ON COLUMN link_metadata.frame_hashes IS '64-bit dHash of each sampled video frame, in timeline order';
+COMMENT ON FUNCTION match_link_metadata_by_phash(BIGINT, INTEGER, TEXT, BIGINT[]) IS 'Returns the closest media row within p_max_distance (at most 7) bits of p_hash, and of every p_frame_hashes entry when given';